@@ -8,6 +8,12 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 3600
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    BCRYPT_ROUNDS: int = 12  # raising it rehashes existing passwords on their next login
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64  # hash/verify calls in flight before new ones get a 503
+    USER_CACHE_BACKEND: str = "memory"  # memory, none
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_ENTRIES: int = 10000
 
     OPENAI_API_KEY: str
     STRIPE_SECRET_KEY: str
@@ -21,6 +27,14 @@ class Settings(BaseSettings):
     DATABASE_NAME: str
 
     DATABASE_URL: str = ""
+    ASYNC_DATABASE_URL: str = ""
+
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # 0 disables
 
     def __init__(self, **data):
         super().__init__(**data)
@@ -28,6 +42,10 @@ class Settings(BaseSettings):
             f'postgresql://{self.DATABASE_USER}:{self.DATABASE_PASSWORD}'
             f'@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}'
         )
+        self.ASYNC_DATABASE_URL = (
+            f'postgresql+asyncpg://{self.DATABASE_USER}:{self.DATABASE_PASSWORD}'
+            f'@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}'
+        )
 
     # Email
     SMTP_SERVER: str
@@ -36,23 +54,59 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str
     EMAILS_FROM_EMAIL: str
     EMAILS_FROM_NAME: str
+    EMAIL_TRANSPORT: str = "sendgrid"  # sendgrid, fake
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_SEND_CONCURRENCY: int = 10
+    EMAIL_MAX_ATTEMPTS: int = 6
+    EMAIL_RETRY_BASE_SECONDS: int = 30
+    EMAIL_POLL_INTERVAL_SECONDS: int = 5
+    EMAIL_LEASE_SECONDS: int = 5 * 60
+    EMAIL_HTTP_TIMEOUT_SECONDS: float = 10.0
+    EMAIL_BROADCAST_BATCH_SIZE: int = 1000  # SendGrid accepts at most 1000 personalizations per request
+    EMAIL_BROADCAST_POLL_SECONDS: int = 60
+    EMAIL_TEMPLATE_BYTECODE_DIR: Optional[str] = None  # defaults to the system temp dir
 
     CLOUDINARY_CLOUD_NAME: str
     CLOUDINARY_API_KEY: str
     CLOUDINARY_API_SECRET: str
 
     STRIPE_WEBHOOK_SECRET: str
+    PLAN_CATALOG_TTL_SECONDS: int = 5 * 60
 
     AWS_KEY: str
     AWS_SECRET: str
     AWS_REGION: str
     AWS_BUCKET: str
+    S3_MULTIPART_THRESHOLD: int = 16 * 1024 * 1024
+    S3_MULTIPART_PART_SIZE: int = 8 * 1024 * 1024
+    S3_MULTIPART_CONCURRENCY: int = 4
+    S3_MULTIPART_STALE_AFTER_SECONDS: int = 24 * 60 * 60  # incomplete uploads older than this are aborted
+    S3_MULTIPART_CLEANUP_INTERVAL_SECONDS: int = 6 * 60 * 60
+
+    # Note processing
+    NOTE_WORKER_CONCURRENCY: int = 2
+    NOTE_SPOOL_DIR: str = "spool/notes"
+    TRANSCRIPTION_CONCURRENCY: int = 4
+    TRANSCRIPTION_CHUNK_RETRIES: int = 2
+    TRANSCRIPTION_CACHE_BACKEND: str = "database"  # database, memory
+    TRANSCRIPTION_CACHE_TTL_SECONDS: int = 30 * 24 * 60 * 60
+    TRANSCRIPTION_CACHE_MAX_ENTRIES: int = 1000
+    SUMMARY_CHUNK_CHARS: int = 12000
+    SUMMARY_CONCURRENCY: int = 4
+    LIVE_SEGMENT_BYTES: int = 512 * 1024  # roughly 30 seconds of 128 kbps audio
+    LIVE_FALLBACK_BITRATE: int = 128000  # bits/s, for segments whose length cannot be read
+
+    # Admin dashboard
+    METRICS_RECONCILE_INTERVAL_SECONDS: int = 6 * 60 * 60
 
     # OAuth2
     GOOGLE_CLIENT_ID: Optional[str] = None
     GOOGLE_CLIENT_SECRET: Optional[str] = None
     APPLE_CLIENT_ID: Optional[str] = None
     APPLE_CLIENT_SECRET: Optional[str] = None
+    OAUTH_JWKS_DEFAULT_TTL_SECONDS: int = 60 * 60  # when the key set response has no max-age
+    OAUTH_JWKS_MIN_REFRESH_SECONDS: int = 60
+    OAUTH_JWKS_FILE: Optional[str] = None  # local JWKS used instead of Google's and Apple's, for tests
 
     class Config:
         env_file = ".env"
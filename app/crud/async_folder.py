@@ -0,0 +1,111 @@
+from typing import List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.crud.base import LIKE_ESCAPE, search_pattern
+from app.models.folder import Folder
+
+async def create_folder(db: AsyncSession, user_id: int, name: str) -> Folder:
+    folder = Folder(user_id=user_id, name=name)
+    db.add(folder)
+    await db.commit()
+    await db.refresh(folder)
+    return folder
+
+async def get_folder(db: AsyncSession, folder_id: int) -> Optional[Folder]:
+    result = await db.execute(select(Folder).filter(Folder.id == folder_id))
+    return result.scalars().first()
+
+async def get_user_folder(db: AsyncSession, folder_id: int, user_id: int) -> Optional[Folder]:
+    result = await db.execute(select(Folder).filter(Folder.id == folder_id, Folder.user_id == user_id))
+    return result.scalars().first()
+
+async def get_count(db: AsyncSession) -> int:
+    return await db.scalar(select(func.count(Folder.id)))
+
+async def get_user_folders(db: AsyncSession, user_id: int) -> List[Folder]:
+    result = await db.execute(select(Folder).filter(Folder.user_id == user_id))
+    return result.scalars().all()
+
+async def get_user_folder_by_name(db: AsyncSession, user_id: int, name: str) -> Optional[Folder]:
+    result = await db.execute(
+        select(Folder).filter(Folder.user_id == user_id).filter(func.lower(Folder.name) == name.lower())
+    )
+    return result.scalars().first()
+
+async def update_folder(db: AsyncSession, folder_id: int, name: str) -> Optional[Folder]:
+    folder = await get_folder(db, folder_id)
+    if folder:
+        folder.name = name
+        await db.commit()
+        await db.refresh(folder)
+    return folder
+
+async def delete_folder(db: AsyncSession, folder_id: int) -> bool:
+    folder = await get_folder(db, folder_id)
+    if folder:
+        await db.delete(folder)
+        await db.commit()
+        return True
+    return False
+
+async def get_many(
+    db: AsyncSession,
+    page: int = 1,
+    size: int = 100,
+    search: Optional[str] = None,
+    user_id: Optional[int] = None,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = "asc"
+) -> dict:
+    query = select(Folder).options(joinedload(Folder.user))
+
+    if search:
+        query = query.filter(Folder.name.ilike(search_pattern(search), escape=LIKE_ESCAPE))
+    if user_id:
+        query = query.filter(Folder.user_id == user_id)
+
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    pages = (total + size - 1) // size
+    offset = (page - 1) * size
+
+    if sort_by:
+        sort_column = getattr(Folder, sort_by, None)
+        if sort_column:
+            if sort_order.lower() == 'desc':
+                sort_column = sort_column.desc()
+            query = query.order_by(sort_column)
+
+    query = query.offset(offset).limit(size)
+
+    items = (await db.execute(query)).scalars().all()
+
+    folders_with_user_response = []
+
+    for folder in items:
+        folder_dict = {
+            'id': folder.id,
+            'name': folder.name,
+            'created_at': folder.created_at,
+            'updated_at': folder.updated_at,
+        }
+
+        if folder.user:
+            folder_dict['user'] = {
+                "id":folder.user.id,
+                "email":folder.user.email,
+                "full_name":folder.user.full_name,
+                "avatar":folder.user.avatar,
+            }
+
+        folders_with_user_response.append(folder_dict)
+
+    return {
+        'items': folders_with_user_response,
+        'total': total,
+        'page': page,
+        'size': size,
+        'pages': pages,
+        'has_next': page < pages,
+        'has_previous': page > 1
+    }
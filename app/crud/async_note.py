@@ -0,0 +1,158 @@
+from typing import List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.base import LIKE_ESCAPE, search_pattern
+from app.models.note import Note
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import joinedload
+
+async def create_note(
+    db: AsyncSession,
+    user_id: int,
+    folder_id: int,
+    title: str,
+    **kwargs) -> Note:
+    note = Note(
+        user_id=user_id,
+        folder_id=folder_id,
+        title=title,
+        **kwargs
+    )
+    db.add(note)
+    await db.commit()
+    await db.refresh(note)
+    return note
+
+async def get_note(db: AsyncSession, note_id: int) -> Optional[Note]:
+    result = await db.execute(select(Note).filter(Note.id == note_id))
+    return result.scalars().first()
+
+async def get_user_note(db: AsyncSession, note_id: int, user_id: int) -> Optional[Note]:
+    result = await db.execute(select(Note).filter(Note.id == note_id, Note.user_id == user_id))
+    return result.scalars().first()
+
+async def get_notes_by_user(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> List[Note]:
+    result = await db.execute(select(Note).filter(Note.user_id == user_id).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def get_notes_by_folder(db: AsyncSession, folder_id: int, skip: int = 0, limit: int = 100) -> List[Note]:
+    result = await db.execute(select(Note).filter(Note.folder_id == folder_id).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def get_notes_by_status(db: AsyncSession, statuses: List[str]) -> List[Note]:
+    result = await db.execute(select(Note).filter(Note.status.in_(statuses)))
+    return result.scalars().all()
+
+async def get_total_notes_count(db: AsyncSession) -> int:
+    return await db.scalar(select(func.count(Note.id)))
+
+async def get_total_user_notes_count(db: AsyncSession, user_id: int) -> int:
+    return await db.scalar(select(func.count(Note.id)).filter(Note.user_id == user_id))
+
+async def update_note(db: AsyncSession, note_id: int, note_in: dict) -> Optional[Note]:
+    db_note = await get_note(db, note_id)
+    if not db_note:
+        return None
+
+    obj_data = jsonable_encoder(db_note)
+    for field in obj_data:
+        if field in note_in:
+            setattr(db_note, field, note_in[field])
+
+    db.add(db_note)
+    await db.commit()
+    await db.refresh(db_note)
+    return db_note
+
+async def delete_note(db: AsyncSession, note_id: int) -> bool:
+    note = await get_note(db, note_id)
+    if not note:
+        return False
+    await db.delete(note)
+    await db.commit()
+    return True
+
+async def toggle_pin_note(db: AsyncSession, note_id: int) -> Optional[Note]:
+    note = await get_note(db, note_id)
+    if not note:
+        return None
+    note.is_pinned = not note.is_pinned
+    db.add(note)
+    await db.commit()
+    await db.refresh(note)
+    return note
+
+async def toggle_archive_note(db: AsyncSession, note_id: int) -> Optional[Note]:
+    note = await get_note(db, note_id)
+    if not note:
+        return None
+    note.is_archived = not note.is_archived
+    db.add(note)
+    await db.commit()
+    await db.refresh(note)
+    return note
+
+async def get_total_notes(db: AsyncSession) -> int:
+    return await get_total_notes_count(db)
+
+
+async def get_many(
+    db: AsyncSession,
+    page: int = 1,
+    size: int = 100,
+    search: Optional[str] = None,
+    user_id: Optional[int] = None,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = "asc"
+) -> dict:
+    query = select(Note).options(joinedload(Note.user))
+
+    if search:
+        query = query.filter(Note.title.ilike(search_pattern(search), escape=LIKE_ESCAPE))
+    if user_id:
+        query = query.filter(Note.user_id == user_id)
+
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    pages = (total + size - 1) // size
+    offset = (page - 1) * size
+
+    if sort_by:
+        sort_column = getattr(Note, sort_by, None)
+        if sort_column:
+            if sort_order.lower() == 'desc':
+                sort_column = sort_column.desc()
+            query = query.order_by(sort_column)
+
+    query = query.offset(offset).limit(size)
+
+    items = (await db.execute(query)).scalars().all()
+
+    with_user_response = []
+
+    for item in items:
+        item_dict = {
+            'id': item.id,
+            'title': item.title,
+            'created_at': item.created_at,
+            'updated_at': item.updated_at,
+        }
+
+        if item.user:
+            item_dict['user'] = {
+                "id":item.user.id,
+                "email":item.user.email,
+                "full_name":item.user.full_name,
+                "avatar":item.user.avatar,
+            }
+
+        with_user_response.append(item_dict)
+
+    return {
+        'items': with_user_response,
+        'total': total,
+        'page': page,
+        'size': size,
+        'pages': pages,
+        'has_next': page < pages,
+        'has_previous': page > 1
+    }
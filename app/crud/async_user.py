@@ -0,0 +1,116 @@
+from typing import Optional
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.base import LIKE_ESCAPE, AsyncCRUDBase, search_pattern
+from app.models.user import User
+from app.schemas.user import UserCreate, UserUpdate
+from app.core.security import password_hasher
+
+class AsyncCRUDUser(AsyncCRUDBase[User, UserCreate, UserUpdate]):
+    async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        create_data = obj_in.dict()
+        create_data.pop("password")
+        db_obj = User(
+            **create_data,
+            hashed_password=await password_hasher.hash(obj_in.password),
+        )
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def authenticate(self, db: AsyncSession, *, email: str, password: str) -> Optional[User]:
+        user = await self.get_by_email(db, email=email)
+        if not user:
+            return None
+        if not await password_hasher.verify(password, user.hashed_password):
+            return None
+        return user
+
+    async def get_users(self, db: AsyncSession, *, page: int = 1, size: int = 100):
+        result = await db.execute(select(User).order_by(User.id).offset((page - 1) * size).limit(size))
+        return result.scalars().all()
+
+    async def get_recent_signups(self, db: AsyncSession, *, limit: int = 10):
+        result = await db.execute(
+            select(User)
+            .order_by(User.created_at.desc())
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    async def get_total_users(self, db: AsyncSession) -> int:
+        return await db.scalar(select(func.count(User.id)))
+
+    async def find_by_stripe_id(self, db: AsyncSession, id: str) -> Optional[User]:
+        result = await db.execute(select(User).filter(User.stripe_customer_id == id))
+        return result.scalars().first()
+
+    async def delete(self, db: AsyncSession, *, id: int) -> User:
+        obj = await db.get(User, id)
+        if obj:
+            await db.delete(obj)
+            await db.commit()
+        return obj
+
+    async def get_many(
+        self,
+        db: AsyncSession,
+        page: int = 1,
+        size: int = 100,
+        search: Optional[str] = None,
+        user_id: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = "asc"
+    ) -> dict:
+        query = select(User)
+
+        if search:
+            pattern = search_pattern(search)
+            query = query.filter(or_(
+                User.email.ilike(pattern, escape=LIKE_ESCAPE),
+                User.full_name.ilike(pattern, escape=LIKE_ESCAPE)
+            ))
+        if user_id:
+            query = query.filter(User.id == user_id)
+
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
+        pages = (total + size - 1) // size
+        offset = (page - 1) * size
+
+        if sort_by:
+            sort_column = getattr(User, sort_by, None)
+            if sort_column:
+                if sort_order.lower() == 'desc':
+                    sort_column = sort_column.desc()
+                query = query.order_by(sort_column)
+
+        query = query.offset(offset).limit(size)
+
+        items = (await db.execute(query)).scalars().all()
+
+        with_user_response = []
+
+        for item in items:
+            item_dict = {
+                "id":item.id,
+                "email":item.email,
+                "full_name":item.full_name,
+                "avatar":item.avatar,
+                "created_at":item.created_at,
+                "updated_at":item.updated_at,
+            }
+
+            with_user_response.append(item_dict)
+
+        return {
+            'items': with_user_response,
+            'total': total,
+            'page': page,
+            'size': size,
+            'pages': pages,
+            'has_next': page < pages,
+            'has_previous': page > 1
+        }
+
+user = AsyncCRUDUser(User)
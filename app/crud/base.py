@@ -1,7 +1,14 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Optional, Tuple, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
 from app.core.database import Base
 
 ModelType = TypeVar("ModelType", bound=Base) # type: ignore
@@ -11,12 +18,101 @@ T = TypeVar('T')
 
 class PaginatedResponse(BaseModel, Generic[T]):
     items: List[T]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
-    pages: int
+    pages: Optional[int] = None
     has_next: bool
     has_previous: bool
+    next_cursor: Optional[str] = None
+
+COUNT_MODES = ("exact", "estimated", "none")
+LIKE_ESCAPE = "\\"
+
+def search_pattern(term: str) -> str:
+    """Substring ILIKE pattern for a search term, with its wildcards escaped.
+
+    The pg_trgm GIN indexes serve terms of three or more characters; shorter
+    terms yield no trigrams and fall back to a scan, but still match anywhere.
+    """
+    escaped = term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    payload = json.dumps({"c": created_at.isoformat(), "i": id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Raises ValueError for anything that is not a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+class ExplainJSON(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, with the statement's parameters bound as usual."""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+@compiles(ExplainJSON, "postgresql")
+def _compile_explain_json(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+def count_rows(db: Session, query: Query, mode: str = "exact") -> Optional[int]:
+    """Row count for a query: exact COUNT(*), the planner's estimate (PostgreSQL only), or None."""
+    if mode == "none":
+        return None
+    if mode == "estimated" and db.get_bind().dialect.name == "postgresql":
+        plan = db.execute(ExplainJSON(query.order_by(None).statement)).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
+    return query.order_by(None).count()
+
+def paginate(
+    db: Session,
+    query: Query,
+    model: Type[ModelType],
+    size: int = 100,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    count: str = "exact"
+) -> dict:
+    """Newest-first pagination on (created_at, id).
+
+    With a cursor the page starts right after the row it points at (keyset
+    pagination, constant cost at any depth); without one `offset` is used,
+    which keeps page-number clients working for the first pages.
+    """
+    if count not in COUNT_MODES:
+        raise ValueError(f"count must be one of {', '.join(COUNT_MODES)}")
+
+    total = count_rows(db, query, count)
+
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < (created_at, last_id))
+    elif offset:
+        query = query.offset(offset)
+
+    rows = query.limit(size + 1).all()
+    items = rows[:size]
+    has_next = len(rows) > size
+    page = None if cursor else offset // size + 1
+
+    return {
+        'items': items,
+        'total': total,
+        'page': page,
+        'size': size,
+        'pages': (total + size - 1) // size if total is not None else None,
+        'has_next': has_next,
+        'has_previous': bool(cursor) or offset > 0,
+        'next_cursor': encode_cursor(items[-1].created_at, items[-1].id) if has_next else None
+    }
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
@@ -60,4 +156,49 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj = db.query(self.model).get(id)
         db.delete(obj)
         db.commit()
-        return obj
\ No newline at end of file
+        return obj
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def get_by_email(self, db: AsyncSession, email: str) -> Optional[ModelType]:
+        result = await db.execute(select(self.model).filter(self.model.email == email))
+        return result.scalars().first()
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = self.model(**obj_in_data)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        obj_data = jsonable_encoder(db_obj)
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        for field in obj_data:
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def delete(self, db: AsyncSession, *, id: int) -> ModelType:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        return obj
@@ -0,0 +1,158 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.models.email import (
+    BROADCAST_STATUS_PENDING,
+    BROADCAST_STATUS_RUNNING,
+    BROADCAST_STATUSES_RESUMABLE,
+    EMAIL_STATUS_FAILED,
+    EMAIL_STATUS_PENDING,
+    EMAIL_STATUS_SENDING,
+    EMAIL_STATUS_SENT,
+    EmailBroadcast,
+    OutboundEmail,
+)
+from app.models.user import User
+
+
+def create(db: Session, to_email: str, subject: str, html_content: str) -> OutboundEmail:
+    email = OutboundEmail(
+        to_email=to_email,
+        subject=subject,
+        html_content=html_content,
+        status=EMAIL_STATUS_PENDING,
+        next_attempt_at=datetime.now(timezone.utc)
+    )
+    db.add(email)
+    db.commit()
+    db.refresh(email)
+    return email
+
+def claim_batch(db: Session, limit: int, lease_until: datetime) -> List[Dict]:
+    """Marks up to `limit` due messages as sending and returns them as plain dicts.
+
+    Messages whose previous claim lapsed (the worker died mid-send) are due
+    again. SKIP LOCKED lets several workers claim from the outbox at once.
+    """
+    now = datetime.now(timezone.utc)
+    emails = (
+        db.query(OutboundEmail)
+        .filter(
+            OutboundEmail.status.in_([EMAIL_STATUS_PENDING, EMAIL_STATUS_SENDING]),
+            OutboundEmail.next_attempt_at <= now
+        )
+        .order_by(OutboundEmail.next_attempt_at, OutboundEmail.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    claimed = []
+    for email in emails:
+        email.status = EMAIL_STATUS_SENDING
+        email.attempts += 1
+        email.next_attempt_at = lease_until
+        claimed.append({
+            "id": email.id,
+            "to_email": email.to_email,
+            "subject": email.subject,
+            "html_content": email.html_content,
+            "attempts": email.attempts
+        })
+    db.commit()
+    return claimed
+
+def mark_sent(db: Session, email_ids: List[int]):
+    if not email_ids:
+        return
+    db.query(OutboundEmail).filter(OutboundEmail.id.in_(email_ids)).update(
+        {"status": EMAIL_STATUS_SENT, "sent_at": datetime.now(timezone.utc), "last_error": None},
+        synchronize_session=False
+    )
+    db.commit()
+
+def mark_failed(db: Session, failures: List[Tuple[int, str, Optional[datetime]]]):
+    """Records failed sends as (id, error, retry_at); a retry_at of None gives up on the message."""
+    for email_id, error, retry_at in failures:
+        values = {"last_error": error}
+        if retry_at is None:
+            values["status"] = EMAIL_STATUS_FAILED
+        else:
+            values["status"] = EMAIL_STATUS_PENDING
+            values["next_attempt_at"] = retry_at
+        db.query(OutboundEmail).filter(OutboundEmail.id == email_id).update(values, synchronize_session=False)
+    db.commit()
+
+def count_by_status(db: Session) -> Dict[str, int]:
+    rows = db.query(OutboundEmail.status, func.count(OutboundEmail.id)).group_by(OutboundEmail.status).all()
+    return {status: count for status, count in rows}
+
+def _recipients_query(db: Session, verified_only: bool):
+    query = db.query(User.id, User.email, User.full_name).filter(User.is_active.is_(True))
+    if verified_only:
+        query = query.filter(User.is_verified.is_(True))
+    return query
+
+def count_recipients(db: Session, verified_only: bool = False) -> int:
+    return _recipients_query(db, verified_only).count()
+
+def get_recipient_batch(db: Session, after_user_id: int, limit: int, verified_only: bool = False) -> List[Tuple[int, str, Optional[str]]]:
+    """The next `limit` recipients after a user id, as (id, email, full_name) rows; keyset on users.id."""
+    return (
+        _recipients_query(db, verified_only)
+        .filter(User.id > after_user_id)
+        .order_by(User.id)
+        .limit(limit)
+        .all()
+    )
+
+def create_broadcast(db: Session, broadcast_data: dict) -> EmailBroadcast:
+    broadcast = EmailBroadcast(**broadcast_data)
+    db.add(broadcast)
+    db.commit()
+    db.refresh(broadcast)
+    return broadcast
+
+def get_broadcast(db: Session, broadcast_id: int) -> Optional[EmailBroadcast]:
+    return db.query(EmailBroadcast).filter(EmailBroadcast.id == broadcast_id).first()
+
+def get_broadcasts(db: Session, limit: int = 50) -> List[EmailBroadcast]:
+    return db.query(EmailBroadcast).order_by(EmailBroadcast.id.desc()).limit(limit).all()
+
+def get_resumable_broadcasts(db: Session) -> List[EmailBroadcast]:
+    return db.query(EmailBroadcast).filter(EmailBroadcast.status.in_(BROADCAST_STATUSES_RESUMABLE)).all()
+
+def update_broadcast(db: Session, broadcast_id: int, values: dict):
+    db.query(EmailBroadcast).filter(EmailBroadcast.id == broadcast_id).update(values, synchronize_session=False)
+    db.commit()
+
+def checkpoint_broadcast(db: Session, broadcast_id: int, last_user_id: int, sent: int):
+    """Records one delivered batch; everything up to last_user_id is done."""
+    db.query(EmailBroadcast).filter(EmailBroadcast.id == broadcast_id).update({
+        "last_user_id": last_user_id,
+        "sent_count": EmailBroadcast.sent_count + sent,
+        "batches_sent": EmailBroadcast.batches_sent + 1
+    }, synchronize_session=False)
+    db.commit()
+
+def claim_broadcast(db: Session, broadcast_id: int, stale_before: datetime) -> bool:
+    """Marks a broadcast as running for this worker.
+
+    Succeeds for a pending broadcast, or for a running one whose worker
+    stopped checkpointing before stale_before (it crashed or was restarted).
+    """
+    claimed = db.query(EmailBroadcast).filter(
+        EmailBroadcast.id == broadcast_id,
+        or_(
+            EmailBroadcast.status == BROADCAST_STATUS_PENDING,
+            and_(EmailBroadcast.status == BROADCAST_STATUS_RUNNING, EmailBroadcast.updated_at < stale_before)
+        )
+    ).update({
+        "status": BROADCAST_STATUS_RUNNING,
+        "started_at": func.coalesce(EmailBroadcast.started_at, func.now()),
+        "updated_at": func.now()
+    }, synchronize_session=False)
+    db.commit()
+    return claimed == 1
@@ -3,6 +3,7 @@ from app.models.folder import Folder
 from typing import List, Optional
 from sqlalchemy import func
 from sqlalchemy.orm import joinedload
+from app.crud.base import LIKE_ESCAPE, paginate, search_pattern
 
 def create_folder(db: Session, user_id: int, name: str) -> Folder:
     folder = Folder(user_id=user_id, name=name)
@@ -14,6 +15,9 @@ def create_folder(db: Session, user_id: int, name: str) -> Folder:
 def get_folder(db: Session, folder_id: int) -> Optional[Folder]:
     return db.query(Folder).filter(Folder.id == folder_id).first()
 
+def get_user_folder(db: Session, folder_id: int, user_id: int) -> Optional[Folder]:
+    return db.query(Folder).filter(Folder.id == folder_id, Folder.user_id == user_id).first()
+
 def get_count(db: Session) -> int:
     return db.query(Folder).count()
 
@@ -26,49 +30,44 @@ def get_user_folder_by_name(db: Session, user_id: int, name: str) -> Optional[Fo
 def update_folder(db: Session, folder_id: int, name: str) -> Optional[Folder]:
     folder = get_folder(db, folder_id)
     if folder:
-        folder.name = name
-        db.commit()
-        db.refresh(folder)
+        update_folder_obj(db, folder, name)
+    return folder
+
+def update_folder_obj(db: Session, folder: Folder, name: str) -> Folder:
+    folder.name = name
+    db.commit()
+    db.refresh(folder)
     return folder
 
 def delete_folder(db: Session, folder_id: int) -> bool:
     folder = get_folder(db, folder_id)
     if folder:
-        db.delete(folder)
-        db.commit()
-        return True
+        return delete_folder_obj(db, folder)
     return False
 
+def delete_folder_obj(db: Session, folder: Folder) -> bool:
+    db.delete(folder)
+    db.commit()
+    return True
+
 def get_many(
     db: Session,
     page: int = 1,
     size: int = 100,
     search: Optional[str] = None,
     user_id: Optional[int] = None,
-    sort_by: Optional[str] = None,
-    sort_order: Optional[str] = "asc"
+    cursor: Optional[str] = None,
+    count: str = "exact"
 ) -> dict:
     query = db.query(Folder).options(joinedload(Folder.user))
 
     if search:
-        query = query.filter(Folder.name.ilike(f"%{search}%"))
+        query = query.filter(Folder.name.ilike(search_pattern(search), escape=LIKE_ESCAPE))
     if user_id:
         query = query.filter(Folder.user_id == user_id)
 
-    total = query.count()
-    pages = (total + size - 1) // size
-    offset = (page - 1) * size
-
-    if sort_by:
-        sort_column = getattr(Folder, sort_by, None)
-        if sort_column:
-            if sort_order.lower() == 'desc':
-                sort_column = sort_column.desc()
-            query = query.order_by(sort_column)
-
-    query = query.offset(offset).limit(size)
-
-    items = query.all()
+    result = paginate(db, query, Folder, size=size, offset=(page - 1) * size, cursor=cursor, count=count)
+    items = result['items']
 
     folders_with_user_response = []
 
@@ -92,12 +91,5 @@ def get_many(
 
         folders_with_user_response.append(folder_dict)
 
-    return {
-        'items': folders_with_user_response,
-        'total': total,
-        'page': page,
-        'size': size,
-        'pages': pages,
-        'has_next': page < pages,
-        'has_previous': page > 1
-    }
+    result['items'] = folders_with_user_response
+    return result
@@ -0,0 +1,46 @@
+from typing import Dict, Union
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.models.metric import Metric, StripeEvent
+
+
+def get_all(db: Session) -> Dict[str, int]:
+    return {key: value for key, value in db.execute(select(Metric.key, Metric.value))}
+
+def increment(conn: Union[Session, Connection], key: str, delta: int):
+    """Adds delta to a counter without committing, so it joins the caller's transaction.
+
+    A single INSERT ... ON CONFLICT, so concurrent first increments of a key
+    cannot both try to insert it.
+    """
+    if not delta:
+        return
+    dialect = conn.get_bind().dialect if isinstance(conn, Session) else conn.dialect
+    insert = sqlite.insert if dialect.name == "sqlite" else postgresql.insert
+    statement = insert(Metric).values(key=key, value=delta)
+    conn.execute(statement.on_conflict_do_update(
+        index_elements=[Metric.key],
+        set_={"value": Metric.value + delta, "updated_at": func.now()}
+    ))
+
+def set_values(db: Session, values: Dict[str, int]):
+    for key, value in values.items():
+        metric = db.get(Metric, key)
+        if metric:
+            metric.value = value
+        else:
+            db.add(Metric(key=key, value=value))
+    db.commit()
+
+def record_event(db: Session, event_id: str, event_type: str) -> bool:
+    """Flushes a StripeEvent row; returns False if the event was already recorded."""
+    try:
+        with db.begin_nested():
+            db.add(StripeEvent(id=event_id, type=event_type))
+    except IntegrityError:
+        return False
+    return True
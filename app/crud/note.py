@@ -1,8 +1,28 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from app.models.note import Note
+from sqlalchemy import func
+from sqlalchemy.orm import Session, load_only, with_expression
+from app.models.note import NOTE_SEARCH_CONFIG, Note
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import joinedload
+from app.crud.base import LIKE_ESCAPE, count_rows, paginate, search_pattern
+
+# Columns loaded by list queries; the large Text columns stay deferred unless asked for
+NOTE_LIST_FIELDS = ["id", "title", "folder_id", "duration", "is_pinned", "is_archived", "status", "created_at", "updated_at"]
+NOTE_OPTIONAL_FIELDS = ["user_id", "content", "summary", "recording_url", "color", "error"]
+NOTE_PREVIEW_CHARS = 200
+
+HTML_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#39;"))
+
+def html_escaped(column):
+    """The column's text HTML-escaped in SQL, for building markup such as search snippets."""
+    for char, entity in HTML_ESCAPES:
+        column = func.replace(column, char, entity)
+    return column
+
+def note_list_options(fields: Optional[List[str]] = None) -> list:
+    columns = [getattr(Note, field) for field in NOTE_LIST_FIELDS + (fields or [])]
+    preview = func.substr(func.coalesce(Note.summary, Note.content), 1, NOTE_PREVIEW_CHARS)
+    return [load_only(*columns), with_expression(Note.preview, preview)]
 
 def create_note(
     db: Session,
@@ -24,12 +44,81 @@ def create_note(
 def get_note(db: Session, note_id: int) -> Optional[Note]:
     return db.query(Note).filter(Note.id == note_id).first()
 
+def get_user_note(db: Session, note_id: int, user_id: int) -> Optional[Note]:
+    return db.query(Note).filter(Note.id == note_id, Note.user_id == user_id).first()
+
 def get_notes_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Note]:
     return db.query(Note).filter(Note.user_id == user_id).offset(skip).limit(limit).all()
 
 def get_notes_by_folder(db: Session, folder_id: int, skip: int = 0, limit: int = 100) -> List[Note]:
     return db.query(Note).filter(Note.folder_id == folder_id).offset(skip).limit(limit).all()
 
+def get_notes_page_by_user(db: Session, user_id: int, size: int = 100, offset: int = 0, cursor: Optional[str] = None, count: str = "exact", fields: Optional[List[str]] = None) -> dict:
+    query = db.query(Note).filter(Note.user_id == user_id).options(*note_list_options(fields))
+    return paginate(db, query, Note, size=size, offset=offset, cursor=cursor, count=count)
+
+def get_notes_page_by_folder(db: Session, folder_id: int, size: int = 100, offset: int = 0, cursor: Optional[str] = None, count: str = "exact", fields: Optional[List[str]] = None) -> dict:
+    query = db.query(Note).filter(Note.folder_id == folder_id).options(*note_list_options(fields))
+    return paginate(db, query, Note, size=size, offset=offset, cursor=cursor, count=count)
+
+def search_notes(
+    db: Session,
+    query_text: str,
+    user_id: Optional[int] = None,
+    size: int = 20,
+    offset: int = 0,
+    count: str = "exact",
+    fields: Optional[List[str]] = None
+) -> dict:
+    """Ranked full-text search over title, summary and content.
+
+    Matching and ranking only touch the GIN-indexed search_vector; snippets are
+    generated for the returned page only, since ts_headline re-parses the text.
+    Snippets are HTML: the note text is escaped and matches are wrapped in <mark>.
+    """
+    ts_query = func.websearch_to_tsquery(NOTE_SEARCH_CONFIG, query_text)
+    rank = func.ts_rank_cd(Note.search_vector, ts_query).label("rank")
+
+    matches = db.query(Note.id).filter(Note.search_vector.op("@@")(ts_query))
+    if user_id:
+        matches = matches.filter(Note.user_id == user_id)
+    total = count_rows(db, matches, count)
+
+    page = (
+        matches.add_columns(rank)
+        .order_by(rank.desc(), Note.id.desc())
+        .offset(offset)
+        .limit(size)
+        .subquery()
+    )
+    # escaped before highlighting, so <mark> is the only markup in the snippet;
+    # the text search parser reads the entities as single tokens
+    document = func.concat_ws(" ... ", html_escaped(Note.summary), html_escaped(Note.content))
+    snippet = func.ts_headline(
+        NOTE_SEARCH_CONFIG,
+        document,
+        ts_query,
+        "StartSel=<mark>, StopSel=</mark>, MaxFragments=3, MaxWords=25, MinWords=8"
+    ).label("snippet")
+
+    rows = (
+        db.query(Note, page.c.rank, snippet)
+        .join(page, Note.id == page.c.id)
+        .options(*note_list_options(fields))
+        .order_by(page.c.rank.desc(), Note.id.desc())
+        .all()
+    )
+
+    return {
+        "items": rows,
+        "total": total,
+        "size": size,
+        "has_next": total > offset + len(rows) if total is not None else len(rows) == size
+    }
+
+def get_notes_by_status(db: Session, statuses: List[str]) -> List[Note]:
+    return db.query(Note).filter(Note.status.in_(statuses)).all()
+
 def get_total_notes_count(db: Session) -> int:
     return db.query(Note).count()
 
@@ -40,7 +129,9 @@ def update_note(db: Session, note_id: int, note_in: dict) -> Optional[Note]:
     db_note = get_note(db, note_id)
     if not db_note:
         return None
+    return update_note_obj(db, db_note, note_in)
 
+def update_note_obj(db: Session, db_note: Note, note_in: dict) -> Note:
     obj_data = jsonable_encoder(db_note)
     for field in obj_data:
         if field in note_in:
@@ -55,6 +146,9 @@ def delete_note(db: Session, note_id: int) -> bool:
     note = get_note(db, note_id)
     if not note:
         return False
+    return delete_note_obj(db, note)
+
+def delete_note_obj(db: Session, note: Note) -> bool:
     db.delete(note)
     db.commit()
     return True
@@ -89,30 +183,18 @@ def get_many(
     size: int = 100,
     search: Optional[str] = None,
     user_id: Optional[int] = None,
-    sort_by: Optional[str] = None,
-    sort_order: Optional[str] = "asc"
+    cursor: Optional[str] = None,
+    count: str = "exact"
 ) -> dict:
     query = db.query(Note).options(joinedload(Note.user))
 
     if search:
-        query = query.filter(Note.title.ilike(f"%{search}%"))
+        query = query.filter(Note.title.ilike(search_pattern(search), escape=LIKE_ESCAPE))
     if user_id:
         query = query.filter(Note.user_id == user_id)
 
-    total = query.count()
-    pages = (total + size - 1) // size
-    offset = (page - 1) * size
-
-    if sort_by:
-        sort_column = getattr(Note, sort_by, None)
-        if sort_column:
-            if sort_order.lower() == 'desc':
-                sort_column = sort_column.desc()
-            query = query.order_by(sort_column)
-
-    query = query.offset(offset).limit(size)
-
-    items = query.all()
+    result = paginate(db, query, Note, size=size, offset=(page - 1) * size, cursor=cursor, count=count)
+    items = result['items']
 
     with_user_response = []
 
@@ -136,12 +218,5 @@ def get_many(
 
         with_user_response.append(item_dict)
 
-    return {
-        'items': with_user_response,
-        'total': total,
-        'page': page,
-        'size': size,
-        'pages': pages,
-        'has_next': page < pages,
-        'has_previous': page > 1
-    }
+    result['items'] = with_user_response
+    return result
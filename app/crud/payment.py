@@ -0,0 +1,92 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.crud.base import paginate
+from app.models.payment import Payment
+from app.models.user import User
+
+
+# a PaymentIntent never leaves these statuses
+FINAL_STATUSES = ("succeeded", "canceled")
+
+
+def get_by_stripe_id(db: Session, payment_intent_id: str) -> Optional[Payment]:
+    return db.query(Payment).filter(Payment.stripe_payment_intent_id == payment_intent_id).first()
+
+def sum_succeeded_amount(db: Session) -> int:
+    return db.query(func.coalesce(func.sum(Payment.amount), 0)).filter(Payment.status == "succeeded").scalar()
+
+def is_stale(payment: Payment, intent_status: Optional[str], event_created: Optional[int]) -> bool:
+    """Whether an update is older than the row; Stripe does not deliver webhooks in order."""
+    if event_created is not None and payment.event_created is not None and event_created < payment.event_created:
+        return True
+    return payment.status in FINAL_STATUSES and intent_status not in FINAL_STATUSES
+
+def upsert_from_stripe(db: Session, intent, commit: bool = True, event_created: Optional[int] = None) -> Payment:
+    """Creates or refreshes the local row for a Stripe PaymentIntent object.
+
+    event_created is the Stripe timestamp of the state in `intent` (the
+    event's `created` for webhooks); updates older than the row are skipped.
+    """
+    payment = get_by_stripe_id(db, intent.get("id"))
+    if payment and is_stale(payment, intent.get("status"), event_created):
+        return payment
+    customer_id = intent.get("customer")
+    if not payment or customer_id != payment.stripe_customer_id:
+        user = db.query(User.id).filter(User.stripe_customer_id == customer_id).first() if customer_id else None
+        user_id = user.id if user else None
+    else:
+        user_id = payment.user_id
+
+    if not payment:
+        payment = Payment(stripe_payment_intent_id=intent.get("id"))
+        db.add(payment)
+
+    payment.stripe_customer_id = customer_id
+    payment.user_id = user_id
+    payment.amount = intent.get("amount") or 0
+    payment.amount_received = intent.get("amount_received")
+    payment.currency = intent.get("currency")
+    payment.status = intent.get("status")
+    payment.description = intent.get("description")
+    payment.receipt_email = intent.get("receipt_email")
+    payment.created_at = datetime.fromtimestamp(intent.get("created"), timezone.utc)
+    if event_created is not None:
+        payment.event_created = event_created
+
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return payment
+
+def get_many(
+    db: Session,
+    page: int = 1,
+    size: int = 100,
+    customer_id: Optional[str] = None,
+    status: Optional[str] = None,
+    created_gte: Optional[datetime] = None,
+    created_lte: Optional[datetime] = None,
+    amount_gte: Optional[int] = None,
+    amount_lte: Optional[int] = None,
+    cursor: Optional[str] = None,
+    count: str = "exact"
+) -> dict:
+    query = db.query(Payment)
+
+    if customer_id:
+        query = query.filter(Payment.stripe_customer_id == customer_id)
+    if status:
+        query = query.filter(Payment.status == status)
+    if created_gte:
+        query = query.filter(Payment.created_at >= created_gte)
+    if created_lte:
+        query = query.filter(Payment.created_at <= created_lte)
+    if amount_gte is not None:
+        query = query.filter(Payment.amount >= amount_gte)
+    if amount_lte is not None:
+        query = query.filter(Payment.amount <= amount_lte)
+
+    return paginate(db, query, Payment, size=size, offset=(page - 1) * size, cursor=cursor, count=count)
@@ -1,7 +1,20 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, List
 from sqlalchemy.orm import Session
+from app.crud.base import paginate
 from app.models.subscription import Subscription
+from app.models.user import User
+
+
+# a subscription never leaves these statuses
+FINAL_STATUSES = ("canceled", "incomplete_expired")
+
+
+def _from_timestamp(value: Optional[int]) -> Optional[datetime]:
+    # subscription timestamps are stored as naive UTC
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
 
 
 def create(db: Session, subscription_data: dict) -> Subscription:
@@ -57,3 +70,92 @@ def delete_by_stripe_id(db: Session, stripe_subscription_id: str) -> bool:
         db.commit()
         return True
     return False
+
+def count_active(db: Session) -> int:
+    return db.query(Subscription).filter(Subscription.status == "active").count()
+
+def is_stale(subscription: Subscription, subscription_status: Optional[str], event_created: Optional[int]) -> bool:
+    """Whether an update is older than the row; Stripe does not deliver webhooks in order."""
+    if event_created is not None and subscription.event_created is not None and event_created < subscription.event_created:
+        return True
+    return subscription.status in FINAL_STATUSES and subscription_status not in FINAL_STATUSES
+
+def upsert_from_stripe(db: Session, stripe_subscription, commit: bool = True, event_created: Optional[int] = None) -> Subscription:
+    """Creates or refreshes the local row for a Stripe Subscription object.
+
+    event_created is the Stripe timestamp of the state in `stripe_subscription`
+    (the event's `created` for webhooks); updates older than the row are skipped.
+    """
+    subscription = get_by_stripe_id(db, stripe_subscription.get("id"))
+    if subscription and is_stale(subscription, stripe_subscription.get("status"), event_created):
+        return subscription
+    customer_id = stripe_subscription.get("customer")
+    if not subscription or customer_id != subscription.stripe_customer_id or subscription.user_id is None:
+        user = db.query(User.id).filter(User.stripe_customer_id == customer_id).first()
+        user_id = user.id if user else None
+    else:
+        user_id = subscription.user_id
+
+    if not subscription:
+        subscription = Subscription(stripe_subscription_id=stripe_subscription.get("id"))
+        db.add(subscription)
+
+    items = (stripe_subscription.get("items") or {}).get("data") or []
+    item = items[0] if items else {}
+    price = item.get("price") or stripe_subscription.get("plan") or {}
+    recurring = price.get("recurring") or {}
+
+    subscription.stripe_customer_id = customer_id
+    subscription.user_id = user_id
+    subscription.status = stripe_subscription.get("status")
+    # newer API versions only report the billing period on the subscription items
+    subscription.current_period_start = _from_timestamp(
+        stripe_subscription.get("current_period_start") or item.get("current_period_start")
+    )
+    subscription.current_period_end = _from_timestamp(
+        stripe_subscription.get("current_period_end") or item.get("current_period_end")
+    )
+    subscription.price_id = price.get("id")
+    subscription.amount = price.get("unit_amount", price.get("amount"))
+    subscription.currency = price.get("currency")
+    subscription.interval = recurring.get("interval", price.get("interval"))
+    subscription.cancel_at_period_end = bool(stripe_subscription.get("cancel_at_period_end"))
+    subscription.canceled_at = _from_timestamp(stripe_subscription.get("canceled_at"))
+    subscription.ended_at = _from_timestamp(stripe_subscription.get("ended_at"))
+    subscription.created_at = _from_timestamp(stripe_subscription.get("created"))
+    if event_created is not None:
+        subscription.event_created = event_created
+    subscription.updated_at = datetime.utcnow()
+
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return subscription
+
+def get_many(
+    db: Session,
+    page: int = 1,
+    size: int = 100,
+    customer_id: Optional[str] = None,
+    status: Optional[str] = None,
+    price_id: Optional[str] = None,
+    created_gte: Optional[datetime] = None,
+    created_lte: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    count: str = "exact"
+) -> dict:
+    query = db.query(Subscription)
+
+    if customer_id:
+        query = query.filter(Subscription.stripe_customer_id == customer_id)
+    if status:
+        query = query.filter(Subscription.status == status)
+    if price_id:
+        query = query.filter(Subscription.price_id == price_id)
+    if created_gte:
+        query = query.filter(Subscription.created_at >= created_gte)
+    if created_lte:
+        query = query.filter(Subscription.created_at <= created_lte)
+
+    return paginate(db, query, Subscription, size=size, offset=(page - 1) * size, cursor=cursor, count=count)
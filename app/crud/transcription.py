@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.models.transcription import Transcription
+
+
+def get_by_hash(db: Session, audio_sha256: str, created_after: Optional[datetime] = None) -> Optional[Transcription]:
+    query = db.query(Transcription).filter(Transcription.audio_sha256 == audio_sha256)
+    if created_after:
+        query = query.filter(Transcription.created_at >= created_after)
+    return query.first()
+
+def save(db: Session, audio_sha256: str, content: str, summary: str) -> Transcription:
+    transcription = db.query(Transcription).filter(Transcription.audio_sha256 == audio_sha256).first()
+    if transcription:
+        transcription.content = content
+        transcription.summary = summary
+        transcription.created_at = func.now()
+    else:
+        transcription = Transcription(audio_sha256=audio_sha256, content=content, summary=summary)
+        db.add(transcription)
+    try:
+        db.commit()
+    except IntegrityError:
+        # another worker stored the same recording first
+        db.rollback()
+        return get_by_hash(db, audio_sha256)
+    db.refresh(transcription)
+    return transcription
+
+def delete_older_than(db: Session, cutoff: datetime) -> int:
+    deleted = db.query(Transcription).filter(Transcription.created_at < cutoff).delete(synchronize_session=False)
+    db.commit()
+    return deleted
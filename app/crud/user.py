@@ -1,18 +1,20 @@
 from typing import Optional
 from fastapi import HTTPException, status
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from app.crud.base import CRUDBase, PaginatedResponse
+from app.crud.base import LIKE_ESCAPE, CRUDBase, PaginatedResponse, paginate, search_pattern
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import pwd_context
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
-    def create(self, db: Session, *, obj_in: UserCreate) -> User:
+    def create(self, db: Session, *, obj_in: UserCreate, hashed_password: Optional[str] = None) -> User:
+        """Pass hashed_password when it was already computed off the event loop (see password_hasher)."""
         create_data = obj_in.dict()
         create_data.pop("password")
         db_obj = User(
             **create_data,
-            hashed_password=pwd_context.hash(obj_in.password),
+            hashed_password=hashed_password or pwd_context.hash(obj_in.password),
         )
         db.add(db_obj)
         db.commit()
@@ -28,7 +30,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         return user
 
     def get_users(self, db: Session, *, page: int = 1, size: int = 100):
-        return db.query(User).offset(page).limit(size).all()
+        return db.query(User).order_by(User.id).offset((page - 1) * size).limit(size).all()
 
     def get_recent_signups(self, db: Session, *, limit: int = 10):
         return (
@@ -57,30 +59,22 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         size: int = 100,
         search: Optional[str] = None,
         user_id: Optional[int] = None,
-        sort_by: Optional[str] = None,
-        sort_order: Optional[str] = "asc"
+        cursor: Optional[str] = None,
+        count: str = "exact"
     ) -> dict:
         query = db.query(User)
 
         if search:
-            query = query.filter(User.email.ilike(f"%{search}%"))
+            pattern = search_pattern(search)
+            query = query.filter(or_(
+                User.email.ilike(pattern, escape=LIKE_ESCAPE),
+                User.full_name.ilike(pattern, escape=LIKE_ESCAPE)
+            ))
         if user_id:
             query = query.filter(User.id == user_id)
 
-        total = query.count()
-        pages = (total + size - 1)
-        offset = (page - 1) * size
-
-        if sort_by:
-            sort_column = getattr(User, sort_by, None)
-            if sort_column:
-                if sort_order.lower() == 'desc':
-                    sort_column = sort_column.desc()
-                query = query.order_by(sort_column)
-
-        query = query.offset(offset).limit(size)
-
-        items = query.all()
+        result = paginate(db, query, User, size=size, offset=(page - 1) * size, cursor=cursor, count=count)
+        items = result['items']
 
         with_user_response = []
 
@@ -97,15 +91,8 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
 
             with_user_response.append(item_dict)
 
-        return {
-            'items': with_user_response,
-            'total': total,
-            'page': page,
-            'size': size,
-            'pages': pages,
-            'has_next': page < pages,
-            'has_previous': page > 1
-        }
+        result['items'] = with_user_response
+        return result
 
 user = CRUDUser(User)
 
@@ -2,7 +2,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.crud.user import user as user_crud
 from app.schemas import user as user_schema
 from app.utils.deps import get_current_user
 from app.utils.logger import setup_logger
@@ -46,7 +45,7 @@ async def change_password(
     current_user: User = Depends(get_current_user)
 ):
     try:
-        user_service.change_password(db, current_user, old_password, new_password)
+        await user_service.change_password(db, current_user, old_password, new_password)
 
         EmailService.send_email(
             to_email=current_user.email,
@@ -68,7 +67,7 @@ async def delete_account(
     current_user: User = Depends(get_current_user)
 ):
     try:
-        user_crud.delete(db, id=current_user.id)
+        user_service.delete_user(db, user_id=current_user.id)
         logger.info(f"Account deleted: {current_user.email}")
         return {"message": "Account deleted successfully"}
     except Exception as e:
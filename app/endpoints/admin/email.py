@@ -0,0 +1,62 @@
+from typing import List
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.schemas.auth import TokenClaims
+from app.schemas.email import BroadcastCreate, BroadcastResponse
+from app.services import email_broadcast as broadcast_service
+from app.utils.deps import is_admin
+from app.utils.logger import setup_logger
+
+router = APIRouter()
+
+logger = setup_logger("admin_email_api", "admin_email.log")
+
+@router.post("/", response_model=BroadcastResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_broadcast(
+    broadcast_data: BroadcastCreate,
+    db: Session = Depends(get_db),
+    current_user: TokenClaims = Depends(is_admin)
+):
+    try:
+        return await broadcast_service.create_broadcast(db, broadcast_data, created_by=current_user.id)
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        raise
+
+@router.get("/", response_model=List[BroadcastResponse])
+def list_broadcasts(
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: TokenClaims = Depends(is_admin)
+):
+    try:
+        return broadcast_service.list_broadcasts(db, limit=limit)
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        raise
+
+@router.get("/{broadcast_id}", response_model=BroadcastResponse)
+def get_broadcast(
+    broadcast_id: int,
+    db: Session = Depends(get_db),
+    current_user: TokenClaims = Depends(is_admin)
+):
+    try:
+        return broadcast_service.get_broadcast(db, broadcast_id)
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        raise
+
+@router.post("/{broadcast_id}/resume", response_model=BroadcastResponse)
+async def resume_broadcast(
+    broadcast_id: int,
+    db: Session = Depends(get_db),
+    current_user: TokenClaims = Depends(is_admin)
+):
+    try:
+        return await broadcast_service.resume_broadcast(db, broadcast_id)
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        raise
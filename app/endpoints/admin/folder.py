@@ -3,8 +3,8 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from app.core.database import get_db
-from app.models.user import User
 from app.utils.deps import is_admin
+from app.schemas.auth import TokenClaims
 from app.services import folder as folder_service
 from app.utils.logger import setup_logger
 
@@ -15,14 +15,16 @@ logger = setup_logger("admin_folder_api", "admin_folder.log")
 async def get_folders(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(100, ge=1, le=1000, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="How to compute the total"),
     search: Optional[str] = Query(None, description="Search folders by name"),
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenClaims = Depends(is_admin)
 ):
     try:
         filters = {"name": search, "user_id": user_id}
-        return folder_service.get_many(db, page=page, size=size, filters=filters)
+        return folder_service.get_many(db, page=page, size=size, filters=filters, cursor=cursor, count=count)
     except Exception as e:
         logger.error(f"Error: {str(e)}")
         raise
@@ -31,7 +33,7 @@ async def get_folders(
 def get_folder(
     folder_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenClaims = Depends(is_admin)
 ):
     try:
         folder = folder_service.get_folder(db, folder_id=folder_id)
@@ -44,7 +46,7 @@ def get_folder(
 def delete_folder(
     folder_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenClaims = Depends(is_admin)
 ):
     try:
         folder_service.delete_folder(db=db, folder_id=folder_id)
@@ -1,31 +1,68 @@
 from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.models.user import User
-from app.services.user import UserService
+from app.core.database import get_db, get_pool_stats
 from app.utils.deps import is_admin
-from app.services import note as note_service
-from app.services import payment as payment_service
-from app.services import subscription as subscription_service
+from app.schemas.auth import TokenClaims
+from app.services import metrics as metrics_service
+from app.services.email_outbox import email_outbox
+from app.services.transcription_cache import transcription_cache
+from app.services.user_cache import user_cache
 from app.utils.logger import setup_logger
 
 router = APIRouter()
 logger = setup_logger("admin_misc_api", "admin_misc.log")
-user_service = UserService()
 
 @router.get("/")
-async def summary(
+def summary(
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenClaims = Depends(is_admin)
 ):
     try:
-        return {
-            "total_users": user_service.get_total_users(db),
-            "total_notes": note_service.get_total_notes(db),
-            "revenue_generated": await payment_service.get_total_revenue(),
-            "active_subscriptions": await subscription_service.get_total_active_subscriptions()
-        }
+        return metrics_service.get_dashboard_metrics(db)
     except Exception as e:
         logger.error(f"Error: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+@router.get("/transcription-cache")
+def transcription_cache_stats(current_user: TokenClaims = Depends(is_admin)):
+    try:
+        return transcription_cache.stats()
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        raise
+
+@router.get("/user-cache")
+def user_cache_stats(current_user: TokenClaims = Depends(is_admin)):
+    try:
+        return user_cache.stats()
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        raise
+
+@router.get("/email-outbox")
+def email_outbox_stats(current_user: TokenClaims = Depends(is_admin)):
+    try:
+        return email_outbox.stats()
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        raise
+
+
+@router.get("/db-pool")
+def db_pool_stats(current_user: TokenClaims = Depends(is_admin)):
+    try:
+        return get_pool_stats()
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        raise
+
+
+@router.post("/reconcile")
+async def reconcile_metrics(current_user: TokenClaims = Depends(is_admin)):
+    try:
+        return await run_in_threadpool(metrics_service.reconcile_metrics)
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        raise
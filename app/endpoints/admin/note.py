@@ -3,8 +3,8 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from app.core.database import get_db
-from app.models.user import User
 from app.utils.deps import is_admin
+from app.schemas.auth import TokenClaims
 from app.services import note as note_service
 from app.utils.logger import setup_logger
 
@@ -15,14 +15,19 @@ logger = setup_logger("admin_note_api", "admin_note.log")
 async def get_notes(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(100, ge=1, le=1000, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="How to compute the total"),
     search: Optional[str] = Query(None, description="Search notes by title"),
+    q: Optional[str] = Query(None, min_length=1, description="Full-text search over title, summary and transcript, ranked"),
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenClaims = Depends(is_admin)
 ):
     try:
+        if q:
+            return note_service.search_notes(db, query_text=q, user_id=user_id, page=page, size=size, count=count)
         filters = {"title": search, "user_id": user_id}
-        return note_service.get_many(db, page=page, size=size, filters=filters)
+        return note_service.get_many(db, page=page, size=size, filters=filters, cursor=cursor, count=count)
     except Exception as e:
         logger.error(f"Error: {str(e)}")
         raise
@@ -31,7 +36,7 @@ async def get_notes(
 def get_note(
     note_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenClaims = Depends(is_admin)
 ):
     try:
         note = note_service.get_note(db, note_id=note_id)
@@ -44,7 +49,7 @@ def get_note(
 def delete_note(
     note_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenClaims = Depends(is_admin)
 ):
     try:
         note_service.delete_note(db=db, note_id=note_id)
@@ -1,10 +1,10 @@
 from typing import Optional
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.utils.logger import setup_logger
 from app.utils.deps import is_admin
-from app.models.user import User
+from app.schemas.auth import TokenClaims
 from app.services import payment as payment_service
 
 router = APIRouter()
@@ -12,30 +12,33 @@ router = APIRouter()
 logger = setup_logger("admin_payment_api", "admin_payment.log")
 
 @router.get("/", response_model=dict)
-async def list_payments(
-    customer_id: Optional[str] = None,
-    limit: int = 100,
-    starting_after: Optional[str] = None,
-    ending_before: Optional[str] = None,
-    created_gte: Optional[int] = None,
-    created_lte: Optional[int] = None,
-    status: Optional[str] = None,
-    amount_gte: Optional[int] = None,
-    amount_lte: Optional[int] = None,
-    current_user: User = Depends(is_admin),
+def list_payments(
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(100, ge=1, le=1000, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="How to compute the total"),
+    customer_id: Optional[str] = Query(None, description="Filter by Stripe customer ID"),
+    created_gte: Optional[int] = Query(None, description="Created at or after this unix timestamp"),
+    created_lte: Optional[int] = Query(None, description="Created at or before this unix timestamp"),
+    status: Optional[str] = Query(None, description="Filter by PaymentIntent status"),
+    amount_gte: Optional[int] = Query(None, description="Minimum amount, in the smallest currency unit"),
+    amount_lte: Optional[int] = Query(None, description="Maximum amount, in the smallest currency unit"),
+    current_user: TokenClaims = Depends(is_admin),
     db: Session = Depends(get_db)
 ):
     try:
-        return await payment_service.list_payments(
+        return payment_service.list_payments(
+            db,
+            page=page,
+            size=size,
             customer_id=customer_id,
-            limit=limit,
-            starting_after=starting_after,
-            ending_before=ending_before,
             created_gte=created_gte,
             created_lte=created_lte,
-            status=status,
+            payment_status=status,
             amount_gte=amount_gte,
-            amount_lte=amount_lte
+            amount_lte=amount_lte,
+            cursor=cursor,
+            count=count
         )
     except Exception as e:
         logger.error(f"Error listing payments: {str(e)}")
@@ -44,7 +47,7 @@ async def list_payments(
 @router.get("/{payment_intent_id}")
 async def get_payment(
     payment_intent_id: str,
-    current_user: User = Depends(is_admin),
+    current_user: TokenClaims = Depends(is_admin),
     db: Session = Depends(get_db)
 ):
     try:
@@ -57,7 +60,7 @@ async def get_payment(
 async def refund_payment(
     payment_intent_id: str,
     amount: Optional[int] = None,
-    current_user: User = Depends(is_admin),
+    current_user: TokenClaims = Depends(is_admin),
     db: Session = Depends(get_db)
 ):
     try:
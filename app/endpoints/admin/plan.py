@@ -6,7 +6,7 @@ from app.core.database import get_db
 from app.schemas.plan import PlanCreate, PlanResponse, PlanUpdate
 from app.utils.logger import setup_logger
 from app.utils.deps import is_admin
-from app.models.user import User
+from app.schemas.auth import TokenClaims
 from app.services import plan as plan_service
 
 router = APIRouter()
@@ -36,7 +36,7 @@ def get_plan(price_id: str, db: Session = Depends(get_db)):
         raise
 
 @router.post("/", response_model=PlanResponse, status_code=status.HTTP_201_CREATED)
-def create_plan(plan_data: PlanCreate,current_user: User = Depends(is_admin), db: Session = Depends(get_db)):
+def create_plan(plan_data: PlanCreate,current_user: TokenClaims = Depends(is_admin), db: Session = Depends(get_db)):
     try:
         return plan_service.create_plan(
             name=plan_data.name,
@@ -50,7 +50,7 @@ def create_plan(plan_data: PlanCreate,current_user: User = Depends(is_admin), db
 
 
 @router.patch("/{price_id}", response_model=PlanResponse)
-def update_plan(price_id: str, plan_data: PlanUpdate, current_user: User = Depends(is_admin), db: Session = Depends(get_db)):
+def update_plan(price_id: str, plan_data: PlanUpdate, current_user: TokenClaims = Depends(is_admin), db: Session = Depends(get_db)):
     try:
         return plan_service.update_plan(price_id, active=plan_data.active)
     except Exception as e:
@@ -58,7 +58,7 @@ def update_plan(price_id: str, plan_data: PlanUpdate, current_user: User = Depen
         raise
 
 @router.delete("/{price_id}")
-def delete_plan(price_id: str, current_user: User = Depends(is_admin), db: Session = Depends(get_db)):
+def delete_plan(price_id: str, current_user: TokenClaims = Depends(is_admin), db: Session = Depends(get_db)):
     try:
         plan_service.delete_plan(price_id)
         return {"message": "Plan deleted successfully"}
@@ -1,28 +1,64 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.utils.logger import setup_logger
 from app.utils.deps import is_admin
-from app.models.user import User
+from app.schemas.auth import TokenClaims
 from app.services import subscription as subscription_service
 
 router = APIRouter()
 
 logger = setup_logger("admin_subscription_api", "admin_subscription.log")
 
+@router.get("/", response_model=dict)
+def list_subscriptions(
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(100, ge=1, le=1000, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="How to compute the total"),
+    customer_id: Optional[str] = Query(None, description="Filter by Stripe customer ID"),
+    status: Optional[str] = Query(None, description="Filter by subscription status"),
+    price_id: Optional[str] = Query(None, description="Filter by Stripe price ID"),
+    created_gte: Optional[int] = Query(None, description="Created at or after this unix timestamp"),
+    created_lte: Optional[int] = Query(None, description="Created at or before this unix timestamp"),
+    current_user: TokenClaims = Depends(is_admin),
+    db: Session = Depends(get_db)
+):
+    try:
+        return subscription_service.list_subscriptions(
+            db,
+            page=page,
+            size=size,
+            customer_id=customer_id,
+            subscription_status=status,
+            price_id=price_id,
+            created_gte=created_gte,
+            created_lte=created_lte,
+            cursor=cursor,
+            count=count
+        )
+    except Exception as e:
+        logger.error(f"Error listing subscriptions: {str(e)}")
+        raise
+
 @router.get("/active", response_model=dict)
-async def list_subscriptions(
-    limit: int = 100,
-    starting_after: str = None,
-    ending_before: str = None,
-    current_user: User = Depends(is_admin),
+def list_active_subscriptions(
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(100, ge=1, le=1000, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="How to compute the total"),
+    current_user: TokenClaims = Depends(is_admin),
     db: Session = Depends(get_db)
 ):
     try:
-        return await subscription_service.list_active_subscriptions(
-            limit=limit,
-            starting_after=starting_after,
-            ending_before=ending_before
+        return subscription_service.list_subscriptions(
+            db,
+            page=page,
+            size=size,
+            subscription_status="active",
+            cursor=cursor,
+            count=count
         )
     except Exception as e:
         logger.error(f"Error listing subscriptions: {str(e)}")
@@ -5,8 +5,8 @@ from typing import List, Optional
 from app.core.database import get_db
 from app.utils.logger import setup_logger
 from app.utils.deps import is_admin
+from app.schemas.auth import TokenClaims
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
-from app.models.user import User
 from app.services.user import UserService
 
 router = APIRouter()
@@ -18,14 +18,16 @@ logger = setup_logger("admin_user_api", "admin_user.log")
 def get_users(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(100, ge=1, le=1000, description="Items per page"),
-    search: Optional[str] = Query(None, description="Search user by email"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="How to compute the total"),
+    search: Optional[str] = Query(None, description="Search users by email or name"),
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenClaims = Depends(is_admin)
 ):
     try:
         filters = {"email": search, "user_id": user_id}
-        return user_service.get_many(db, page=page, size=size, filters=filters)
+        return user_service.get_many(db, page=page, size=size, filters=filters, cursor=cursor, count=count)
     except Exception as e:
         logger.error(f"Error: {str(e)}")
         raise
@@ -34,7 +36,7 @@ def get_users(
 def get_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenClaims = Depends(is_admin)
 ):
     try:
         user = user_service.find_user_by_id(db, user_id=user_id)
@@ -47,7 +49,7 @@ def get_user(
 def get_recent_signups(
     limit: int = 10,
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenClaims = Depends(is_admin)
 ):
     try:
         return user_service.get_recent_signups(db=db, limit=limit)
@@ -59,7 +61,7 @@ def get_recent_signups(
 def create_user(
     user_in: UserCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenClaims = Depends(is_admin)
 ):
     try:
         user = user_service.user_with_email_exists(db, email=user_in.email)
@@ -78,7 +80,7 @@ def update_user(
     user_id: int,
     user_in: UserUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenClaims = Depends(is_admin)
 ):
     try:
         user = user_service.find_user_by_id(db, user_id=user_id)
@@ -92,7 +94,7 @@ def update_user(
 def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenClaims = Depends(is_admin)
 ):
     try:
         user_service.delete_user(db=db, user_id=user_id)
@@ -105,11 +107,11 @@ def delete_user(
 def toggle_suspend_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenClaims = Depends(is_admin)
 ):
     try:
         user = user_service.find_user_by_id(db, user_id=user_id)
-        data={"is_active": not user.is_active}
+        data={"is_active": not user.is_active, "token_version": (user.token_version or 0) + 1}
         user_service.update_user(db=db, user=user, user_data=data)
 
         return {"message": "User suspended/un-suspended successfully"}
@@ -121,7 +123,7 @@ def toggle_suspend_user(
 def verify_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenClaims = Depends(is_admin)
 ):
     try:
         user = user_service.find_user_by_id(db, user_id=user_id)
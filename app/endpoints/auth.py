@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from app.core.database import get_db
-from app.core.security import create_access_token
+from app.core.security import create_user_access_token
 from app.schemas import auth as auth_schema
 from app.services.email import EmailService
 from app.utils.logger import setup_logger
@@ -23,7 +23,7 @@ auth_service = AuthService()
 async def signup(user_data: auth_schema.UserCreate, db: Session = Depends(get_db)):
     try:
 
-        user = user_service.create_user(db, user_data=user_data)
+        user = await user_service.create_user_async(db, user_data=user_data)
         verification_code =  auth_service.generate_code()
         user_service.update_user(db, user, user_data={
             "verification_code": verification_code,
@@ -83,10 +83,10 @@ async def email_login(user_data: auth_schema.UserLogin, db: Session = Depends(ge
                 detail="Kindly verify account to continue"
             )
 
-        if not auth_service.verify_password(user_data.password, user.hashed_password):
+        if not await auth_service.verify_password(db, user, user_data.password):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect password")
 
-        access_token = create_access_token(data={"sub": user.email})
+        access_token = create_user_access_token(user)
         return {"access_token": access_token, "token_type": "bearer", "user": {"email": user.email, "role": user.role, "full_name":user.full_name}}
     except Exception as e:
         logger.error(f"Error: {str(e)}")
@@ -134,7 +134,7 @@ async def google_login(
 ):
     try:
         user = await user_service.get_or_create_google_user(db, token)
-        access_token = create_access_token(data={"sub": user.email})
+        access_token = create_user_access_token(user)
         logger.info(f"Google login successful: {user.email}")
         return {"access_token": access_token, "token_type": "bearer"}
     except Exception as e:
@@ -193,7 +193,7 @@ async def request_forgot_password(reset_data: auth_schema.UserEmail, db: Session
 async def forgot_password(reset_data: auth_schema.PasswordResetVerify, db: Session = Depends(get_db)):
     try:
         user = user_service.find_user_by_email(db, email=reset_data.email)
-        auth_service.change_password_via_code(db, user, reset_data)
+        await auth_service.change_password_via_code(db, user, reset_data)
 
         EmailService.send_email(
             to_email=user.email,
@@ -202,17 +202,15 @@ async def forgot_password(reset_data: auth_schema.PasswordResetVerify, db: Sessi
             template_context={}
         )
 
-        # invalidate token
-
         return {"message": "Password Reset Successfully"}
     except Exception as e:
         logger.error(f"Error: {str(e)}")
         raise
 
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_user)):
+async def logout(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
    try:
-    #    auth_service.invalidate_token(current_user.id)
+       user_service.revoke_tokens(db, current_user)
        return {"message": "Logged out successfully"}
    except Exception as e:
         logger.error(f"Error: {str(e)}")
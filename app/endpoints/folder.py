@@ -1,13 +1,17 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, get_async_db
 from app.schemas import folder as folder_schema
 from app.utils.logger import setup_logger
 from app.services import folder as folder_service
 from app.services import note as note_service
-from app.utils.deps import get_current_user, is_folder_owner
+from app.utils.deps import get_current_claims, is_folder_owner
+from app.schemas.auth import TokenClaims
 from app.models.user import User
+from app.models.folder import Folder as FolderModel
 
 logger = setup_logger("folder_api", "folder.log")
 
@@ -15,10 +19,10 @@ router = APIRouter()
 
 @router.post("/")
 async def create_folder(folder_data: folder_schema.FolderCreate,
-                       current_user: User = Depends(get_current_user),
-                       db: Session = Depends(get_db)):
+                       current_user: TokenClaims = Depends(get_current_claims),
+                       db: AsyncSession = Depends(get_async_db)):
     try:
-        folder = folder_service.create_folder(db, folder_data=folder_data, user_id=current_user.id)
+        folder = await folder_service.create_folder_async(db, folder_data=folder_data, user_id=current_user.id)
         return folder
     except Exception as e:
         logger.error(f"Folder creation failed: {str(e)}")
@@ -28,10 +32,10 @@ async def create_folder(folder_data: folder_schema.FolderCreate,
         )
 
 @router.get("/")
-async def get_folders(current_user: User = Depends(get_current_user),
-                     db: Session = Depends(get_db)):
+async def get_folders(current_user: TokenClaims = Depends(get_current_claims),
+                     db: AsyncSession = Depends(get_async_db)):
     try:
-        folders = folder_service.get_user_folders(db, user_id=current_user.id)
+        folders = await folder_service.get_user_folders_async(db, user_id=current_user.id)
         return {'data':folders}
     except Exception as e:
         logger.error(f"Getting folders failed: {str(e)}")
@@ -42,10 +46,8 @@ async def get_folders(current_user: User = Depends(get_current_user),
 
 @router.get("/{folder_id}")
 async def get_folder(folder_id: int,
-                    current_user: User = Depends(is_folder_owner),
-                    db: Session = Depends(get_db)):
+                    folder: FolderModel = Depends(is_folder_owner)):
     try:
-        folder = folder_service.get_folder(db, folder_id=folder_id)
         return folder
     except Exception as e:
         logger.error(f"Getting folder failed: {str(e)}")
@@ -59,11 +61,14 @@ def get_folder_notes(
     folder_id: int,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    count: str = Query("exact", pattern="^(exact|estimated|none)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated extra fields, e.g. content,summary"),
     current_user: User = Depends(is_folder_owner),
     db: Session = Depends(get_db)
 ):
     try:
-        return note_service.get_folder_notes(db=db, folder_id=folder_id, skip=skip, limit=limit)
+        return note_service.get_folder_notes(db=db, folder_id=folder_id, skip=skip, limit=limit, cursor=cursor, count=count, fields=fields)
     except Exception as e:
         logger.error(f"Error: {str(e)}")
         raise
@@ -71,10 +76,10 @@ def get_folder_notes(
 @router.put("/{folder_id}")
 async def update_folder(folder_id: int,
                        folder_data: folder_schema.FolderUpdate,
-                       current_user: User = Depends(is_folder_owner),
+                       folder: FolderModel = Depends(is_folder_owner),
                        db: Session = Depends(get_db)):
     try:
-        folder = folder_service.update_folder(db, folder_id=folder_id, folder_data=folder_data)
+        folder = folder_service.update_loaded_folder(db, folder=folder, folder_data=folder_data)
         return folder
     except Exception as e:
         logger.error(f"Updating folder failed: {str(e)}")
@@ -85,10 +90,10 @@ async def update_folder(folder_id: int,
 
 @router.delete("/{folder_id}")
 async def delete_folder(folder_id: int,
-                       current_user: User = Depends(is_folder_owner),
+                       folder: FolderModel = Depends(is_folder_owner),
                        db: Session = Depends(get_db)):
     try:
-        folder_service.delete_folder(db, folder_id=folder_id)
+        folder_service.delete_loaded_folder(db, folder=folder)
         return {'message': "Folder deleted successfully"}
     except Exception as e:
         logger.error(f"Deleting folder failed: {str(e)}")
@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.endpoints.utility import upload_to_cloud
-from app.services.upload import UploadService
-from app.utils.deps import get_current_user, is_note_owner
-from app.schemas.note import Note, NoteUpdate
+from app.utils.deps import get_current_claims, get_user_from_token, is_note_owner
+from app.schemas.note import Note, NoteStatus, NoteUpdate
 from app.services import note as note_service
 from app.services import folder as folder_service
-from app.services import openai as openai_service
-from app.models.user import User
+from app.services.live_transcription import LiveTranscription, finish_live_note
+from app.models.note import Note as NoteModel
+from app.schemas.auth import TokenClaims
 from app.utils.logger import setup_logger
 from typing import Optional
 
@@ -16,50 +17,149 @@ logger = setup_logger("note_api", "note.log")
 router = APIRouter()
 
 @router.post("/")
-async def create_note(folder_id: Optional[int] = None, title: Optional[str] = None, file: UploadFile = File(...), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_note(folder_id: Optional[int] = None, title: Optional[str] = None, file: UploadFile = File(...), current_user: TokenClaims = Depends(get_current_claims), db: Session = Depends(get_db)):
+    upload_path = await note_service.spool_upload(file)
     try:
-        file_bytes = await file.read()
-
-        duration = note_service.validate_audio_file_and_get_length(file_bytes)
-
-        # transcribed_text = openai_service.transcribe_audio(file_bytes)
-        transcribed_text = openai_service.transcribe_long_audio(file_bytes)
-        summarized_text = openai_service.summarize_text(transcribed_text)
-        recording_url = UploadService().upload_audio(file_bytes, folder="audio")
+        duration = await run_in_threadpool(note_service.validate_audio_file_and_get_length, upload_path)
 
         if not folder_id:
             folder_id = folder_service.get_or_create_uncategorized_folder(db, current_user.id)
 
-        # save recording to cloudinary
-        return note_service.create_note(db=db, user_id=current_user.id, note_in={
+        # transcription, summary and upload run on the note worker pool
+        note = note_service.create_note(db=db, user_id=current_user.id, note_in={
             "title": title or file.filename,
-            "content": transcribed_text,
-            "summary": summarized_text,
-            "recording_url": recording_url,
             "duration": duration,
+            "status": note_service.NOTE_STATUS_PENDING,
             "folder_id": folder_id #error
         })
+        return note_service.start_note_processing(db, note, upload_path)
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        if os.path.exists(upload_path):
+            os.unlink(upload_path)
+        raise
+
+@router.websocket("/stream")
+async def stream_note(
+    websocket: WebSocket,
+    token: str,
+    folder_id: Optional[int] = None,
+    title: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Transcribe a recording while it is made.
+
+    Send binary MP3 frames as they are recorded and the text message "stop"
+    when done. The server replies with {"event": "transcript"} messages as
+    segments are transcribed and a final {"event": "done"} with the note.
+    """
+    try:
+        current_user = get_user_from_token(db, token)
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+        return
+
+    await websocket.accept()
+
+    try:
+        if not folder_id:
+            folder_id = folder_service.get_or_create_uncategorized_folder(db, current_user.id)
+
+        note = note_service.create_note(db=db, user_id=current_user.id, note_in={
+            "title": title or "Live recording",
+            "status": note_service.NOTE_STATUS_TRANSCRIBING,
+            "folder_id": folder_id
+        })
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR, reason=getattr(e, "detail", None) or str(e))
+        return
+
+    # don't hold a pooled connection for the length of the recording
+    db.close()
+
+    session = LiveTranscription(note.id)
+    await websocket.send_json({"event": "started", "note_id": note.id})
+
+    sent_segments = 0
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            if message.get("bytes"):
+                await session.write(message["bytes"])
+            elif message.get("text") == "stop":
+                break
+
+            completed = session.completed_segments()
+            if completed > sent_segments:
+                sent_segments = completed
+                await websocket.send_json({"event": "transcript", "note_id": note.id, "text": session.transcript()})
+    except WebSocketDisconnect:
+        # the client went away; finish whatever was recorded in the background
+        note_service.note_jobs.submit(finish_live_note, session)
+        return
     except Exception as e:
         logger.error(f"Error: {str(e)}")
+        note_service.note_jobs.submit(finish_live_note, session)
         raise
 
+    note = await finish_live_note(session)
+    await websocket.send_json({
+        "event": "done",
+        "note_id": session.note_id,
+        "status": note.status if note else note_service.NOTE_STATUS_FAILED,
+        "error": note.error if note else "Note no longer exists",
+        "text": note.content if note else None
+    })
+    await websocket.close()
+
 @router.get("/")
 def get_user_notes(
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    count: str = Query("exact", pattern="^(exact|estimated|none)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated extra fields, e.g. content,summary"),
+    current_user: TokenClaims = Depends(get_current_claims),
     db: Session = Depends(get_db)
 ):
     try:
-        return note_service.get_user_notes(db=db, user_id=current_user.id, skip=skip, limit=limit)
+        return note_service.get_user_notes(db=db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor, count=count, fields=fields)
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        raise
+
+@router.get("/search")
+def search_notes(
+    q: str = Query(..., min_length=1, description="Search terms; supports quoted phrases, OR and -exclusions"),
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated extra fields, e.g. content,summary"),
+    current_user: TokenClaims = Depends(get_current_claims),
+    db: Session = Depends(get_db)
+):
+    try:
+        return note_service.search_notes(db=db, query_text=q, user_id=current_user.id, page=page, size=size, count=count, fields=fields)
     except Exception as e:
         logger.error(f"Error: {str(e)}")
         raise
 
 @router.get("/{note_id}")
-def get_note(note_id: int, db: Session = Depends(get_db), current_user: User = Depends(is_note_owner)):
+def get_note(note_id: int, note: NoteModel = Depends(is_note_owner)):
+    try:
+        return note
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        raise
+
+@router.get("/{note_id}/status", response_model=NoteStatus)
+def get_note_status(note_id: int, note: NoteModel = Depends(is_note_owner)):
     try:
-        return note_service.get_note(db=db, note_id=note_id)
+        return note
     except Exception as e:
         logger.error(f"Error: {str(e)}")
         raise
@@ -68,19 +168,19 @@ def get_note(note_id: int, db: Session = Depends(get_db), current_user: User = D
 def update_note(
     note_id: int,
     note_in: NoteUpdate,
-    current_user: User = Depends(is_note_owner),
+    note: NoteModel = Depends(is_note_owner),
     db: Session = Depends(get_db)
 ):
     try:
-        return note_service.update_note(db=db, note_id=note_id, note_in=note_in)
+        return note_service.update_loaded_note(db=db, note=note, note_in=note_in)
     except Exception as e:
         logger.error(f"Error: {str(e)}")
         raise
 
 @router.delete("/{note_id}")
-def delete_note(note_id: int, current_user: User = Depends(is_note_owner), db: Session = Depends(get_db)):
+def delete_note(note_id: int, note: NoteModel = Depends(is_note_owner), db: Session = Depends(get_db)):
     try:
-        if note_service.delete_note(db=db, note_id=note_id):
+        if note_service.delete_loaded_note(db=db, note=note):
             return {"message": "Note deleted successfully"}
         raise HTTPException(status_code=400, detail="Failed to delete note")
     except Exception as e:
@@ -5,6 +5,7 @@ import stripe
 from app.core.config import settings
 from app.core.database import get_db
 from app.services import subscription as subscription_service
+from app.services import metrics as metrics_service
 from app.schemas.subscription import SubscriptionCreate, SubscriptionResponse
 from app.utils.logger import setup_logger
 
@@ -62,6 +63,7 @@ async def handle_webhook(request: Request, db: Session = Depends(get_db)):
         except stripe.error.SignatureVerificationError as e:
             raise HTTPException(status_code=400, detail="Invalid signature")
 
+        metrics_service.apply_stripe_event(db, event)
         subscription_service.handle_webhook_event(db, event)
 
         return {"status": "success"}
@@ -0,0 +1,57 @@
+from sqlalchemy import JSON, Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+EMAIL_STATUS_PENDING = "pending"
+EMAIL_STATUS_SENDING = "sending"
+EMAIL_STATUS_SENT = "sent"
+EMAIL_STATUS_FAILED = "failed"
+
+BROADCAST_STATUS_PENDING = "pending"
+BROADCAST_STATUS_RUNNING = "running"
+BROADCAST_STATUS_COMPLETED = "completed"
+BROADCAST_STATUS_FAILED = "failed"
+BROADCAST_STATUSES_RESUMABLE = [BROADCAST_STATUS_PENDING, BROADCAST_STATUS_RUNNING]
+
+
+class OutboundEmail(Base):
+    """A message in the email outbox, delivered by the background email worker."""
+    __tablename__ = "outbound_emails"
+    __table_args__ = (
+        Index("ix_outbound_emails_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    html_content = Column(Text, nullable=False)
+    status = Column(String, nullable=False, default=EMAIL_STATUS_PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    # when a pending message is next due; for a message being sent, when its claim lapses
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class EmailBroadcast(Base):
+    """An admin email to every active user, sent in batches with a resumable checkpoint."""
+    __tablename__ = "email_broadcasts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    subject = Column(String, nullable=False)
+    template_name = Column(String, nullable=False)
+    template_context = Column(JSON, nullable=False, default=dict)
+    verified_only = Column(Boolean, nullable=False, default=False)
+    status = Column(String, nullable=False, default=BROADCAST_STATUS_PENDING, index=True)
+    total_recipients = Column(Integer, nullable=True)  # counted when the broadcast is created
+    sent_count = Column(Integer, nullable=False, default=0)
+    batches_sent = Column(Integer, nullable=False, default=0)
+    # checkpoint: recipients are streamed in users.id order, everyone up to here has been sent to
+    last_user_id = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,21 @@
+from sqlalchemy import BigInteger, Column, DateTime, String
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class Metric(Base):
+    """Precomputed dashboard counter, kept current incrementally and by periodic reconciles."""
+    __tablename__ = "metrics"
+
+    key = Column(String, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class StripeEvent(Base):
+    """Stripe webhook events already applied, so redeliveries are not counted twice."""
+    __tablename__ = "stripe_events"
+
+    id = Column(String, primary_key=True)
+    type = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
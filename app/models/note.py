@@ -1,10 +1,26 @@
-from sqlalchemy import ForeignKey, Column, Integer, DateTime,String,Boolean,Text
+from sqlalchemy import ForeignKey, Column, Computed, Index, Integer, DateTime,String,Boolean,Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
 from app.core.database import Base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, query_expression, relationship
+
+NOTE_SEARCH_CONFIG = "english"
+NOTE_SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{NOTE_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{NOTE_SEARCH_CONFIG}', coalesce(summary, '')), 'B') || "
+    f"setweight(to_tsvector('{NOTE_SEARCH_CONFIG}', coalesce(content, '')), 'C')"
+)
 
 class Note(Base):
     __tablename__ = "notes"
+    __table_args__ = (
+        # keyset pagination on (created_at, id), see app.crud.base.paginate
+        Index("ix_notes_created_at_id", "created_at", "id"),
+        Index("ix_notes_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_notes_folder_id_created_at_id", "folder_id", "created_at", "id"),
+        Index("ix_notes_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_notes_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -17,7 +33,14 @@ class Note(Base):
     is_pinned = Column(Boolean, default=False)
     is_archived = Column(Boolean, default=False)
     color = Column(String, nullable=True)
+    status = Column(String, nullable=False, default="done", server_default="done", index=True)  # pending, transcribing, summarizing, done, failed
+    error = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # full-text search document maintained by Postgres; titles rank above summaries above transcripts
+    search_vector = deferred(Column(TSVECTOR, Computed(NOTE_SEARCH_VECTOR, persisted=True)))
+
+    # only populated by list queries, see app.crud.note.NOTE_LIST_FIELDS
+    preview = query_expression()
 
     user = relationship("User", back_populates="notes")
\ No newline at end of file
@@ -0,0 +1,27 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class Payment(Base):
+    """Local copy of a Stripe PaymentIntent, kept in sync by webhooks and the backfill."""
+    __tablename__ = "payments"
+    __table_args__ = (
+        Index("ix_payments_created_at_id", "created_at", "id"),
+        Index("ix_payments_status_created_at", "status", "created_at"),
+        Index("ix_payments_customer_created_at", "stripe_customer_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    stripe_payment_intent_id = Column(String, unique=True, index=True, nullable=False)
+    stripe_customer_id = Column(String, nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    amount = Column(BigInteger, nullable=False, index=True)  # in the smallest currency unit
+    amount_received = Column(BigInteger, nullable=True)
+    currency = Column(String(3), nullable=True)
+    status = Column(String, nullable=False)
+    description = Column(String, nullable=True)
+    receipt_email = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)  # when Stripe created the PaymentIntent
+    event_created = Column(BigInteger, nullable=True)  # Stripe timestamp of the newest state synced; older events are ignored
+    synced_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,9 +1,14 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Boolean, Column, Integer, String, DateTime, ForeignKey, Index
 from app.core.database import Base
 
 class Subscription(Base):
     __tablename__ = "subscriptions"
+    __table_args__ = (
+        Index("ix_subscriptions_created_at_id", "created_at", "id"),
+        Index("ix_subscriptions_status_created_at", "status", "created_at"),
+        Index("ix_subscriptions_customer_created_at", "stripe_customer_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -12,5 +17,13 @@ class Subscription(Base):
     status = Column(String)
     current_period_start = Column(DateTime)
     current_period_end = Column(DateTime)
+    price_id = Column(String, nullable=True)
+    amount = Column(Integer, nullable=True)  # per period, in the smallest currency unit
+    currency = Column(String(3), nullable=True)
+    interval = Column(String, nullable=True)  # month, year
+    cancel_at_period_end = Column(Boolean, default=False)
+    canceled_at = Column(DateTime, nullable=True)
+    ended_at = Column(DateTime, nullable=True)
+    event_created = Column(BigInteger, nullable=True)  # Stripe timestamp of the newest state synced; older events are ignored
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
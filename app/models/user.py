@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String, Integer, DateTime
+from sqlalchemy import Boolean, Column, Index, String, Integer, DateTime
 from sqlalchemy.sql import func
 from app.core.database import Base
 from sqlalchemy.orm import relationship
@@ -6,6 +6,12 @@ from sqlalchemy.orm import relationship
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # pg_trgm indexes for the admin substring search
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+        Index("ix_users_full_name_trgm", "full_name", postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     full_name = Column(String, index=True)
@@ -19,6 +25,7 @@ class User(Base):
     auth_provider = Column(String, default="email")  # email, google, apple
     language = Column(String, nullable=True)
     role = Column(String, nullable=True, default="user")
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")  # bump to revoke issued tokens
     stripe_customer_id = Column(String, nullable=True)
     theme = Column(String, nullable=True)
     reset_code = Column(String, nullable=True)
@@ -16,6 +16,12 @@ class Token(BaseModel):
     token_type: str
     # refresh_token: str
 
+class TokenClaims(BaseModel):
+    id: int
+    email: str
+    role: Optional[str] = None
+    ver: int
+
 class PasswordResetVerify(BaseModel):
     email: EmailStr
     code: str
@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel
+
+
+class BroadcastCreate(BaseModel):
+    subject: str
+    template_name: str
+    # extra template variables; name, full_name and email are filled in per recipient
+    template_context: Dict[str, Any] = {}
+    verified_only: bool = False
+
+
+class BroadcastResponse(BaseModel):
+    id: int
+    subject: str
+    template_name: str
+    verified_only: bool
+    status: str
+    total_recipients: Optional[int] = None
+    sent_count: int
+    batches_sent: int
+    last_user_id: int
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    percent_complete: Optional[float] = None
+    elapsed_seconds: Optional[float] = None
+    recipients_per_second: Optional[float] = None
+
+    class Config:
+        from_attributes = True
@@ -33,8 +33,18 @@ class Note(NoteBase):
     id: int
     user_id: int
     folder_id: int
+    status: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+
+class NoteStatus(BaseModel):
+    id: int
+    status: str
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
@@ -1,3 +1,4 @@
+from datetime import datetime
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 
@@ -31,3 +32,19 @@ class PaymentResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class PaymentRecord(BaseModel):
+    id: int
+    stripe_payment_intent_id: str
+    stripe_customer_id: Optional[str] = None
+    user_id: Optional[int] = None
+    amount: int
+    amount_received: Optional[int] = None
+    currency: Optional[str] = None
+    status: str
+    description: Optional[str] = None
+    receipt_email: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -20,3 +20,23 @@ class SubscriptionResponse(SubscriptionBase):
 
     class Config:
         from_attributes = True
+
+class SubscriptionRecord(BaseModel):
+    id: int
+    user_id: Optional[int] = None
+    stripe_subscription_id: str
+    stripe_customer_id: Optional[str] = None
+    status: Optional[str] = None
+    price_id: Optional[str] = None
+    amount: Optional[int] = None
+    currency: Optional[str] = None
+    interval: Optional[str] = None
+    current_period_start: Optional[datetime] = None
+    current_period_end: Optional[datetime] = None
+    cancel_at_period_end: Optional[bool] = None
+    canceled_at: Optional[datetime] = None
+    ended_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
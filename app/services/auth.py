@@ -3,7 +3,7 @@ import random
 import string
 from app.services.user import UserService
 from datetime import datetime, timedelta
-from app.core.security import pwd_context
+from app.core.security import password_hasher
 
 user_service = UserService()
 
@@ -19,7 +19,7 @@ class AuthService:
         })
         return reset_code
 
-    def change_password_via_code(self, db, user, reset_data):
+    async def change_password_via_code(self, db, user, reset_data):
         if (user.reset_code != reset_data.code or
            user.reset_code_expires_at is None or
            user.reset_code_expires_at < datetime.utcnow()
@@ -29,7 +29,7 @@ class AuthService:
                detail="Invalid or expired reset code"
            )
 
-        hashed_password = pwd_context.hash(reset_data.new_password)
+        hashed_password = await password_hasher.hash(reset_data.new_password)
 
         user_service.update_user(db, user, {
            "hashed_password": hashed_password,
@@ -40,5 +40,11 @@ class AuthService:
            "reset_code_expires_at": None
        })
 
-    def verify_password(self, plain_password, hashed_password):
-        return pwd_context.verify(plain_password, hashed_password)
+        user_service.revoke_tokens(db, user)
+
+    async def verify_password(self, db, user, plain_password) -> bool:
+        """Checks a login password; a hash made with an outdated cost is replaced on success."""
+        valid, new_hash = await password_hasher.verify_and_update(plain_password, user.hashed_password)
+        if valid and new_hash:
+            user_service.update_user(db, user, {"hashed_password": new_hash})
+        return valid
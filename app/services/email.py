@@ -1,34 +1,105 @@
 import os
 import logging
-import requests
+import threading
 from datetime import datetime
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from jinja2 import Environment, FileSystemLoader, select_autoescape, TemplateNotFound
+from typing import Dict, Optional, Tuple
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, meta, nodes, select_autoescape, TemplateNotFound
 
 from app.core.config import settings
+from app.services.email_outbox import email_outbox
 
-template_folder = "app/templates"
-templates = Environment(loader=FileSystemLoader(template_folder))
+template_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'templates')
 
-class EmailService:
-    _template_env = None
+LAYOUT_TEMPLATE = "base.html"
+LAYOUT_BLOCK = "content"
+_LAYOUT_MARKER = "\x00layout-content\x00"
 
-    @classmethod
-    def _get_template_env(cls):
-        if cls._template_env is None:
-            template_dir = os.path.join(
-                os.path.dirname(os.path.abspath(__file__)),
-                '..',
-                'templates'
-            )
 
-            cls._template_env = Environment(
-                loader=FileSystemLoader(template_dir),
-                autoescape=select_autoescape(['html'])
+class EmailTemplates:
+    """The Jinja environment for email templates.
+
+    Templates are autoescaped, compiled once and kept for the life of the
+    process (auto_reload is off), with their bytecode cached on disk so new
+    workers skip the parse too. The layout around the content block of
+    base.html is static, so it is rendered once; templates extending it
+    only render their own content block.
+    """
+
+    def __init__(self, template_dir: str, bytecode_dir: Optional[str] = None):
+        if bytecode_dir:
+            os.makedirs(bytecode_dir, exist_ok=True)
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=select_autoescape(['html']),
+            bytecode_cache=FileSystemBytecodeCache(bytecode_dir) if bytecode_dir else FileSystemBytecodeCache(),
+            auto_reload=False,
+            cache_size=-1
+        )
+        # (head, tail) of the rendered layout; an empty tuple when it cannot be cached
+        self._layout: Optional[Tuple[str, ...]] = None
+        self._uses_layout: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def precompile(self) -> int:
+        """Compiles every template and the layout fragment; called once at startup."""
+        names = self.env.list_templates(extensions=['html'])
+        for name in names:
+            self.env.get_template(name)
+            self._extends_static_layout(name)
+        return len(names)
+
+    def _layout_fragment(self) -> Optional[Tuple[str, str]]:
+        if self._layout is None:
+            with self._lock:
+                if self._layout is None:
+                    self._layout = self._render_layout()
+        return self._layout or None
+
+    def _render_layout(self) -> Tuple[str, ...]:
+        source = self.env.loader.get_source(self.env, LAYOUT_TEMPLATE)[0]
+        layout = self.env.get_template(LAYOUT_TEMPLATE)
+        # only a layout without variables or extra blocks renders the same for everyone
+        if meta.find_undeclared_variables(self.env.parse(source)) or set(layout.blocks) != {LAYOUT_BLOCK}:
+            return ()
+        frame = self.env.from_string(
+            f'{{% extends "{LAYOUT_TEMPLATE}" %}}{{% block {LAYOUT_BLOCK} %}}{_LAYOUT_MARKER}{{% endblock %}}'
+        ).render()
+        head, tail = frame.split(_LAYOUT_MARKER)
+        return head, tail
+
+    def _extends_static_layout(self, template_name: str) -> bool:
+        uses_layout = self._uses_layout.get(template_name)
+        if uses_layout is None:
+            source = self.env.loader.get_source(self.env, template_name)[0]
+            ast = self.env.parse(source)
+            extends = list(ast.find_all(nodes.Extends))
+            calls_super = any(
+                isinstance(call.node, nodes.Name) and call.node.name == 'super'
+                for call in ast.find_all(nodes.Call)
             )
-        return cls._template_env
+            uses_layout = (
+                len(extends) == 1
+                and isinstance(extends[0].template, nodes.Const)
+                and extends[0].template.value == LAYOUT_TEMPLATE
+                and not calls_super
+                and self._layout_fragment() is not None
+            )
+            self._uses_layout[template_name] = uses_layout
+        return uses_layout
+
+    def render(self, template_name: str, context: dict) -> str:
+        template = self.env.get_template(template_name)
+        if template_name != LAYOUT_TEMPLATE and self._extends_static_layout(template_name):
+            head, tail = self._layout_fragment()
+            block = template.blocks[LAYOUT_BLOCK]
+            return head + ''.join(block(template.new_context(context))) + tail
+        return template.render(context)
+
 
+email_templates = EmailTemplates(template_folder, settings.EMAIL_TEMPLATE_BYTECODE_DIR)
+
+
+class EmailService:
     @classmethod
     def render_template(cls, template_name: str, context: dict) -> str:
         try:
@@ -37,10 +108,10 @@ class EmailService:
                 'current_year': datetime.now().year,
                 **context
             }
-
-            template_env = cls._get_template_env()
-            template = template_env.get_template(template_name)
-            return template.render(**default_context)
+            return email_templates.render(template_name, default_context)
+        except TemplateNotFound:
+            logging.error(f"Template '{template_name}' not found.")
+            raise ValueError(f"Template '{template_name}' does not exist.")
         except Exception as e:
             logging.error(f"Error rendering email template {template_name}: {e}")
             raise
@@ -53,46 +124,12 @@ class EmailService:
         template_name: str,
         template_context: dict,
     ):
+        """Renders the template and queues the message in the outbox; delivery happens in the background."""
         try:
-            try:
-                template = templates.get_template(template_name)
-                html_content = template.render(template_context)
-                logging.info(f"Rendered HTML content: {html_content}")  # Log the rendered content
-            except TemplateNotFound:
-                logging.error(f"Template '{template_name}' not found.")
-                raise ValueError(f"Template '{template_name}' does not exist.")
-
-            payload = {
-                "personalizations": [
-                    {
-                        "to": [{"email": to_email}],
-                        "subject": subject
-                    }
-                ],
-                "from": {"email": settings.EMAILS_FROM_EMAIL},
-                "content": [
-                    {
-                        "type": "text/html",
-                        "value": html_content
-                    }
-                ]
-            }
-
-            url = "https://api.sendgrid.com/v3/mail/send"
-
-            headers = {
-                "Authorization": f"Bearer {settings.SENDGRID_API_KEY}",
-                "Content-Type": "application/json"
-            }
-
-            response = requests.post(url, json=payload, headers=headers)
-
-            if response.status_code != 202:
-                logging.error(f"Failed to send email. Status code: {response.status_code}, Response: {response.text}")
-                raise Exception(f"SendGrid API error: {response.text}")
-
-            logging.info(f"Email sent successfully to {to_email}. Status code: {response.status_code}")
+            html_content = cls.render_template(template_name, template_context)
+            email_outbox.enqueue(to_email, subject, html_content)
+            logging.info(f"Email to {to_email} queued")
 
         except Exception as e:
             logging.error(f"Error sending email: {e}")
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,261 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Set
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from markupsafe import escape
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud import email as email_crud
+from app.models.email import (
+    BROADCAST_STATUS_COMPLETED,
+    BROADCAST_STATUS_FAILED,
+    BROADCAST_STATUS_PENDING,
+    EmailBroadcast,
+)
+from app.schemas.email import BroadcastCreate, BroadcastResponse
+from app.services.email import EmailService
+from app.services.email_outbox import MAX_RETRY_DELAY_SECONDS, EmailDeliveryError, email_outbox
+from app.services.jobs import JobQueue
+from app.utils.logger import setup_logger
+
+logger = setup_logger("email_broadcast", "email.log")
+
+SENDGRID_MAX_PERSONALIZATIONS = 1000
+
+# The body is rendered once with these tags in place of the recipient's
+# details; SendGrid substitutes them per personalization.
+RECIPIENT_TAGS = {
+    "name": "-name-",
+    "full_name": "-name-",
+    "email": "-email-",
+}
+
+# one slot for the watcher, one for the broadcast being sent
+broadcast_jobs = JobQueue("email_broadcasts", max_workers=2)
+_submitted: Set[int] = set()
+
+
+def render_broadcast_body(template_name: str, template_context: dict) -> str:
+    return EmailService.render_template(template_name, {**template_context, **RECIPIENT_TAGS})
+
+def build_batch_payload(subject: str, html_content: str, recipients: List[tuple]) -> dict:
+    """One SendGrid request for up to 1000 recipients, each with its own substitutions."""
+    return {
+        "personalizations": [
+            {
+                "to": [{"email": email}],
+                # substitutions are inserted verbatim, so escape them like the template would
+                "substitutions": {
+                    RECIPIENT_TAGS["name"]: str(escape(full_name or "")),
+                    RECIPIENT_TAGS["email"]: str(escape(email)),
+                }
+            }
+            for _, email, full_name in recipients
+        ],
+        "subject": subject,
+        "from": {"email": settings.EMAILS_FROM_EMAIL},
+        "content": [
+            {
+                "type": "text/html",
+                "value": html_content
+            }
+        ]
+    }
+
+def broadcast_progress(broadcast: EmailBroadcast) -> BroadcastResponse:
+    progress = BroadcastResponse.model_validate(broadcast)
+    if broadcast.total_recipients:
+        progress.percent_complete = round(min(broadcast.sent_count / broadcast.total_recipients, 1.0) * 100, 1)
+    if broadcast.started_at:
+        started_at = broadcast.started_at
+        if started_at.tzinfo is None:
+            started_at = started_at.replace(tzinfo=timezone.utc)
+        finished_at = broadcast.finished_at or datetime.now(timezone.utc)
+        if finished_at.tzinfo is None:
+            finished_at = finished_at.replace(tzinfo=timezone.utc)
+        elapsed = max((finished_at - started_at).total_seconds(), 0.0)
+        progress.elapsed_seconds = round(elapsed, 1)
+        if elapsed:
+            progress.recipients_per_second = round(broadcast.sent_count / elapsed, 1)
+    return progress
+
+
+def _create_broadcast(db: Session, broadcast_data: BroadcastCreate, created_by: Optional[int]) -> BroadcastResponse:
+    try:
+        # fail now rather than in the background if the template is missing or broken
+        render_broadcast_body(broadcast_data.template_name, broadcast_data.template_context)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    broadcast = email_crud.create_broadcast(db, {
+        **broadcast_data.model_dump(),
+        "status": BROADCAST_STATUS_PENDING,
+        "total_recipients": email_crud.count_recipients(db, broadcast_data.verified_only),
+        "created_by": created_by
+    })
+    return broadcast_progress(broadcast)
+
+async def create_broadcast(db: Session, broadcast_data: BroadcastCreate, created_by: Optional[int]) -> BroadcastResponse:
+    # the recipient count scans users, so only the submit runs on the event loop
+    progress = await run_in_threadpool(_create_broadcast, db, broadcast_data, created_by)
+    submit_broadcast(progress.id)
+    return progress
+
+def get_broadcast(db: Session, broadcast_id: int) -> BroadcastResponse:
+    broadcast = email_crud.get_broadcast(db, broadcast_id)
+    if not broadcast:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Broadcast not found")
+    return broadcast_progress(broadcast)
+
+def list_broadcasts(db: Session, limit: int = 50) -> List[BroadcastResponse]:
+    return [broadcast_progress(broadcast) for broadcast in email_crud.get_broadcasts(db, limit)]
+
+def _reset_failed_broadcast(db: Session, broadcast_id: int) -> BroadcastResponse:
+    broadcast = email_crud.get_broadcast(db, broadcast_id)
+    if not broadcast:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Broadcast not found")
+    if broadcast.status != BROADCAST_STATUS_FAILED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Only failed broadcasts can be resumed (this one is {broadcast.status})"
+        )
+
+    email_crud.update_broadcast(db, broadcast_id, {"status": BROADCAST_STATUS_PENDING, "error": None, "finished_at": None})
+    db.refresh(broadcast)
+    return broadcast_progress(broadcast)
+
+async def resume_broadcast(db: Session, broadcast_id: int) -> BroadcastResponse:
+    """Restarts a failed broadcast from its checkpoint."""
+    progress = await run_in_threadpool(_reset_failed_broadcast, db, broadcast_id)
+    submit_broadcast(broadcast_id)
+    return progress
+
+
+def submit_broadcast(broadcast_id: int):
+    # must be called on the event loop thread
+    if broadcast_id in _submitted:
+        return
+    _submitted.add(broadcast_id)
+    broadcast_jobs.submit(run_broadcast, broadcast_id)
+
+def _claim(broadcast_id: int) -> Optional[dict]:
+    db = SessionLocal()
+    try:
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.EMAIL_LEASE_SECONDS)
+        if not email_crud.claim_broadcast(db, broadcast_id, stale_before):
+            return None
+        broadcast = email_crud.get_broadcast(db, broadcast_id)
+        return {
+            "subject": broadcast.subject,
+            "template_name": broadcast.template_name,
+            "template_context": broadcast.template_context or {},
+            "verified_only": broadcast.verified_only,
+            "last_user_id": broadcast.last_user_id,
+            "sent_count": broadcast.sent_count,
+            "total_recipients": broadcast.total_recipients
+        }
+    finally:
+        db.close()
+
+def _next_batch(after_user_id: int, limit: int, verified_only: bool) -> List[tuple]:
+    db = SessionLocal()
+    try:
+        return [tuple(row) for row in email_crud.get_recipient_batch(db, after_user_id, limit, verified_only)]
+    finally:
+        db.close()
+
+def _checkpoint(broadcast_id: int, last_user_id: int, sent: int):
+    db = SessionLocal()
+    try:
+        email_crud.checkpoint_broadcast(db, broadcast_id, last_user_id, sent)
+    finally:
+        db.close()
+
+def _finish(broadcast_id: int, values: dict):
+    db = SessionLocal()
+    try:
+        email_crud.update_broadcast(db, broadcast_id, {**values, "finished_at": datetime.now(timezone.utc)})
+    finally:
+        db.close()
+
+def _heartbeat(broadcast_id: int):
+    db = SessionLocal()
+    try:
+        email_crud.update_broadcast(db, broadcast_id, {"updated_at": datetime.now(timezone.utc)})
+    finally:
+        db.close()
+
+async def _send_batch(broadcast_id: int, payload: dict):
+    for attempt in range(1, settings.EMAIL_MAX_ATTEMPTS + 1):
+        try:
+            return await email_outbox.transport.send(payload)
+        except EmailDeliveryError as e:
+            if e.permanent or attempt == settings.EMAIL_MAX_ATTEMPTS:
+                raise
+            # stay well inside the lease so no other worker takes the broadcast over meanwhile
+            delay = min(settings.EMAIL_RETRY_BASE_SECONDS * 2 ** (attempt - 1), MAX_RETRY_DELAY_SECONDS, settings.EMAIL_LEASE_SECONDS // 2)
+            logger.error(f"Broadcast {broadcast_id} batch failed (attempt {attempt}), retrying in {delay}s: {str(e)}")
+            await run_in_threadpool(_heartbeat, broadcast_id)
+            await asyncio.sleep(delay)
+
+async def run_broadcast(broadcast_id: int):
+    """Sends a broadcast from its checkpoint to the end of the recipient list."""
+    try:
+        broadcast = await run_in_threadpool(_claim, broadcast_id)
+    finally:
+        _submitted.discard(broadcast_id)
+    if broadcast is None:
+        # finished, or another worker is sending it
+        return
+
+    try:
+        html_content = render_broadcast_body(broadcast["template_name"], broadcast["template_context"])
+        batch_size = min(settings.EMAIL_BROADCAST_BATCH_SIZE, SENDGRID_MAX_PERSONALIZATIONS)
+        last_user_id = broadcast["last_user_id"]
+        sent = broadcast["sent_count"]
+        sent_this_run = 0
+        started = time.perf_counter()
+        logger.info(f"Broadcast {broadcast_id} starting after user {last_user_id} ({sent} already sent)")
+
+        while True:
+            recipients = await run_in_threadpool(_next_batch, last_user_id, batch_size, broadcast["verified_only"])
+            if not recipients:
+                break
+
+            await _send_batch(broadcast_id, build_batch_payload(broadcast["subject"], html_content, recipients))
+            last_user_id = recipients[-1][0]
+            await run_in_threadpool(_checkpoint, broadcast_id, last_user_id, len(recipients))
+
+            sent += len(recipients)
+            sent_this_run += len(recipients)
+            rate = sent_this_run / max(time.perf_counter() - started, 1e-6)
+            logger.info(
+                f"Broadcast {broadcast_id}: {sent}/{broadcast['total_recipients'] or '?'} sent, "
+                f"{rate:.0f} recipients/s"
+            )
+
+        await run_in_threadpool(_finish, broadcast_id, {"status": BROADCAST_STATUS_COMPLETED})
+        logger.info(f"Broadcast {broadcast_id} completed: {sent} recipients")
+    except Exception as e:
+        logger.error(f"Broadcast {broadcast_id} failed: {str(e)}")
+        await run_in_threadpool(_finish, broadcast_id, {"status": BROADCAST_STATUS_FAILED, "error": str(e)})
+
+def _resumable_broadcast_ids() -> List[int]:
+    db = SessionLocal()
+    try:
+        return [broadcast.id for broadcast in email_crud.get_resumable_broadcasts(db)]
+    finally:
+        db.close()
+
+async def watch_broadcasts(interval_seconds: int = settings.EMAIL_BROADCAST_POLL_SECONDS):
+    """Picks up broadcasts left unfinished by a crash or restart, here or in another worker."""
+    while True:
+        try:
+            for broadcast_id in await run_in_threadpool(_resumable_broadcast_ids):
+                submit_broadcast(broadcast_id)
+        except Exception as e:
+            logger.error(f"Broadcast watcher failed: {str(e)}")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,259 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+import httpx
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud import email as email_crud
+from app.services.jobs import JobQueue
+from app.utils.logger import setup_logger
+
+logger = setup_logger("email_outbox", "email.log")
+
+SENDGRID_SEND_URL = "https://api.sendgrid.com/v3/mail/send"
+MAX_RETRY_DELAY_SECONDS = 60 * 60
+
+
+class EmailDeliveryError(Exception):
+    """A send that did not go through; permanent errors are not retried."""
+
+    def __init__(self, message: str, permanent: bool = False):
+        super().__init__(message)
+        self.permanent = permanent
+
+
+class SendGridTransport:
+    """Posts payloads to SendGrid's v3 mail API over one pooled, keep-alive HTTP client."""
+
+    def __init__(self, api_key: str, max_connections: int, timeout_seconds: float):
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.timeout_seconds = timeout_seconds
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # created on first use so it belongs to the running event loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                timeout=self.timeout_seconds
+            )
+        return self._client
+
+    async def send(self, payload: dict):
+        try:
+            response = await self._get_client().post(SENDGRID_SEND_URL, json=payload)
+        except httpx.HTTPError as e:
+            raise EmailDeliveryError(f"SendGrid request failed: {e!r}")
+
+        if response.status_code >= 300:
+            # 4xx means the payload itself is bad, except for rate limiting
+            permanent = 400 <= response.status_code < 500 and response.status_code != 429
+            raise EmailDeliveryError(
+                f"SendGrid API error {response.status_code}: {response.text[:500]}",
+                permanent=permanent
+            )
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class FakeEmailTransport:
+    """Keeps payloads in memory instead of sending them, for tests and local development.
+
+    Set `fail_with` to an EmailDeliveryError to make every send fail with it.
+    """
+
+    def __init__(self):
+        self.sent: List[dict] = []
+        self.fail_with: Optional[EmailDeliveryError] = None
+
+    async def send(self, payload: dict):
+        if self.fail_with is not None:
+            raise self.fail_with
+        self.sent.append(payload)
+
+    async def aclose(self):
+        pass
+
+
+def build_payload(to_email: str, subject: str, html_content: str) -> dict:
+    return {
+        "personalizations": [
+            {
+                "to": [{"email": to_email}],
+                "subject": subject
+            }
+        ],
+        "from": {"email": settings.EMAILS_FROM_EMAIL},
+        "content": [
+            {
+                "type": "text/html",
+                "value": html_content
+            }
+        ]
+    }
+
+
+class EmailOutbox:
+    """Persists outgoing emails and delivers them from a background worker.
+
+    Callers only pay for one insert. The worker claims due messages in
+    batches, sends each batch concurrently over the transport and retries
+    failures with exponential backoff until max_attempts is reached.
+    """
+
+    def __init__(
+        self,
+        transport,
+        batch_size: int,
+        concurrency: int,
+        max_attempts: int,
+        retry_base_seconds: int,
+        poll_interval_seconds: int,
+        lease_seconds: int
+    ):
+        self.transport = transport
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.lease_seconds = lease_seconds
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def enqueue(self, to_email: str, subject: str, html_content: str) -> int:
+        db = SessionLocal()
+        try:
+            email = email_crud.create(db, to_email=to_email, subject=subject, html_content=html_content)
+        finally:
+            db.close()
+        self._notify()
+        return email.id
+
+    def _notify(self):
+        # enqueue may run in a threadpool thread, so wake the worker through its loop
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def retry_at(self, attempts: int) -> datetime:
+        delay = min(self.retry_base_seconds * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS)
+        # jitter, so messages that failed together are not retried together
+        delay *= random.uniform(1.0, 1.1)
+        return datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+    def _claim(self) -> List[dict]:
+        db = SessionLocal()
+        try:
+            lease_until = datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)
+            return email_crud.claim_batch(db, self.batch_size, lease_until)
+        finally:
+            db.close()
+
+    def _record(self, sent_ids: List[int], failures: list):
+        db = SessionLocal()
+        try:
+            email_crud.mark_sent(db, sent_ids)
+            email_crud.mark_failed(db, failures)
+        finally:
+            db.close()
+
+    async def _send_one(self, message: dict) -> Optional[EmailDeliveryError]:
+        async with self._semaphore:
+            try:
+                await self.transport.send(
+                    build_payload(message["to_email"], message["subject"], message["html_content"])
+                )
+                return None
+            except EmailDeliveryError as e:
+                return e
+            except Exception as e:
+                return EmailDeliveryError(str(e))
+
+    async def deliver_batch(self) -> int:
+        """Sends one batch of due messages and returns how many were claimed."""
+        messages = await run_in_threadpool(self._claim)
+        if not messages:
+            return 0
+
+        errors = await asyncio.gather(*(self._send_one(message) for message in messages))
+
+        sent_ids, failures = [], []
+        for message, error in zip(messages, errors):
+            if error is None:
+                sent_ids.append(message["id"])
+                continue
+            give_up = error.permanent or message["attempts"] >= self.max_attempts
+            retry_at = None if give_up else self.retry_at(message["attempts"])
+            failures.append((message["id"], str(error), retry_at))
+            logger.error(
+                f"Email {message['id']} to {message['to_email']} failed "
+                f"(attempt {message['attempts']}{', giving up' if give_up else ''}): {str(error)}"
+            )
+
+        await run_in_threadpool(self._record, sent_ids, failures)
+        logger.info(f"Delivered {len(sent_ids)} of {len(messages)} emails")
+        return len(messages)
+
+    async def run(self):
+        """Worker loop; wakes on enqueue, or every poll interval for retries and other processes' messages."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        while True:
+            self._wakeup.clear()
+            try:
+                claimed = await self.deliver_batch()
+            except Exception as e:
+                logger.error(f"Email delivery failed: {str(e)}")
+                claimed = 0
+
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def close(self):
+        self._loop = None
+        await self.transport.aclose()
+
+    def stats(self) -> dict:
+        db = SessionLocal()
+        try:
+            return {
+                "transport": type(self.transport).__name__,
+                "by_status": email_crud.count_by_status(db)
+            }
+        finally:
+            db.close()
+
+
+def _create_transport():
+    if settings.EMAIL_TRANSPORT == "fake":
+        return FakeEmailTransport()
+    return SendGridTransport(
+        api_key=settings.SENDGRID_API_KEY,
+        max_connections=settings.EMAIL_SEND_CONCURRENCY,
+        timeout_seconds=settings.EMAIL_HTTP_TIMEOUT_SECONDS
+    )
+
+
+email_outbox = EmailOutbox(
+    _create_transport(),
+    batch_size=settings.EMAIL_BATCH_SIZE,
+    concurrency=settings.EMAIL_SEND_CONCURRENCY,
+    max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+    retry_base_seconds=settings.EMAIL_RETRY_BASE_SECONDS,
+    poll_interval_seconds=settings.EMAIL_POLL_INTERVAL_SECONDS,
+    lease_seconds=settings.EMAIL_LEASE_SECONDS
+)
+email_jobs = JobQueue("email", max_workers=1)
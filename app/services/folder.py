@@ -1,6 +1,8 @@
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud import folder as folder_crud
+from app.crud import async_folder as async_folder_crud
 from app.schemas import folder as folder_schema
 from typing import Dict, List, Optional
 
@@ -25,6 +27,18 @@ def get_folder(db: Session, folder_id: int) -> folder_schema.Folder:
 def get_user_folders(db: Session, user_id: int) -> List[folder_schema.Folder]:
     return folder_crud.get_user_folders(db, user_id=user_id)
 
+async def create_folder_async(db: AsyncSession, user_id: int, folder_data: folder_schema.FolderCreate) -> folder_schema.Folder:
+    try:
+        return await async_folder_crud.create_folder(db, user_id=user_id, name=folder_data.name)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not create folder: {str(e)}"
+        )
+
+async def get_user_folders_async(db: AsyncSession, user_id: int) -> List[folder_schema.Folder]:
+    return await async_folder_crud.get_user_folders(db, user_id=user_id)
+
 def update_folder(db: Session, folder_id: int, folder_data: folder_schema.FolderUpdate) -> folder_schema.Folder:
     folder = folder_crud.update_folder(db, folder_id=folder_id, name=folder_data.name)
     if not folder:
@@ -34,6 +48,12 @@ def update_folder(db: Session, folder_id: int, folder_data: folder_schema.Folder
         )
     return folder
 
+def update_loaded_folder(db: Session, folder, folder_data: folder_schema.FolderUpdate) -> folder_schema.Folder:
+    return folder_crud.update_folder_obj(db, folder=folder, name=folder_data.name)
+
+def delete_loaded_folder(db: Session, folder) -> bool:
+    return folder_crud.delete_folder_obj(db, folder=folder)
+
 def delete_folder(db: Session, folder_id: int) -> bool:
     if not folder_crud.delete_folder(db, folder_id=folder_id):
         raise HTTPException(
@@ -71,7 +91,9 @@ def get_many(
     db: Session,
     page: int = 1,
     size: int = 100,
-    filters: Optional[Dict] = None
+    filters: Optional[Dict] = None,
+    cursor: Optional[str] = None,
+    count: str = "exact"
 ) -> List[folder_schema.Folder]:
     if filters is None:
         filters = {}
@@ -79,10 +101,15 @@ def get_many(
     search = filters.get("name")
     user_id = filters.get("user_id")
 
-    return folder_crud.get_many(
-        db=db,
-        page=page,
-        size=size,
-        search=search,
-        user_id=user_id
-    )
+    try:
+        return folder_crud.get_many(
+            db=db,
+            page=page,
+            size=size,
+            search=search,
+            user_id=user_id,
+            cursor=cursor,
+            count=count
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
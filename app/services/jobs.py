@@ -0,0 +1,41 @@
+import asyncio
+from typing import Awaitable, Callable, Set
+from app.utils.logger import setup_logger
+
+logger = setup_logger("job_queue", "jobs.log")
+
+
+class JobQueue:
+    """Bounded pool of background jobs running on the application's event loop.
+
+    Jobs are coroutines; any blocking work inside them should be pushed to a
+    thread with run_in_threadpool. Jobs are expected to persist their own
+    progress (e.g. a status column) so that unfinished work can be re-submitted
+    after a restart.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(self, fn: Callable[..., Awaitable], *args, **kwargs) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._run(fn, *args, **kwargs))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, fn: Callable[..., Awaitable], *args, **kwargs):
+        async with self._semaphore:
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Job {fn.__name__} on queue '{self.name}' failed: {str(e)}")
+
+    async def shutdown(self, wait: bool = True):
+        tasks = list(self._tasks)
+        if not wait:
+            for task in tasks:
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import shutil
+import tempfile
+from typing import List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from mutagen import File as AudioFile
+from app.core.config import settings
+from app.services import note as note_service
+from app.services import openai as openai_service
+from app.utils.logger import setup_logger
+
+logger = setup_logger("live_transcription", "live_transcription.log")
+
+
+def get_audio_length(file_path: str) -> Optional[float]:
+    try:
+        audio = AudioFile(file_path)
+        return audio.info.length if audio is not None else None
+    except Exception:
+        return None
+
+
+class LiveTranscription:
+    """Transcribes a recording while it is still being streamed in.
+
+    Incoming audio is appended to the note's spool file and to the current
+    segment. Once a segment reaches LIVE_SEGMENT_BYTES it is closed and sent
+    to Whisper in the background, offset by the length of the audio before it.
+    Frames must be self-contained MP3 data so each segment can be decoded on
+    its own. A segment whose transcription fails is transcribed again from
+    the spooled recording when the session finishes.
+    """
+
+    def __init__(self, note_id: int, segment_bytes: int = None):
+        self.note_id = note_id
+        self.segment_bytes = segment_bytes or settings.LIVE_SEGMENT_BYTES
+        self.recording_path = note_service.get_spool_path(note_id)
+        self.duration = 0.0
+
+        os.makedirs(settings.NOTE_SPOOL_DIR, exist_ok=True)
+        self._recording = open(self.recording_path, "wb")
+        self._segment_dir = tempfile.mkdtemp(prefix=f"live_{note_id}_")
+        self._segment = None
+        self._segment_size = 0
+        self._tasks: List[asyncio.Task] = []
+        # (offset, length) in seconds of each segment, parallel to _tasks
+        self._segment_times: List[Tuple[float, float]] = []
+        self._bytes_per_second = settings.LIVE_FALLBACK_BITRATE / 8
+        self._semaphore = asyncio.Semaphore(max(1, settings.TRANSCRIPTION_CONCURRENCY))
+
+    async def write(self, data: bytes):
+        self._recording.write(data)
+
+        if self._segment is None:
+            segment_path = os.path.join(self._segment_dir, f"segment_{len(self._tasks):04d}.mp3")
+            self._segment = open(segment_path, "wb")
+            self._segment_size = 0
+
+        self._segment.write(data)
+        self._segment_size += len(data)
+
+        if self._segment_size >= self.segment_bytes:
+            await self._cut_segment()
+
+    async def _cut_segment(self):
+        if self._segment is None:
+            return
+
+        segment_path = self._segment.name
+        segment_size = self._segment_size
+        self._segment.close()
+        self._segment = None
+
+        length = await run_in_threadpool(get_audio_length, segment_path)
+        if length:
+            self._bytes_per_second = segment_size / length
+        else:
+            # still transcribe it; estimate its length so later timestamps stay close
+            length = segment_size / self._bytes_per_second
+            logger.warning(f"Could not read length of {segment_path}, estimating {length:.1f}s from its size")
+
+        offset = self.duration
+        self.duration += length
+        self._segment_times.append((offset, length))
+        self._tasks.append(asyncio.create_task(self._transcribe(segment_path, offset)))
+
+    async def _transcribe(self, segment_path: str, offset: float) -> List[dict]:
+        async with self._semaphore:
+            return await openai_service.transcribe_audio_chunk_with_retry(segment_path, offset=offset)
+
+    def completed_segments(self) -> int:
+        """Number of leading segments whose transcription has finished."""
+        completed = 0
+        for task in self._tasks:
+            if not task.done():
+                break
+            completed += 1
+        return completed
+
+    def transcript(self) -> str:
+        """Timestamped transcript of every leading segment transcribed so far."""
+        words = []
+        for task in self._tasks[:self.completed_segments()]:
+            if task.exception() is None:
+                words.extend(task.result())
+        return openai_service.stringify_with_timestamps(words, interval=10)
+
+    async def finish(self) -> str:
+        await self._cut_segment()
+        self._recording.close()
+
+        results = await asyncio.gather(*self._tasks, return_exceptions=True)
+        full_transcript = []
+        for (offset, length), result in zip(self._segment_times, results):
+            if isinstance(result, BaseException):
+                logger.warning(
+                    f"Live note {self.note_id}: segment at {offset:.1f}s failed ({str(result)}), "
+                    f"transcribing it from the recording"
+                )
+                result = await self._transcribe_range(offset, length)
+            full_transcript.extend(result)
+        return openai_service.stringify_with_timestamps(full_transcript, interval=10)
+
+    async def _transcribe_range(self, offset: float, length: float) -> List[dict]:
+        range_path = os.path.join(self._segment_dir, f"range_{int(offset * 1000):010d}.mp3")
+        await run_in_threadpool(openai_service.extract_audio_range, self.recording_path, range_path, offset, length)
+        return await openai_service.transcribe_long_audio_words(range_path, offset=offset)
+
+    def cleanup(self):
+        for task in self._tasks:
+            task.cancel()
+        if self._segment is not None:
+            self._segment.close()
+        if not self._recording.closed:
+            self._recording.close()
+        shutil.rmtree(self._segment_dir, ignore_errors=True)
+
+
+async def finish_live_note(session: LiveTranscription):
+    """Wait for the remaining segments, then summarize and upload the recording."""
+    try:
+        transcribed_text = await session.finish()
+
+        await run_in_threadpool(note_service.update_note_state, session.note_id, {
+            "status": note_service.NOTE_STATUS_SUMMARIZING,
+            "content": transcribed_text,
+            "duration": session.duration
+        })
+        summarized_text = await openai_service.summarize_text(transcribed_text)
+        recording_url = await run_in_threadpool(note_service.upload_recording, session.recording_path)
+
+        note = await run_in_threadpool(note_service.update_note_state, session.note_id, {
+            "status": note_service.NOTE_STATUS_DONE,
+            "error": None,
+            "summary": summarized_text,
+            "recording_url": recording_url
+        })
+    except Exception as e:
+        error = getattr(e, "detail", None) or str(e)
+        logger.error(f"Finishing live note {session.note_id} failed: {error}")
+        note = await run_in_threadpool(note_service.update_note_state, session.note_id, {
+            "status": note_service.NOTE_STATUS_FAILED,
+            "error": error
+        })
+    finally:
+        session.cleanup()
+
+    if os.path.exists(session.recording_path):
+        os.unlink(session.recording_path)
+    return note
@@ -0,0 +1,118 @@
+import asyncio
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud import metric as metric_crud
+from app.crud import payment as payment_crud
+from app.crud import subscription as subscription_crud
+from app.models.folder import Folder
+from app.models.note import Note
+from app.models.user import User
+from app.services.jobs import JobQueue
+from app.utils.logger import setup_logger
+
+logger = setup_logger("metrics_service", "metrics.log")
+
+TOTAL_USERS = "total_users"
+TOTAL_NOTES = "total_notes"
+REVENUE_GENERATED = "revenue_generated"
+ACTIVE_SUBSCRIPTIONS = "active_subscriptions"
+DASHBOARD_METRICS = [TOTAL_USERS, TOTAL_NOTES, REVENUE_GENERATED, ACTIVE_SUBSCRIPTIONS]
+
+metrics_jobs = JobQueue("metrics", max_workers=1)
+
+
+# User and note counters follow ORM inserts and deletes inside the same transaction.
+# Rows removed outside the ORM (e.g. ON DELETE CASCADE) are picked up by the reconcile.
+
+@event.listens_for(User, "after_insert")
+def _count_user_created(mapper, connection, target):
+    metric_crud.increment(connection, TOTAL_USERS, 1)
+
+@event.listens_for(User, "before_delete")
+def _count_user_notes_deleted(mapper, connection, target):
+    notes = connection.execute(select(func.count(Note.id)).where(Note.user_id == target.id)).scalar()
+    metric_crud.increment(connection, TOTAL_NOTES, -notes)
+
+@event.listens_for(Folder, "before_delete")
+def _count_folder_notes_deleted(mapper, connection, target):
+    notes = connection.execute(select(func.count(Note.id)).where(Note.folder_id == target.id)).scalar()
+    metric_crud.increment(connection, TOTAL_NOTES, -notes)
+
+@event.listens_for(User, "after_delete")
+def _count_user_deleted(mapper, connection, target):
+    metric_crud.increment(connection, TOTAL_USERS, -1)
+
+@event.listens_for(Note, "after_insert")
+def _count_note_created(mapper, connection, target):
+    metric_crud.increment(connection, TOTAL_NOTES, 1)
+
+@event.listens_for(Note, "after_delete")
+def _count_note_deleted(mapper, connection, target):
+    metric_crud.increment(connection, TOTAL_NOTES, -1)
+
+
+def _active_subscription_delta(db: Session, stripe_event) -> int:
+    subscription = stripe_event.data.object
+    is_active = subscription.get("status") == "active"
+
+    if stripe_event.type == "customer.subscription.created":
+        return 1 if is_active else 0
+    if stripe_event.type == "customer.subscription.updated":
+        previous_attributes = stripe_event.data.get("previous_attributes") or {}
+        if "status" not in previous_attributes:
+            return 0
+        return int(is_active) - int(previous_attributes["status"] == "active")
+    if stripe_event.type == "customer.subscription.deleted":
+        # Stripe does not say what the status was before cancellation, but the
+        # local row is only synced after this runs, so it still holds it
+        previous = subscription_crud.get_by_stripe_id(db, subscription.get("id"))
+        return -1 if previous is not None and previous.status == "active" else 0
+    return 0
+
+def apply_stripe_event(db: Session, stripe_event):
+    """Updates the revenue and subscription counters for one webhook event, at most once per event id.
+
+    Must run before subscription_service.handle_webhook_event syncs the event into the local tables.
+    """
+    if not metric_crud.record_event(db, stripe_event.id, stripe_event.type):
+        logger.info(f"Skipping already applied Stripe event {stripe_event.id}")
+        db.rollback()
+        return
+
+    if stripe_event.type == "payment_intent.succeeded":
+        metric_crud.increment(db, REVENUE_GENERATED, stripe_event.data.object.get("amount") or 0)
+    metric_crud.increment(db, ACTIVE_SUBSCRIPTIONS, _active_subscription_delta(db, stripe_event))
+    db.commit()
+
+
+def get_dashboard_metrics(db: Session) -> dict:
+    values = metric_crud.get_all(db)
+    return {key: values.get(key, 0) for key in DASHBOARD_METRICS}
+
+def reconcile_metrics() -> dict:
+    """Recomputes every counter from the database, correcting any drift.
+
+    Revenue and subscriptions come from the local Stripe mirrors; run
+    scripts/backfill_stripe.py first if webhooks may have been missed.
+    """
+    with SessionLocal() as db:
+        values = {
+            TOTAL_USERS: db.query(User).count(),
+            TOTAL_NOTES: db.query(Note).count(),
+            REVENUE_GENERATED: payment_crud.sum_succeeded_amount(db),
+            ACTIVE_SUBSCRIPTIONS: subscription_crud.count_active(db),
+        }
+        metric_crud.set_values(db, values)
+    logger.info(f"Reconciled metrics: {values}")
+    return values
+
+async def reconcile_periodically(interval_seconds: int = settings.METRICS_RECONCILE_INTERVAL_SECONDS):
+    while True:
+        try:
+            await run_in_threadpool(reconcile_metrics)
+        except Exception as e:
+            logger.error(f"Metrics reconcile failed: {str(e)}")
+        await asyncio.sleep(interval_seconds)
@@ -1,14 +1,33 @@
 from typing import Dict, List, Optional
 import tempfile
 import os
-from fastapi import HTTPException, status
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
 from app.crud import note as note_crud
 from app.crud import folder as folder_crud
 from app.schemas.note import Note, NoteUpdate
+from app.services import openai as openai_service
+from app.services.jobs import JobQueue
+from app.services.transcription_cache import hash_audio_file, transcription_cache
+from app.services.upload import UploadService
+from app.utils.logger import setup_logger
 from mutagen import File, MutagenError
 from mutagen.mp3 import MP3, HeaderNotFoundError
 
+logger = setup_logger("note_service", "note_service.log")
+
+NOTE_STATUS_PENDING = "pending"
+NOTE_STATUS_TRANSCRIBING = "transcribing"
+NOTE_STATUS_SUMMARIZING = "summarizing"
+NOTE_STATUS_DONE = "done"
+NOTE_STATUS_FAILED = "failed"
+NOTE_STATUSES_IN_PROGRESS = [NOTE_STATUS_PENDING, NOTE_STATUS_TRANSCRIBING, NOTE_STATUS_SUMMARIZING]
+
+note_jobs = JobQueue("notes", max_workers=settings.NOTE_WORKER_CONCURRENCY)
+
 
 def create_note(db: Session, user_id: int, note_in):
     folder = folder_crud.get_folder(db, folder_id=note_in['folder_id'])
@@ -30,21 +49,80 @@ def get_note(db: Session, note_id: int):
     return note_crud.get_note(db=db, note_id=note_id)
 
 
-def get_user_notes(db: Session, user_id: int, page: int = 1, per_page: int = 10, skip: int = 0, limit: int = 100):
-    notes = note_crud.get_notes_by_user(db=db, user_id=user_id, skip=skip, limit=limit)
-    total = note_crud.get_total_user_notes_count(db=db, user_id=user_id)
+def parse_note_fields(fields: Optional[str]) -> List[str]:
+    requested = [field.strip() for field in (fields or "").split(",") if field.strip()]
+    unknown = [field for field in requested if field not in note_crud.NOTE_OPTIONAL_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(note_crud.NOTE_OPTIONAL_FIELDS)}"
+        )
+    return requested
+
+
+def note_list_item(note, fields: List[str]) -> dict:
+    item = {field: getattr(note, field) for field in note_crud.NOTE_LIST_FIELDS + fields}
+    item["preview"] = note.preview
+    return item
+
+
+def get_user_notes(db: Session, user_id: int, page: int = 1, per_page: int = 10, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, count: str = "exact", fields: Optional[str] = None):
+    extra_fields = parse_note_fields(fields)
+    try:
+        result = note_crud.get_notes_page_by_user(db=db, user_id=user_id, size=limit, offset=skip, cursor=cursor, count=count, fields=extra_fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    total = result["total"]
 
     return {
-        "items": notes,
+        "items": [note_list_item(note, extra_fields) for note in result["items"]],
         "total": total,
         "page": page,
         "per_page": per_page,
-        "pages": (total + per_page - 1) // per_page
+        "pages": (total + per_page - 1) // per_page if total is not None else None,
+        "has_next": result["has_next"],
+        "next_cursor": result["next_cursor"]
     }
 
 
-def get_folder_notes(db: Session, folder_id: int, skip: int = 0, limit: int = 100) -> List:
-    return note_crud.get_notes_by_folder(db=db, folder_id=folder_id, skip=skip, limit=limit)
+def get_folder_notes(db: Session, folder_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, count: str = "exact", fields: Optional[str] = None) -> dict:
+    extra_fields = parse_note_fields(fields)
+    try:
+        result = note_crud.get_notes_page_by_folder(db=db, folder_id=folder_id, size=limit, offset=skip, cursor=cursor, count=count, fields=extra_fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    result["items"] = [note_list_item(note, extra_fields) for note in result["items"]]
+    return result
+
+
+def search_notes(db: Session, query_text: str, user_id: Optional[int] = None, page: int = 1, size: int = 20, count: str = "exact", fields: Optional[str] = None) -> dict:
+    extra_fields = parse_note_fields(fields)
+    if user_id is None and "user_id" not in extra_fields:
+        extra_fields.append("user_id")
+
+    result = note_crud.search_notes(
+        db=db,
+        query_text=query_text,
+        user_id=user_id,
+        size=size,
+        offset=(page - 1) * size,
+        count=count,
+        fields=extra_fields
+    )
+    total = result["total"]
+
+    return {
+        "items": [
+            {**note_list_item(note, extra_fields), "rank": rank, "snippet": snippet}
+            for note, rank, snippet in result["items"]
+        ],
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": (total + size - 1) // size if total is not None else None,
+        "has_next": result["has_next"],
+        "has_previous": page > 1
+    }
 
 
 def update_note(db: Session, note_id: int, note_in: NoteUpdate):
@@ -55,6 +133,14 @@ def delete_note(db: Session, note_id: int) -> bool:
     return note_crud.delete_note(db=db, note_id=note_id)
 
 
+def update_loaded_note(db: Session, note, note_in: NoteUpdate):
+    return note_crud.update_note_obj(db=db, db_note=note, note_in=note_in.dict(exclude_unset=True))
+
+
+def delete_loaded_note(db: Session, note) -> bool:
+    return note_crud.delete_note_obj(db=db, note=note)
+
+
 def toggle_pin_note(db: Session, note_id: int):
     return note_crud.toggle_pin_note(db=db, note_id=note_id)
 
@@ -66,17 +152,118 @@ def get_total_notes(db: Session) -> int:
     return note_crud.get_total_notes_count(db=db)
 
 
-def validate_audio_file_and_get_length(file_bytes: bytes) -> float:
-    with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
-        temp_file.write(file_bytes)
-        temp_path = temp_file.name
+def get_spool_path(note_id: int) -> str:
+    return os.path.join(settings.NOTE_SPOOL_DIR, f"note_{note_id}.mp3")
+
 
+async def spool_upload(file: UploadFile, chunk_size: int = 1024 * 1024) -> str:
+    """Stream an upload to a single file in the spool directory, chunk by chunk."""
+    os.makedirs(settings.NOTE_SPOOL_DIR, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=settings.NOTE_SPOOL_DIR, suffix='.upload', delete=False) as spool_file:
+        spool_path = spool_file.name
+        try:
+            while chunk := await file.read(chunk_size):
+                spool_file.write(chunk)
+        except Exception:
+            spool_file.close()
+            os.unlink(spool_path)
+            raise
+    return spool_path
+
+
+def start_note_processing(db: Session, note, upload_path: str):
+    """Move the spooled recording into place for the note and queue it for processing."""
+    try:
+        os.replace(upload_path, get_spool_path(note.id))
+    except Exception as e:
+        note_crud.update_note(db=db, note_id=note.id, note_in={
+            "status": NOTE_STATUS_FAILED,
+            "error": f"Could not store recording: {str(e)}"
+        })
+        raise
+
+    note_jobs.submit(process_note, note.id)
+    return note
+
+
+def update_note_state(note_id: int, note_in: dict):
+    """Apply an update in a short-lived session, so no connection is held between pipeline stages."""
+    with SessionLocal() as db:
+        return note_crud.update_note(db, note_id, note_in)
+
+
+async def process_note(note_id: int):
+    """Transcribe, summarize and upload a spooled recording, recording each stage on the note."""
+    audio_path = get_spool_path(note_id)
     try:
-        audio = File(temp_path)
+        note = await run_in_threadpool(update_note_state, note_id, {"error": None})
+        if not note:
+            logger.warning(f"Note {note_id} no longer exists, skipping processing")
+            os.unlink(audio_path)
+            return
+
+        audio_sha256 = await run_in_threadpool(hash_audio_file, audio_path)
+        cached = await run_in_threadpool(transcription_cache.get, audio_sha256)
+
+        if cached:
+            transcribed_text, summarized_text = cached["content"], cached["summary"]
+            logger.info(f"Note {note_id} reused cached transcription {audio_sha256[:12]}")
+        else:
+            await run_in_threadpool(update_note_state, note_id, {"status": NOTE_STATUS_TRANSCRIBING})
+            transcribed_text = await openai_service.transcribe_long_audio(audio_path)
+
+            await run_in_threadpool(update_note_state, note_id, {"status": NOTE_STATUS_SUMMARIZING, "content": transcribed_text})
+            summarized_text = await openai_service.summarize_text(transcribed_text)
+            await run_in_threadpool(transcription_cache.set, audio_sha256, content=transcribed_text, summary=summarized_text)
+
+        recording_url = await run_in_threadpool(upload_recording, audio_path)
+
+        await run_in_threadpool(update_note_state, note_id, {
+            "status": NOTE_STATUS_DONE,
+            "content": transcribed_text,
+            "summary": summarized_text,
+            "recording_url": recording_url
+        })
+    except Exception as e:
+        error = getattr(e, "detail", None) or str(e)
+        logger.error(f"Processing note {note_id} failed: {error}")
+        await run_in_threadpool(update_note_state, note_id, {"status": NOTE_STATUS_FAILED, "error": error})
+
+    # Only reached once the note is done or failed; a cancelled job keeps its
+    # recording so recover_pending_notes() can pick it up again.
+    if os.path.exists(audio_path):
+        os.unlink(audio_path)
+
+
+def upload_recording(audio_path: str) -> str:
+    with open(audio_path, "rb") as audio_file:
+        return UploadService().upload_audio(audio_file, folder="audio")
+
+
+def recover_pending_notes():
+    """Re-queue notes that were still in progress when the process last stopped."""
+    db = SessionLocal()
+    try:
+        for note in note_crud.get_notes_by_status(db, NOTE_STATUSES_IN_PROGRESS):
+            if os.path.exists(get_spool_path(note.id)):
+                logger.info(f"Re-queueing note {note.id} (was {note.status})")
+                note_jobs.submit(process_note, note.id)
+            else:
+                note_crud.update_note(db, note.id, {
+                    "status": NOTE_STATUS_FAILED,
+                    "error": "Recording was lost before processing finished"
+                })
+    finally:
+        db.close()
+
+
+def validate_audio_file_and_get_length(file_path: str) -> float:
+    try:
+        audio = File(file_path)
 
         if audio is None:
             try:
-                audio = MP3(temp_path)
+                audio = MP3(file_path)
             except HeaderNotFoundError:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -114,27 +301,30 @@ def validate_audio_file_and_get_length(file_bytes: bytes) -> float:
             )
         raise e
 
-    finally:
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
-
 
 def get_many(
     db: Session,
     page: int = 1,
     size: int = 100,
-    filters: Optional[Dict] = None
+    filters: Optional[Dict] = None,
+    cursor: Optional[str] = None,
+    count: str = "exact"
 ) -> List[Note]:
     if filters is None:
         filters = {}
 
-    search = filters.get("name")
+    search = filters.get("title")
     user_id = filters.get("user_id")
 
-    return note_crud.get_many(
-        db=db,
-        page=page,
-        size=size,
-        search=search,
-        user_id=user_id
-    )
+    try:
+        return note_crud.get_many(
+            db=db,
+            page=page,
+            size=size,
+            search=search,
+            user_id=user_id,
+            cursor=cursor,
+            count=count
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
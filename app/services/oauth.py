@@ -1,32 +1,179 @@
-
+import asyncio
+import json
+import re
+import time
 import httpx
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
+from jose import jwt
 from app.core.config import settings
 from app.utils.logger import setup_logger
 
 logger = setup_logger("oauth_service", "oauth.log")
 
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+APPLE_JWKS_URL = "https://appleid.apple.com/auth/keys"
+APPLE_ISSUERS = ("https://appleid.apple.com",)
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class JWKSKeySet:
+    """A provider's signing keys, fetched from its JWKS URL and cached in-process.
+
+    Keys are kept for as long as the response's Cache-Control max-age allows.
+    A token signed with a key id we do not know yet (the provider rotated its
+    keys) triggers an early refresh, at most once per min_refresh_seconds so
+    forged key ids cannot be used to hammer the provider.
+    """
+
+    def __init__(self, url: str, default_ttl_seconds: int, min_refresh_seconds: int, timeout_seconds: float = 5.0):
+        self.url = url
+        self.default_ttl_seconds = default_ttl_seconds
+        self.min_refresh_seconds = min_refresh_seconds
+        self.timeout_seconds = timeout_seconds
+        self._keys: Dict[str, dict] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get_key(self, kid: str) -> Optional[dict]:
+        now = time.monotonic()
+        if now < self._expires_at and kid in self._keys:
+            return self._keys[kid]
+
+        async with self._lock:
+            # another request may have refreshed while this one waited
+            now = time.monotonic()
+            expired = now >= self._expires_at
+            unknown_kid = kid not in self._keys and now - self._fetched_at >= self.min_refresh_seconds
+            if expired or unknown_kid:
+                try:
+                    await self._refresh()
+                except Exception as e:
+                    # keep serving the keys we have rather than failing every login
+                    logger.error(f"Fetching signing keys from {self.url} failed: {str(e)}")
+                    self._fetched_at = time.monotonic()
+            return self._keys.get(kid)
+
+    async def _refresh(self):
+        async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+
+        self._keys = {key["kid"]: key for key in response.json().get("keys", [])}
+        self._fetched_at = time.monotonic()
+        self._expires_at = self._fetched_at + self._ttl(response.headers)
+        logger.info(f"Loaded {len(self._keys)} signing keys from {self.url}")
+
+    def _ttl(self, headers) -> int:
+        match = _MAX_AGE.search(headers.get("cache-control", ""))
+        if not match:
+            return self.default_ttl_seconds
+        age = int(headers.get("age", "0") or 0)
+        return max(int(match.group(1)) - age, self.min_refresh_seconds)
+
+
+class StaticKeySet:
+    """A fixed JWKS document, for tests and local development."""
+
+    def __init__(self, jwks: dict):
+        self._keys = {key["kid"]: key for key in jwks.get("keys", [])}
+
+    @classmethod
+    def from_file(cls, path: str) -> "StaticKeySet":
+        with open(path) as jwks_file:
+            return cls(json.load(jwks_file))
+
+    async def get_key(self, kid: str) -> Optional[dict]:
+        return self._keys.get(kid)
+
+
+class IdTokenVerifier:
+    """Verifies OpenID Connect ID tokens locally against a provider's signing keys.
+
+    Only tokens issued to one of our client ids and carrying a verified email
+    are accepted; with no client id configured every token is rejected.
+    """
+
+    def __init__(self, name: str, key_set, issuers: Iterable[str], audiences: List[str]):
+        self.name = name
+        self.key_set = key_set
+        self.issuers = tuple(issuers)
+        self.audiences = audiences
+        if not audiences:
+            logger.warning(f"No {name} client id configured; {name} sign-in is disabled")
+
+    async def verify(self, token: str) -> Optional[dict]:
+        if not self.audiences:
+            # any app can get a token signed by the provider; without our client id to check, none can be trusted
+            logger.error(f"{self.name} token rejected: no {self.name} client id configured")
+            return None
+
+        header = jwt.get_unverified_header(token)
+        if header.get("alg") != "RS256" or not header.get("kid"):
+            logger.error(f"{self.name} token rejected: unexpected header {header}")
+            return None
+
+        key = await self.key_set.get_key(header["kid"])
+        if key is None:
+            logger.error(f"{self.name} token rejected: unknown signing key {header['kid']}")
+            return None
+
+        # exp, iat and the signature are checked by decode; issuer and audience below
+        claims = jwt.decode(token, key, algorithms=["RS256"], options={"verify_aud": False, "verify_at_hash": False})
+        if claims.get("iss") not in self.issuers:
+            logger.error(f"{self.name} token rejected: issuer {claims.get('iss')}")
+            return None
+        audiences = claims.get("aud")
+        audiences = [audiences] if isinstance(audiences, str) else audiences or []
+        if not set(audiences) & set(self.audiences):
+            logger.error(f"{self.name} token rejected: audience {claims.get('aud')}")
+            return None
+        # accounts are matched by email, so it must be one the provider has verified;
+        # Apple sends the flag as a string
+        if not claims.get("email") or claims.get("email_verified") not in (True, "true"):
+            logger.error(f"{self.name} token rejected: email missing or not verified")
+            return None
+        return claims
+
+
+def _client_ids(value: Optional[str]) -> List[str]:
+    # several client ids (web, iOS, Android) may be given comma separated
+    return [client_id.strip() for client_id in (value or "").split(",") if client_id.strip()]
+
+def _key_set(url: str):
+    if settings.OAUTH_JWKS_FILE:
+        return StaticKeySet.from_file(settings.OAUTH_JWKS_FILE)
+    return JWKSKeySet(
+        url,
+        default_ttl_seconds=settings.OAUTH_JWKS_DEFAULT_TTL_SECONDS,
+        min_refresh_seconds=settings.OAUTH_JWKS_MIN_REFRESH_SECONDS
+    )
+
+
 class OAuthService:
+    def __init__(self, google_verifier: Optional[IdTokenVerifier] = None, apple_verifier: Optional[IdTokenVerifier] = None):
+        self.google_verifier = google_verifier or _google_verifier
+        self.apple_verifier = apple_verifier or _apple_verifier
+
     async def verify_google_token(self, token: str) -> Optional[dict]:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"https://oauth2.googleapis.com/tokeninfo?id_token={token}"
-                )
-                if response.status_code == 200:
-                    return response.json()
-                return None
+            return await self.google_verifier.verify(token)
         except Exception as e:
             logger.error(f"Google token verification failed: {str(e)}")
             return None
 
     async def verify_apple_token(self, token: str) -> Optional[dict]:
         try:
-            # Implement Apple token verification
-            # Refer to Apple's documentation for proper implementation
-            pass
+            return await self.apple_verifier.verify(token)
         except Exception as e:
             logger.error(f"Apple token verification failed: {str(e)}")
             return None
 
-oauth_service = OAuthService()
\ No newline at end of file
+
+# Shared by every OAuthService, so all of them use the same cached keys
+_google_verifier = IdTokenVerifier("Google", _key_set(GOOGLE_JWKS_URL), GOOGLE_ISSUERS, _client_ids(settings.GOOGLE_CLIENT_ID))
+_apple_verifier = IdTokenVerifier("Apple", _key_set(APPLE_JWKS_URL), APPLE_ISSUERS, _client_ids(settings.APPLE_CLIENT_ID))
+
+oauth_service = OAuthService()
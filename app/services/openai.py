@@ -141,11 +141,15 @@
 #     return "\n".join(output)
 
 
+import asyncio
 import os
+import re
 import tempfile
 from typing import Optional, List
-from openai import OpenAI
+from openai import AsyncOpenAI
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from mutagen import File as AudioFile
 from app.core.config import settings
 from app.utils.logger import setup_logger
 import ffmpeg
@@ -153,10 +157,10 @@ import shutil
 import math
 
 logger = setup_logger("openai_service", "openai.log")
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 
-def split_audio(input_path: str, chunk_length: int = 600):
-    output_dir = os.path.dirname(input_path)
+def split_audio(input_path: str, chunk_length: int = 600, output_dir: Optional[str] = None):
+    output_dir = output_dir or os.path.dirname(input_path)
     base_name = os.path.splitext(os.path.basename(input_path))[0]
     output_template = os.path.join(output_dir, f"{base_name}_%03d.mp3")
 
@@ -172,9 +176,16 @@ def split_audio(input_path: str, chunk_length: int = 600):
         if f.startswith(base_name + "_")
     ])
 
-def transcribe_audio_chunk(file_path: str, offset: float):
+def extract_audio_range(input_path: str, output_path: str, start: float, duration: float):
+    """Copies `duration` seconds of audio starting at `start` into a file of its own, without re-encoding."""
+    ffmpeg.input(input_path, ss=start, t=duration).output(
+        output_path,
+        c='copy'
+    ).run(quiet=True, overwrite_output=True)
+
+async def transcribe_audio_chunk(file_path: str, offset: float):
     with open(file_path, "rb") as audio_file:
-        response = client.audio.transcriptions.create(
+        response = await client.audio.transcriptions.create(
             model="whisper-1",
             response_format="verbose_json",
             timestamp_granularities=["word"],
@@ -191,28 +202,75 @@ def transcribe_audio_chunk(file_path: str, offset: float):
 
     return adjusted_words
 
-def transcribe_long_audio(audio_bytes: bytes):
-    try:
-        if shutil.which("ffmpeg") is None:
-            raise RuntimeError("ffmpeg is not installed or not found in system PATH")
+async def transcribe_audio_chunk_with_retry(file_path: str, offset: float, retries: int = None):
+    if retries is None:
+        retries = settings.TRANSCRIPTION_CHUNK_RETRIES
 
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
-            temp_file.write(audio_bytes)
-            temp_path = temp_file.name
+    attempt = 0
+    while True:
+        try:
+            return await transcribe_audio_chunk(file_path, offset=offset)
+        except Exception as e:
+            if attempt >= retries:
+                raise
+            attempt += 1
+            logger.warning(f"Retrying chunk {os.path.basename(file_path)} (attempt {attempt}/{retries}): {str(e)}")
+            await asyncio.sleep(2 ** attempt)
+
+def get_chunk_offsets(chunks: List[str], chunk_length: int = 600) -> List[float]:
+    # Segments are cut on frame boundaries, so use each chunk's real length
+    # rather than assuming exactly chunk_length seconds per segment.
+    offsets = []
+    offset = 0.0
+    for chunk_path in chunks:
+        offsets.append(offset)
+        audio = AudioFile(chunk_path)
+        offset += audio.info.length if audio is not None else chunk_length
+    return offsets
+
+async def gather_or_cancel(*coros):
+    """gather() that, when one task fails, cancels the rest and waits for them before raising.
+
+    Plain gather() leaves the other chunks running (and retrying) after the
+    caller has already given up and removed their files.
+    """
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+async def transcribe_long_audio_words(audio_path: str, chunk_length: int = 600, offset: float = 0.0) -> List[dict]:
+    """Words of a recording of any length, with timestamps shifted by `offset` seconds."""
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("ffmpeg is not installed or not found in system PATH")
+
+    # Segments are written to a scratch directory; the source file is read in place
+    chunk_dir = tempfile.mkdtemp(prefix="chunks_")
+    try:
+        chunks = await run_in_threadpool(split_audio, audio_path, chunk_length=chunk_length, output_dir=chunk_dir)  # 10 min
+        offsets = await run_in_threadpool(get_chunk_offsets, chunks, chunk_length=chunk_length)
 
-        chunks = split_audio(temp_path, chunk_length=600)  # 10 min
-        full_transcript = []
+        # Chunks are transcribed concurrently; gather() keeps results in chunk order
+        semaphore = asyncio.Semaphore(max(1, settings.TRANSCRIPTION_CONCURRENCY))
 
-        for index, chunk_path in enumerate(chunks):
-            offset = index * 600  # adjust timestamps by chunk start
-            words = transcribe_audio_chunk(chunk_path, offset=offset)
-            full_transcript.extend(words)
+        async def transcribe(chunk_path: str, chunk_offset: float):
+            async with semaphore:
+                return await transcribe_audio_chunk_with_retry(chunk_path, offset=offset + chunk_offset)
 
-        # Cleanup
-        for path in [temp_path] + chunks:
-            if os.path.exists(path):
-                os.unlink(path)
+        chunk_words = await gather_or_cancel(*[
+            transcribe(chunk_path, chunk_offset) for chunk_path, chunk_offset in zip(chunks, offsets)
+        ])
+        return [word for words in chunk_words for word in words]
+    finally:
+        shutil.rmtree(chunk_dir, ignore_errors=True)
 
+async def transcribe_long_audio(audio_path: str, chunk_length: int = 600):
+    try:
+        full_transcript = await transcribe_long_audio_words(audio_path, chunk_length=chunk_length)
         transcript_text = stringify_with_timestamps(full_transcript, interval=10)
 
         return transcript_text
@@ -224,7 +282,7 @@ def transcribe_long_audio(audio_bytes: bytes):
             detail=f"Failed to transcribe audio: {str(e)}"
         )
 
-def transcribe_audio(audio_bytes: bytes):
+async def transcribe_audio(audio_bytes: bytes):
     try:
         with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
             temp_file.write(audio_bytes)
@@ -232,7 +290,7 @@ def transcribe_audio(audio_bytes: bytes):
 
         try:
             with open(temp_path, "rb") as audio_file:
-                response = client.audio.transcriptions.create(
+                response = await client.audio.transcriptions.create(
                     model="whisper-1",
                     response_format="verbose_json",
                     timestamp_granularities=["word"],
@@ -282,7 +340,128 @@ def stringify_with_timestamps(words: List[dict], interval: int = 10) -> str:
 
     return "\n".join(output)
 
-def summarize_text(text: str) -> Optional[str]:
+SOAP_SYSTEM_PROMPT = (
+    "You are a dental assistant AI that summarizes text using the SOAP framework. The SOAP format consists of:\n\n"
+    "- **Subjective (S):** Patient's reported symptoms, concerns, and dental history.\n"
+    "- **Objective (O):** Clinical findings, test results, and observations from the dental examination.\n"
+    "- **Assessment (A):** Diagnosis or professional evaluation of the patient's dental condition.\n"
+    "- **Plan (P):** Recommended treatment, procedures, follow-up care, and next steps.\n\n"
+    "Ensure that each section is concise, clear, and professionally formatted."
+)
+
+PARTIAL_NOTES_PROMPT = (
+    "You are a dental assistant AI. You will receive one part of a longer, timestamped appointment "
+    "transcript. Extract every clinically relevant detail from it as short bullet notes grouped under "
+    "Subjective, Objective, Assessment and Plan, keeping the [mm:ss] timestamps of key findings. "
+    "Do not invent details and omit small talk."
+)
+
+TIMESTAMP_LINE = re.compile(r"^\[\d{2,}:\d{2}\]")
+
+
+def split_transcript(text: str, max_chars: int) -> List[str]:
+    """Split a transcript into chunks of at most max_chars, cutting only between [mm:ss] lines."""
+    lines = []
+    for line in text.splitlines():
+        if lines and not TIMESTAMP_LINE.match(line):
+            lines[-1] += "\n" + line  # keep continuation lines with their timestamp
+        else:
+            lines.append(line)
+
+    chunks = []
+    current = ""
+    for line in lines:
+        # a single oversized line is hard-split rather than dropped
+        while len(line) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:max_chars])
+            line = line[max_chars:]
+
+        if current and len(current) + len(line) + 1 > max_chars:
+            chunks.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _batch_partials(partials: List[str], max_chars: int) -> List[str]:
+    batches = []
+    for partial in partials:
+        if batches and len(batches[-1]) + len(partial) + 2 <= max_chars:
+            batches[-1] += "\n\n" + partial
+        else:
+            batches.append(partial)
+    return batches
+
+
+def _record_usage(usage: dict, stage: str, response):
+    stage_usage = usage.setdefault(stage, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0})
+    stage_usage["calls"] += 1
+    if response.usage:
+        stage_usage["prompt_tokens"] += response.usage.prompt_tokens
+        stage_usage["completion_tokens"] += response.usage.completion_tokens
+        stage_usage["total_tokens"] += response.usage.total_tokens
+
+
+async def _complete(system_prompt: str, user_content: str, max_tokens: int, usage: dict, stage: str) -> str:
+    response = await client.chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content}
+        ],
+        max_tokens=max_tokens,
+        temperature=0.7,
+    )
+    _record_usage(usage, stage, response)
+    return response.choices[0].message.content
+
+
+async def summarize_transcript(text: str) -> dict:
+    """Map-reduce SOAP summarization of a transcript of any length.
+
+    Returns the final report together with token usage per stage: "map" for the
+    per-chunk notes, "combine" for intermediate merges and "reduce" for the
+    final SOAP report.
+    """
+    max_chars = settings.SUMMARY_CHUNK_CHARS
+    semaphore = asyncio.Semaphore(max(1, settings.SUMMARY_CONCURRENCY))
+    usage = {}
+
+    async def extract_notes(chunk: str, stage: str) -> str:
+        async with semaphore:
+            return await _complete(PARTIAL_NOTES_PROMPT, chunk, max_tokens=500, usage=usage, stage=stage)
+
+    chunks = split_transcript(text, max_chars)
+    if len(chunks) > 1:
+        partials = await asyncio.gather(*[extract_notes(chunk, "map") for chunk in chunks])
+
+        # merge partial notes in batches until they fit a single request
+        while len("\n\n".join(partials)) > max_chars:
+            batches = _batch_partials(partials, max_chars)
+            if len(batches) == len(partials):
+                break  # nothing left to merge
+            partials = await asyncio.gather(*[extract_notes(batch, "combine") for batch in batches])
+
+        text = "\n\n".join(partials)
+
+    summary = await _complete(
+        SOAP_SYSTEM_PROMPT,
+        f"Please summarize - as a report - this text using the SOAP framework:\n\n{text}",
+        max_tokens=500,
+        usage=usage,
+        stage="reduce"
+    )
+    return {"summary": summary, "usage": usage}
+
+
+async def summarize_text(text: str) -> Optional[str]:
     try:
         if not text:
             raise HTTPException(
@@ -290,17 +469,10 @@ def summarize_text(text: str) -> Optional[str]:
                 detail="No text provided for summarization"
             )
 
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                { "role": "system", "content": "You are a dental assistant AI that summarizes text using the SOAP framework. The SOAP format consists of:\n\n- **Subjective (S):** Patient's reported symptoms, concerns, and dental history.\n- **Objective (O):** Clinical findings, test results, and observations from the dental examination.\n- **Assessment (A):** Diagnosis or professional evaluation of the patient's dental condition.\n- **Plan (P):** Recommended treatment, procedures, follow-up care, and next steps.\n\nEnsure that each section is concise, clear, and professionally formatted."},
-                { "role": "user",  "content": f"Please summarize - as a report - this text using the SOAP framework:\n\n{text}"}
-            ],
-            max_tokens=300,
-            temperature=0.7
-        )
+        result = await summarize_transcript(text)
+        logger.info(f"Summarization token usage: {result['usage']}")
 
-        return response.choices[0].message.content
+        return result["summary"]
 
     except Exception as e:
         logger.error(f"Error summarizing text: {str(e)}")
@@ -308,46 +480,3 @@ def summarize_text(text: str) -> Optional[str]:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to summarize text: {str(e)}"
         )
-
-def summarize_text(text: str) -> Optional[str]:
-    try:
-        if not text:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No text provided for summarization"
-            )
-
-        # If text is too long, just cut it down
-        max_length = 16000  # about 4000 tokens, adjust if needed
-        if len(text) > max_length:
-            text = text[:max_length]
-
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a dental assistant AI that summarizes text using the SOAP framework. The SOAP format consists of:\n\n"
-                               "- **Subjective (S):** Patient's reported symptoms, concerns, and dental history.\n"
-                               "- **Objective (O):** Clinical findings, test results, and observations from the dental examination.\n"
-                               "- **Assessment (A):** Diagnosis or professional evaluation of the patient's dental condition.\n"
-                               "- **Plan (P):** Recommended treatment, procedures, follow-up care, and next steps.\n\n"
-                               "Ensure that each section is concise, clear, and professionally formatted."
-                },
-                {
-                    "role": "user",
-                    "content": f"Please summarize - as a report - this text using the SOAP framework:\n\n{text}"
-                }
-            ],
-            max_tokens=500,  # you can adjust if needed
-            temperature=0.7,
-        )
-
-        return response.choices[0].message.content
-
-    except Exception as e:
-        logger.error(f"Error summarizing text: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to summarize text: {str(e)}"
-        )
\ No newline at end of file
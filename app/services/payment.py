@@ -1,8 +1,16 @@
+from datetime import datetime, timezone
+from typing import Optional
+import time
 import stripe
 from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.crud import payment as payment_crud
 from app.models.user import User
-from app.schemas.payment import CheckoutSessionCreate, PaymentIntentCreate
+from app.schemas.payment import CheckoutSessionCreate, PaymentIntentCreate, PaymentRecord
+from app.utils.logger import setup_logger
+
+logger = setup_logger("payment_service", "payment.log")
 
 # Configure Stripe API key
 stripe.api_key = settings.STRIPE_SECRET_KEY
@@ -81,89 +89,64 @@ async def attach_payment_method_to_customer(payment_method_id: str, customer_id:
             detail=str(e)
         )
 
-async def get_total_revenue():
-    try:
-        params = {"limit": 100}
-
-        total_revenue = 0
-        has_more = True
-        last_payment = None
-
-        while has_more:
-            if last_payment:
-                params["starting_after"] = last_payment
-
-            payment_intents = stripe.PaymentIntent.list(**params)
-
-            for payment in payment_intents.data:
-                if payment.status == "succeeded":
-                    total_revenue += payment.amount
+def _from_unix(value: Optional[int]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, timezone.utc) if value is not None else None
 
-            has_more = payment_intents.has_more
-            if has_more and payment_intents.data:
-                last_payment = payment_intents.data[-1].id
-
-        return total_revenue
-    except stripe.error.StripeError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-
-async def list_payments(
+def list_payments(
+    db: Session,
+    page: int = 1,
+    size: int = 100,
     customer_id: str = None,
-    limit: int = 100,
-    starting_after: str = None,
-    ending_before: str = None,
     created_gte: int = None,
     created_lte: int = None,
-    status: str = None,
+    payment_status: str = None,
     amount_gte: int = None,
-    amount_lte: int = None
-):
+    amount_lte: int = None,
+    cursor: str = None,
+    count: str = "exact"
+) -> dict:
+    """Filters the local payments table; created_* are unix timestamps, as in the Stripe API."""
     try:
-        params = {"limit": min(limit, 100)}
-
-        if customer_id:
-            params["customer"] = customer_id
-        if starting_after:
-            params["starting_after"] = starting_after
-        if ending_before:
-            params["ending_before"] = ending_before
-
-        # Add date filters
-        if created_gte or created_lte:
-            params["created"] = {}
-            if created_gte:
-                params["created"]["gte"] = created_gte
-            if created_lte:
-                params["created"]["lte"] = created_lte
-
-        # Add status filter
-        if status:
-            params["status"] = status
-
-        # Add amount filters
-        if amount_gte or amount_lte:
-            params["amount"] = {}
-            if amount_gte:
-                params["amount"]["gte"] = amount_gte
-            if amount_lte:
-                params["amount"]["lte"] = amount_lte
-
-        payment_intents = stripe.PaymentIntent.list(**params)
-
-        return {
-            "data": payment_intents.data,
-            "has_more": payment_intents.has_more,
-            "total_count": len(payment_intents.data)
-        }
-
-    except stripe.error.StripeError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
+        result = payment_crud.get_many(
+            db,
+            page=page,
+            size=size,
+            customer_id=customer_id,
+            status=payment_status,
+            created_gte=_from_unix(created_gte),
+            created_lte=_from_unix(created_lte),
+            amount_gte=amount_gte,
+            amount_lte=amount_lte,
+            cursor=cursor,
+            count=count
         )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    result['items'] = [PaymentRecord.model_validate(item) for item in result['items']]
+    return result
+
+def sync_payment_intent(db: Session, intent, commit: bool = True, event_created: int = None):
+    return payment_crud.upsert_from_stripe(db, intent, commit=commit, event_created=event_created)
+
+def backfill_payments(db: Session, created_gte: int = None, batch_size: int = 100) -> int:
+    """Copies every PaymentIntent from Stripe into the payments table; safe to re-run."""
+    params = {"limit": 100}
+    if created_gte:
+        params["created"] = {"gte": created_gte}
+
+    # listed objects are at least as new as the moment the listing started
+    listed_at = int(time.time())
+    synced = 0
+    for intent in stripe.PaymentIntent.list(**params).auto_paging_iter():
+        sync_payment_intent(db, intent, commit=False, event_created=listed_at)
+        synced += 1
+        if synced % batch_size == 0:
+            db.commit()
+            logger.info(f"Backfilled {synced} payments")
+    db.commit()
+    logger.info(f"Backfilled {synced} payments")
+    return synced
 
 async def create_checkout_session(data: CheckoutSessionCreate, user: User):
     try:
@@ -1,10 +1,68 @@
-from typing import List, Optional
+import threading
+import time
+from typing import Dict, List, Optional
 from fastapi import HTTPException, status
 import stripe
 from app.core.config import settings
+from app.utils.logger import setup_logger
 
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
+logger = setup_logger("plan_service", "plan.log")
+
+
+class PlanCatalog:
+    """Active plans keyed by price id, cached in-process for ttl_seconds.
+
+    The whole catalog is loaded with one Price.list call that expands each
+    price's product. Admin changes and price/product webhooks invalidate it;
+    other workers pick up those changes when their copy expires.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._plans: Optional[Dict[str, dict]] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_all(self) -> Dict[str, dict]:
+        plans = self._plans
+        if plans is not None and time.monotonic() - self._loaded_at < self.ttl_seconds:
+            return plans
+
+        with self._lock:
+            # another thread may have reloaded while this one waited
+            if self._plans is not None and time.monotonic() - self._loaded_at < self.ttl_seconds:
+                return self._plans
+            prices = stripe.Price.list(active=True, type="recurring", expand=["data.product"], limit=100)
+            self._plans = {price.id: _plan_from_price(price) for price in prices.auto_paging_iter()}
+            self._loaded_at = time.monotonic()
+            logger.info(f"Loaded {len(self._plans)} plans from Stripe")
+            return self._plans
+
+    def invalidate(self):
+        with self._lock:
+            self._plans = None
+
+
+def _plan_from_price(price) -> dict:
+    # price.product is the expanded Product object
+    return {
+        "product_id": price.product.id,
+        "price_id": price.id,
+        "name": price.product.name,
+        "amount": price.unit_amount,
+        "currency": price.currency,
+        "interval": price.recurring.interval,
+        "active": price.active
+    }
+
+
+plan_catalog = PlanCatalog(settings.PLAN_CATALOG_TTL_SECONDS)
+
+def invalidate_catalog():
+    plan_catalog.invalidate()
+
 def create_plan(name: str, amount: int, interval: str, currency: str = 'usd') -> dict:
     """Create a new plan in Stripe"""
     try:
@@ -15,6 +73,7 @@ def create_plan(name: str, amount: int, interval: str, currency: str = 'usd') ->
             currency=currency,
             recurring={"interval": interval}
         )
+        plan_catalog.invalidate()
         return {
             "product_id": product.id,
             "price_id": price.id,
@@ -30,18 +89,13 @@ def create_plan(name: str, amount: int, interval: str, currency: str = 'usd') ->
         )
 
 def get_plan(price_id: str) -> Optional[dict]:
-    """Get plan details from Stripe"""
+    """Get plan details, from the catalog for active plans and from Stripe otherwise"""
     try:
-        price = stripe.Price.retrieve(price_id)
-        product = stripe.Product.retrieve(price.product)
-        return {
-            "product_id": product.id,
-            "price_id": price.id,
-            "name": product.name,
-            "amount": price.unit_amount,
-            "currency": price.currency,
-            "interval": price.recurring.interval
-        }
+        plan = plan_catalog.get_all().get(price_id)
+        if plan:
+            return plan
+        price = stripe.Price.retrieve(price_id, expand=["product"])
+        return _plan_from_price(price)
     except stripe.error.StripeError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -51,19 +105,7 @@ def get_plan(price_id: str) -> Optional[dict]:
 def list_plans() -> List[dict]:
     """List all active plans"""
     try:
-        prices = stripe.Price.list(active=True)
-        plans = []
-        for price in prices:
-            product = stripe.Product.retrieve(price.product)
-            plans.append({
-                "product_id": product.id,
-                "price_id": price.id,
-                "name": product.name,
-                "amount": price.unit_amount,
-                "currency": price.currency,
-                "interval": price.recurring.interval
-            })
-        return plans
+        return list(plan_catalog.get_all().values())
     except stripe.error.StripeError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -74,18 +116,11 @@ def update_plan(price_id: str, active: bool = True) -> dict:
     try:
         price = stripe.Price.modify(
             price_id,
-            active=active
+            active=active,
+            expand=["product"]
         )
-        product = stripe.Product.retrieve(price.product)
-        return {
-            "product_id": product.id,
-            "price_id": price.id,
-            "name": product.name,
-            "amount": price.unit_amount,
-            "currency": price.currency,
-            "interval": price.recurring.interval,
-            "active": price.active
-        }
+        plan_catalog.invalidate()
+        return _plan_from_price(price)
     except stripe.error.StripeError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -98,6 +133,7 @@ def delete_plan(price_id: str) -> bool:
             price_id,
             active=False
         )
+        plan_catalog.invalidate()
         return True
     except stripe.error.StripeError as e:
         raise HTTPException(
@@ -1,12 +1,20 @@
 from datetime import datetime
 from typing import Optional
+import time
 from fastapi import HTTPException, status
 import stripe
 from app.core.config import settings
+from app.crud import subscription as subscription_crud
 from app.models.subscription import Subscription
 from sqlalchemy.orm import Session
 from app.models.user import User
+from app.schemas.subscription import SubscriptionRecord
+from app.services import payment as payment_service
+from app.services import plan as plan_service
 from app.services.user import UserService
+from app.utils.logger import setup_logger
+
+logger = setup_logger("subscription_service", "subscription.log")
 
 user_service = UserService()
 
@@ -99,67 +107,77 @@ def _get_or_create_customer(self, db: Session, user_id: int):
 
     return customer
 
-async def get_total_active_subscriptions():
-    try:
-        params = {"limit": 100, "status": "active"}
-        total_subscriptions = 0
-        has_more = True
-        last_subscription = None
-
-        while has_more:
-            if last_subscription:
-                params["starting_after"] = last_subscription
-
-            subscriptions = stripe.Subscription.list(**params)
-            total_subscriptions += len(subscriptions.data)
-
-            has_more = subscriptions.has_more
-            if has_more and subscriptions.data:
-                last_subscription = subscriptions.data[-1].id
-
-        return total_subscriptions
-
-    except stripe.error.StripeError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-
-async def list_active_subscriptions(
-    limit: int = 100,
-    starting_after: str = None,
-    ending_before: str = None
+def list_subscriptions(
+    db: Session,
+    page: int = 1,
+    size: int = 100,
+    customer_id: str = None,
+    subscription_status: str = None,
+    price_id: str = None,
+    created_gte: int = None,
+    created_lte: int = None,
+    cursor: str = None,
+    count: str = "exact"
 ) -> dict:
+    """Filters the local subscriptions table; created_* are unix timestamps, as in the Stripe API."""
     try:
-        params = {
-            "limit": min(limit, 100),
-            "status": "active"
-        }
-
-        if starting_after:
-            params["starting_after"] = starting_after
-        if ending_before:
-            params["ending_before"] = ending_before
-
-        subscriptions = stripe.Subscription.list(**params)
-
-        return {
-            "data": subscriptions.data,
-            "has_more": subscriptions.has_more,
-            "total_count": len(subscriptions.data)
-        }
-
-    except stripe.error.StripeError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
+        result = subscription_crud.get_many(
+            db,
+            page=page,
+            size=size,
+            customer_id=customer_id,
+            status=subscription_status,
+            price_id=price_id,
+            created_gte=_from_unix(created_gte),
+            created_lte=_from_unix(created_lte),
+            cursor=cursor,
+            count=count
         )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    result['items'] = [SubscriptionRecord.model_validate(item) for item in result['items']]
+    return result
+
+def sync_subscription(db: Session, stripe_subscription, commit: bool = True, event_created: int = None) -> Subscription:
+    return subscription_crud.upsert_from_stripe(db, stripe_subscription, commit=commit, event_created=event_created)
+
+def backfill_subscriptions(db: Session, created_gte: int = None, batch_size: int = 100) -> int:
+    """Copies every subscription, whatever its status, from Stripe into the subscriptions table; safe to re-run."""
+    params = {"limit": 100, "status": "all"}
+    if created_gte:
+        params["created"] = {"gte": created_gte}
+
+    # listed objects are at least as new as the moment the listing started
+    listed_at = int(time.time())
+    synced = 0
+    for stripe_subscription in stripe.Subscription.list(**params).auto_paging_iter():
+        sync_subscription(db, stripe_subscription, commit=False, event_created=listed_at)
+        synced += 1
+        if synced % batch_size == 0:
+            db.commit()
+            logger.info(f"Backfilled {synced} subscriptions")
+    db.commit()
+    logger.info(f"Backfilled {synced} subscriptions")
+    return synced
+
+def _from_unix(value: Optional[int]) -> Optional[datetime]:
+    # the subscriptions table stores naive UTC
+    return datetime.utcfromtimestamp(value) if value is not None else None
 
 def handle_webhook_event(db, event):
     try:
+        # keep the local copies current first, so they are stored even if a handler below fails
+        if event.type.startswith('payment_intent.'):
+            payment_service.sync_payment_intent(db, event.data.object, event_created=event.created)
+        elif event.type.startswith('customer.subscription.'):
+            sync_subscription(db, event.data.object, event_created=event.created)
+        elif event.type.startswith(('price.', 'product.')):
+            plan_service.invalidate_catalog()
+
         if event.type == 'customer.subscription.created':
             _handle_subscription_created(db, event.data.object)
-        if event.type == 'customer.subscription.updated':
+        elif event.type == 'customer.subscription.updated':
             _handle_subscription_updated(db, event.data.object)
         elif event.type == 'customer.subscription.deleted':
             _handle_subscription_deleted(event.data.object)
@@ -0,0 +1,149 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud import transcription as transcription_crud
+from app.utils.logger import setup_logger
+
+logger = setup_logger("transcription_cache", "transcription_cache.log")
+
+
+def hash_audio_file(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as audio_file:
+        while chunk := audio_file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DatabaseTranscriptionCache:
+    """Transcriptions stored in the `transcriptions` table, shared by every worker."""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, audio_sha256: str) -> Optional[dict]:
+        db = SessionLocal()
+        try:
+            created_after = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+            transcription = transcription_crud.get_by_hash(db, audio_sha256, created_after=created_after)
+            if not transcription:
+                return None
+            return {"content": transcription.content, "summary": transcription.summary}
+        finally:
+            db.close()
+
+    def set(self, audio_sha256: str, content: str, summary: str):
+        db = SessionLocal()
+        try:
+            transcription_crud.save(db, audio_sha256, content=content, summary=summary)
+        finally:
+            db.close()
+
+    def evict_expired(self) -> int:
+        db = SessionLocal()
+        try:
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+            return transcription_crud.delete_older_than(db, cutoff)
+        finally:
+            db.close()
+
+
+class MemoryTranscriptionCache:
+    """Per-process LRU cache with a TTL, for local development and single-worker deployments."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, audio_sha256: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(audio_sha256)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[audio_sha256]
+                return None
+            self._entries.move_to_end(audio_sha256)
+            return value
+
+    def set(self, audio_sha256: str, content: str, summary: str):
+        with self._lock:
+            self._entries[audio_sha256] = (time.monotonic(), {"content": content, "summary": summary})
+            self._entries.move_to_end(audio_sha256)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def evict_expired(self) -> int:
+        with self._lock:
+            now = time.monotonic()
+            expired = [key for key, (stored_at, _) in self._entries.items() if now - stored_at > self.ttl_seconds]
+            for key in expired:
+                del self._entries[key]
+            return len(expired)
+
+
+class TranscriptionCache:
+    """Content-addressed transcript/summary cache with hit and miss counters."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, audio_sha256: str) -> Optional[dict]:
+        try:
+            value = self.backend.get(audio_sha256)
+        except Exception as e:
+            logger.error(f"Transcription cache lookup failed: {str(e)}")
+            value = None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, audio_sha256: str, content: str, summary: str):
+        try:
+            self.backend.set(audio_sha256, content=content, summary=summary)
+        except Exception as e:
+            logger.error(f"Transcription cache store failed: {str(e)}")
+
+    def evict_expired(self) -> int:
+        try:
+            return self.backend.evict_expired()
+        except Exception as e:
+            logger.error(f"Transcription cache eviction failed: {str(e)}")
+            return 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+def _create_backend():
+    if settings.TRANSCRIPTION_CACHE_BACKEND == "memory":
+        return MemoryTranscriptionCache(
+            ttl_seconds=settings.TRANSCRIPTION_CACHE_TTL_SECONDS,
+            max_entries=settings.TRANSCRIPTION_CACHE_MAX_ENTRIES
+        )
+    return DatabaseTranscriptionCache(ttl_seconds=settings.TRANSCRIPTION_CACHE_TTL_SECONDS)
+
+
+transcription_cache = TranscriptionCache(_create_backend())
@@ -34,15 +34,29 @@
 #         return presigned_url
 
 from app.core.config import settings
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from fastapi.concurrency import run_in_threadpool
 from app.services.aws import get_client
+from app.services.jobs import JobQueue
+from app.utils.logger import setup_logger
+from typing import BinaryIO, Union
+import asyncio
+import threading
 import uuid
 import io
+import os
 
+logger = setup_logger("upload_service", "upload.log")
 s3_client = get_client("s3")
+upload_jobs = JobQueue("uploads", max_workers=1)
 
 class UploadService:
-    def upload_file(self, file: bytes, folder: str, content_type: str = "application/octet-stream", generate_presigned: bool = False):
+    def __init__(self, client=None):
+        self.client = client or s3_client
+
+    def upload_file(self, file: Union[bytes, BinaryIO], folder: str, content_type: str = "application/octet-stream", generate_presigned: bool = False):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         unique_id = str(uuid.uuid4())[:8]
         filename = f"{timestamp}_{unique_id}"
@@ -50,14 +64,19 @@ class UploadService:
         s3_key = f"{folder}/{filename}"
         bucket_name = settings.AWS_BUCKET
 
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=s3_key,
-            Body=io.BytesIO(file),
-            ContentType=content_type
-        )
+        body = io.BytesIO(file) if isinstance(file, bytes) else file
+
+        if self._get_size(body) > settings.S3_MULTIPART_THRESHOLD:
+            self.upload_multipart(body, bucket_name, s3_key, content_type=content_type)
+        else:
+            self.client.put_object(
+                Bucket=bucket_name,
+                Key=s3_key,
+                Body=body,
+                ContentType=content_type
+            )
 
-        presigned_url = s3_client.generate_presigned_url(
+        presigned_url = self.client.generate_presigned_url(
             'get_object',
             Params={
                 'Bucket': bucket_name,
@@ -68,7 +87,97 @@ class UploadService:
 
         return presigned_url
 
-    def upload_audio(self, file: bytes, folder: str = "audio"):
+    def upload_multipart(
+        self,
+        file: BinaryIO,
+        bucket_name: str,
+        s3_key: str,
+        content_type: str = "application/octet-stream",
+        part_size: int = None,
+        concurrency: int = None
+    ):
+        """Upload a file handle as parallel multipart parts, aborting the upload on any failure."""
+        part_size = max(part_size or settings.S3_MULTIPART_PART_SIZE, 5 * 1024 * 1024)  # S3 minimum
+        concurrency = concurrency or settings.S3_MULTIPART_CONCURRENCY
+
+        start = file.tell()
+        size = self._get_size(file)
+        part_count = max(1, (size + part_size - 1) // part_size)
+        read_lock = threading.Lock()
+
+        upload = self.client.create_multipart_upload(
+            Bucket=bucket_name,
+            Key=s3_key,
+            ContentType=content_type
+        )
+        upload_id = upload["UploadId"]
+
+        def upload_part(part_number: int) -> dict:
+            # Each worker reads only its own part, so at most `concurrency` parts are in memory
+            with read_lock:
+                file.seek(start + (part_number - 1) * part_size)
+                data = file.read(part_size)
+            response = self.client.upload_part(
+                Bucket=bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=data
+            )
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(concurrency, part_count)) as executor:
+                parts = list(executor.map(upload_part, range(1, part_count + 1)))
+
+            self.client.complete_multipart_upload(
+                Bucket=bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+        except Exception as e:
+            logger.error(f"Multipart upload of {s3_key} failed, aborting: {str(e)}")
+            self.client.abort_multipart_upload(
+                Bucket=bucket_name,
+                Key=s3_key,
+                UploadId=upload_id
+            )
+            raise
+
+    def abort_stale_multipart_uploads(self, older_than: timedelta = timedelta(days=1)) -> int:
+        """Abort incomplete multipart uploads left behind by crashed workers."""
+        bucket_name = settings.AWS_BUCKET
+        cutoff = datetime.now(timezone.utc) - older_than
+        aborted = 0
+
+        paginator = self.client.get_paginator("list_multipart_uploads")
+        for page in paginator.paginate(Bucket=bucket_name):
+            for upload in page.get("Uploads", []):
+                if upload["Initiated"] < cutoff:
+                    try:
+                        self.client.abort_multipart_upload(
+                            Bucket=bucket_name,
+                            Key=upload["Key"],
+                            UploadId=upload["UploadId"]
+                        )
+                    except ClientError as e:
+                        # another worker's sweep got to it first
+                        if e.response.get("Error", {}).get("Code") != "NoSuchUpload":
+                            raise
+                        continue
+                    aborted += 1
+
+        return aborted
+
+    def _get_size(self, file: BinaryIO) -> int:
+        position = file.tell()
+        file.seek(0, os.SEEK_END)
+        size = file.tell() - position
+        file.seek(position)
+        return size
+
+    def upload_audio(self, file: Union[bytes, BinaryIO], folder: str = "audio"):
         return self.upload_file(file, folder, content_type="audio/mpeg")
 
     def upload_profile_picture(self, file: bytes):
@@ -86,4 +195,17 @@ class UploadService:
         elif file_bytes.startswith(b'RIFF') and file_bytes[8:12] == b'WEBP':
             return "image/webp"
 
-        return None
\ No newline at end of file
+        return None
+
+
+async def abort_stale_uploads_periodically(interval_seconds: int = settings.S3_MULTIPART_CLEANUP_INTERVAL_SECONDS):
+    """Sweeps the bucket for multipart uploads that were never completed or aborted, so their parts stop being billed."""
+    older_than = timedelta(seconds=settings.S3_MULTIPART_STALE_AFTER_SECONDS)
+    while True:
+        try:
+            aborted = await run_in_threadpool(UploadService().abort_stale_multipart_uploads, older_than)
+            if aborted:
+                logger.info(f"Aborted {aborted} stale multipart uploads")
+        except Exception as e:
+            logger.error(f"Stale multipart upload cleanup failed: {str(e)}")
+        await asyncio.sleep(interval_seconds)
@@ -2,10 +2,11 @@ from typing import Dict, List, Optional
 from fastapi import HTTPException, status
 from requests import Session
 from app.crud.user import user as user_crud
-from app.core.security import pwd_context
+from app.core.security import password_hasher
 from app.schemas.auth import UserCreate
 from .oauth import OAuthService
 from app.services.email import EmailService
+from app.services.user_cache import user_cache
 import secrets
 import string
 
@@ -20,6 +21,16 @@ class UserService:
             )
         return user_crud.create(db, obj_in=user_data)
 
+    async def create_user_async(self, db, user_data):
+        """create_user for async routes; the password is hashed off the event loop."""
+        if user_crud.get_by_email(db, email=user_data.email):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
+        hashed_password = await password_hasher.hash(user_data.password)
+        return user_crud.create(db, obj_in=user_data, hashed_password=hashed_password)
+
     async def get_or_create_google_user(self, db, token):
         user_data = await oauth_service.verify_google_token(token)
         if not user_data:
@@ -37,10 +48,12 @@ class UserService:
                 db,
                 obj_in=UserCreate(
                     email=user_data["email"],
-                    full_name=user_data["name"],
+                    # the name claim is only present with the profile scope
+                    full_name=user_data.get("name") or user_data["email"].split("@")[0],
                     auth_provider="google",
                     password=password
-                )
+                ),
+                hashed_password=await password_hasher.hash(password)
             )
 
             self.update_user(db, user, user_data={
@@ -61,7 +74,13 @@ class UserService:
         return user
 
     def update_user(self, db, user, user_data):
-        return user_crud.update(db, db_obj=user, obj_in=user_data)
+        user_cache.invalidate(user.email)
+        user = user_crud.update(db, db_obj=user, obj_in=user_data)
+        user_cache.invalidate(user.email)
+        return user
+
+    def revoke_tokens(self, db, user):
+        return self.update_user(db, user, {"token_version": (user.token_version or 0) + 1})
 
     def user_with_email_exists(self, db, email):
         user = user_crud.get_by_email(db, email=email)
@@ -94,8 +113,10 @@ class UserService:
             )
         return user
 
-    def change_password(self, db, user, old_password, new_password):
-        if not user_crud.authenticate(db, email=user.email, password=old_password):
+    async def change_password(self, db, user, old_password, new_password):
+        # the current user may come from the cache, which holds no password hash
+        db.refresh(user, ["hashed_password"])
+        if not await password_hasher.verify(old_password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Incorrect password"
@@ -104,8 +125,9 @@ class UserService:
         self.update_user(
             db,
             user,
-            {"hashed_password": pwd_context.hash(new_password)}
+            {"hashed_password": await password_hasher.hash(new_password)}
         )
+        self.revoke_tokens(db, user)
 
     def get_users(self, db: Session, *, page: int = 1, size: int = 100):
         return user_crud.get_users(db, page=page, size=size)
@@ -123,6 +145,7 @@ class UserService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
+        user_cache.invalidate(user.email)
         return user
 
 
@@ -131,18 +154,25 @@ class UserService:
         db: Session,
         page: int = 1,
         size: int = 100,
-        filters: Optional[Dict] = None
+        filters: Optional[Dict] = None,
+        cursor: Optional[str] = None,
+        count: str = "exact"
     ):
         if filters is None:
             filters = {}
 
-        search = filters.get("name")
+        search = filters.get("email")
         user_id = filters.get("user_id")
 
-        return user_crud.get_many(
-            db=db,
-            page=page,
-            size=size,
-            search=search,
-            user_id=user_id
-        )
+        try:
+            return user_crud.get_many(
+                db=db,
+                page=page,
+                size=size,
+                search=search,
+                user_id=user_id,
+                cursor=cursor,
+                count=count
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
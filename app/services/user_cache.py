@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.core.config import settings
+from app.models.user import User
+from app.utils.logger import setup_logger
+
+logger = setup_logger("user_cache", "user_cache.log")
+
+# never leave the database; the backend may be shared (e.g. Redis)
+SECRET_COLUMNS = frozenset({
+    "hashed_password",
+    "reset_code",
+    "reset_code_expires_at",
+    "verification_code",
+    "verification_code_expires_at",
+})
+
+
+class MemoryUserCache:
+    """Per-process LRU cache with a TTL.
+
+    Any object with the same get/set/delete methods can be used instead,
+    e.g. a Redis-backed one so several workers share entries and invalidations.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, email: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[email]
+                return None
+            self._entries.move_to_end(email)
+            return value
+
+    def set(self, email: str, value: dict):
+        with self._lock:
+            self._entries[email] = (time.monotonic(), value)
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, email: str):
+        with self._lock:
+            self._entries.pop(email, None)
+
+
+class NullUserCache:
+    """Disables caching; every lookup goes to the database."""
+
+    def get(self, email: str) -> Optional[dict]:
+        return None
+
+    def set(self, email: str, value: dict):
+        pass
+
+    def delete(self, email: str):
+        pass
+
+
+class UserCache:
+    """Cache of authenticated users keyed by email, with hit and miss counters.
+
+    Entries are plain column snapshots rather than ORM instances, so each
+    request gets its own User attached to its own session. Secret columns are
+    left out of the snapshot; on a cached User they are loaded from the row
+    when first read.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, email: str) -> Optional[User]:
+        try:
+            value = self.backend.get(email)
+        except Exception as e:
+            logger.error(f"User cache lookup failed: {str(e)}")
+            value = None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if value is None:
+            return None
+        user = User(**value)
+        make_transient_to_detached(user)
+        db.add(user)
+        return user
+
+    def get_token_version(self, email: str) -> Optional[int]:
+        try:
+            value = self.backend.get(email)
+        except Exception as e:
+            logger.error(f"User cache lookup failed: {str(e)}")
+            value = None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value["token_version"] if value else None
+
+    def set(self, user: User):
+        try:
+            value = {
+                attr.key: getattr(user, attr.key)
+                for attr in inspect(User).column_attrs
+                if attr.key not in SECRET_COLUMNS
+            }
+            self.backend.set(user.email, value)
+        except Exception as e:
+            logger.error(f"User cache store failed: {str(e)}")
+
+    def invalidate(self, email: Optional[str]):
+        if not email:
+            return
+        try:
+            self.backend.delete(email)
+        except Exception as e:
+            logger.error(f"User cache invalidation failed: {str(e)}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+def _create_backend():
+    if settings.USER_CACHE_BACKEND == "none":
+        return NullUserCache()
+    return MemoryUserCache(
+        ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+        max_entries=settings.USER_CACHE_MAX_ENTRIES
+    )
+
+
+user_cache = UserCache(_create_backend())
@@ -1,45 +1,76 @@
-
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
+from jose import JWTError
 from sqlalchemy.orm import Session
-from app.core.config import settings
 from app.core.database import get_db
+from app.core.security import decode_access_token
 from app.crud.user import user as user_crud
 from app.crud import folder as folder_crud
 from app.crud import note as note_crud
 from app.models.user import User
+from app.schemas.auth import TokenClaims
+from app.services.user_cache import user_cache
 
 http_bearer = HTTPBearer()
 
-async def get_current_user(
-    db: Session = Depends(get_db),
-    credentials: HTTPAuthorizationCredentials = Depends(http_bearer)
-) -> User:
+def decode_token_claims(token: str) -> TokenClaims:
     try:
-        token = credentials.credentials
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=["HS256"]
+        payload = decode_access_token(token)
+        return TokenClaims(
+            id=payload["uid"],
+            email=payload["sub"],
+            role=payload.get("role"),
+            ver=payload["ver"]
         )
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-    except JWTError:
+    except (JWTError, KeyError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid token")
 
+def _load_user(db: Session, email: str) -> User:
     user = user_crud.get_by_email(db, email=email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    user_cache.set(user)
     return user
 
+def _ensure_not_revoked(claims: TokenClaims, token_version: int):
+    if claims.ver != token_version:
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+
+def get_claims_from_token(db: Session, token: str) -> TokenClaims:
+    """Authorizes from the token alone; only the token version is checked, from cache when possible."""
+    claims = decode_token_claims(token)
+    token_version = user_cache.get_token_version(claims.email)
+    if token_version is None:
+        token_version = _load_user(db, claims.email).token_version
+    _ensure_not_revoked(claims, token_version)
+    return claims
+
+def get_user_from_token(db: Session, token: str) -> User:
+    claims = decode_token_claims(token)
+    user = user_cache.get(db, claims.email) or _load_user(db, claims.email)
+    _ensure_not_revoked(claims, user.token_version)
+    return user
+
+async def get_current_claims(
+    db: Session = Depends(get_db),
+    credentials: HTTPAuthorizationCredentials = Depends(http_bearer)
+) -> TokenClaims:
+    return get_claims_from_token(db, credentials.credentials)
+
+async def get_current_user(
+    db: Session = Depends(get_db),
+    credentials: HTTPAuthorizationCredentials = Depends(http_bearer)
+) -> User:
+    return get_user_from_token(db, credentials.credentials)
+
 
 def is_folder_owner(
     folder_id: int,
-    current_user: dict = Depends(get_current_user),
+    claims: TokenClaims = Depends(get_current_claims),
     db: Session = Depends(get_db)
 ):
-    folder = folder_crud.get_folder(db, folder_id=folder_id)
-    if not folder or folder.user_id != current_user.id:
+    folder = folder_crud.get_user_folder(db, folder_id=folder_id, user_id=claims.id)
+    if not folder:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access this folder"
@@ -48,24 +79,21 @@ def is_folder_owner(
 
 def is_note_owner(
     note_id: int,
-    current_user: dict = Depends(get_current_user),
+    claims: TokenClaims = Depends(get_current_claims),
     db: Session = Depends(get_db)
 ):
-    note = note_crud.get_note(db, note_id=note_id)
-    if not note or note.user_id != current_user.id:
+    note = note_crud.get_user_note(db, note_id=note_id, user_id=claims.id)
+    if not note:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access this Note"
         )
     return note
 
-def is_admin(
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    if not current_user.role == "admin":
+def is_admin(claims: TokenClaims = Depends(get_current_claims)):
+    if not claims.role == "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
         )
-    return current_user
+    return claims
@@ -10,8 +10,17 @@ from app.endpoints.admin import misc as admin_misc
 from app.endpoints.admin import plan as admin_plan
 from app.endpoints.admin import payment as admin_payment
 from app.endpoints.admin import subscription as admin_subscription
+from app.endpoints.admin import email as admin_email
+from fastapi.concurrency import run_in_threadpool
 from fastapi.exceptions import RequestValidationError
 from app.middleware.exceptions import global_exception_handler
+from app.services import email_broadcast as broadcast_service
+from app.services import metrics as metrics_service
+from app.services.email import email_templates
+from app.services.email_outbox import email_jobs, email_outbox
+from app.services import note as note_service
+from app.services import upload as upload_service
+from app.services.transcription_cache import transcription_cache
 
 
 app = FastAPI(
@@ -32,6 +41,25 @@ app.add_middleware(
 app.add_exception_handler(Exception, global_exception_handler)
 app.add_exception_handler(RequestValidationError, global_exception_handler)
 
+@app.on_event("startup")
+async def start_note_workers():
+    await run_in_threadpool(transcription_cache.evict_expired)
+    await run_in_threadpool(email_templates.precompile)
+    note_service.recover_pending_notes()
+    metrics_service.metrics_jobs.submit(metrics_service.reconcile_periodically)
+    email_jobs.submit(email_outbox.run)
+    broadcast_service.broadcast_jobs.submit(broadcast_service.watch_broadcasts)
+    upload_service.upload_jobs.submit(upload_service.abort_stale_uploads_periodically)
+
+@app.on_event("shutdown")
+async def stop_note_workers():
+    await note_service.note_jobs.shutdown(wait=False)
+    await metrics_service.metrics_jobs.shutdown(wait=False)
+    await email_jobs.shutdown(wait=False)
+    await broadcast_service.broadcast_jobs.shutdown(wait=False)
+    await upload_service.upload_jobs.shutdown(wait=False)
+    await email_outbox.close()
+
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(account.router, prefix="/account", tags=["account"])
@@ -48,6 +76,7 @@ app.include_router(admin_misc.router, prefix="/admin/misc", tags=["admin.misc"])
 app.include_router(admin_plan.router, prefix="/admin/plans", tags=["admin.plan"])
 app.include_router(admin_payment.router, prefix="/admin/payments", tags=["admin.payment"])
 app.include_router(admin_subscription.router, prefix="/admin/subscriptions", tags=["admin.subscription"])
+app.include_router(admin_email.router, prefix="/admin/broadcasts", tags=["admin.broadcasts"])
 
 # Increase maximum upload size to 10 MB
 app.max_request_size = 10 * 1024 * 1024
@@ -13,6 +13,10 @@ from app.models.user import User
 from app.models.folder import Folder
 from app.models.note import Note
 from app.models.subscription import Subscription
+from app.models.transcription import Transcription
+from app.models.metric import Metric, StripeEvent
+from app.models.payment import Payment
+from app.models.email import EmailBroadcast, OutboundEmail
 
 # Alembic Config object, which provides access to the .ini file values
 config = context.config
@@ -0,0 +1,26 @@
+"""add token version to users
+
+Revision ID: 5d3a8f2c61e7
+Revises: e41c07a9d2b5
+Create Date: 2025-02-19 09:41:57.120384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d3a8f2c61e7'
+down_revision: Union[str, None] = 'e41c07a9d2b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,77 @@
+"""add local payments and subscription details
+
+Revision ID: 6b8d2f4a9c13
+Revises: 3e7c9b1d5f48
+Create Date: 2025-02-27 10:12:44.918305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b8d2f4a9c13'
+down_revision: Union[str, None] = '3e7c9b1d5f48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('payments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('stripe_payment_intent_id', sa.String(), nullable=False),
+    sa.Column('stripe_customer_id', sa.String(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('amount', sa.BigInteger(), nullable=False),
+    sa.Column('amount_received', sa.BigInteger(), nullable=True),
+    sa.Column('currency', sa.String(length=3), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('receipt_email', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('synced_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_payments_id'), 'payments', ['id'], unique=False)
+    op.create_index(op.f('ix_payments_stripe_payment_intent_id'), 'payments', ['stripe_payment_intent_id'], unique=True)
+    op.create_index(op.f('ix_payments_user_id'), 'payments', ['user_id'], unique=False)
+    op.create_index(op.f('ix_payments_amount'), 'payments', ['amount'], unique=False)
+    op.create_index('ix_payments_created_at_id', 'payments', ['created_at', 'id'], unique=False)
+    op.create_index('ix_payments_status_created_at', 'payments', ['status', 'created_at'], unique=False)
+    op.create_index('ix_payments_customer_created_at', 'payments', ['stripe_customer_id', 'created_at'], unique=False)
+
+    op.add_column('subscriptions', sa.Column('price_id', sa.String(), nullable=True))
+    op.add_column('subscriptions', sa.Column('amount', sa.Integer(), nullable=True))
+    op.add_column('subscriptions', sa.Column('currency', sa.String(length=3), nullable=True))
+    op.add_column('subscriptions', sa.Column('interval', sa.String(), nullable=True))
+    op.add_column('subscriptions', sa.Column('cancel_at_period_end', sa.Boolean(), nullable=True))
+    op.add_column('subscriptions', sa.Column('canceled_at', sa.DateTime(), nullable=True))
+    op.add_column('subscriptions', sa.Column('ended_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_subscriptions_created_at_id', 'subscriptions', ['created_at', 'id'], unique=False)
+    op.create_index('ix_subscriptions_status_created_at', 'subscriptions', ['status', 'created_at'], unique=False)
+    op.create_index('ix_subscriptions_customer_created_at', 'subscriptions', ['stripe_customer_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_subscriptions_customer_created_at', table_name='subscriptions')
+    op.drop_index('ix_subscriptions_status_created_at', table_name='subscriptions')
+    op.drop_index('ix_subscriptions_created_at_id', table_name='subscriptions')
+    op.drop_column('subscriptions', 'ended_at')
+    op.drop_column('subscriptions', 'canceled_at')
+    op.drop_column('subscriptions', 'cancel_at_period_end')
+    op.drop_column('subscriptions', 'interval')
+    op.drop_column('subscriptions', 'currency')
+    op.drop_column('subscriptions', 'amount')
+    op.drop_column('subscriptions', 'price_id')
+
+    op.drop_index('ix_payments_customer_created_at', table_name='payments')
+    op.drop_index('ix_payments_status_created_at', table_name='payments')
+    op.drop_index('ix_payments_created_at_id', table_name='payments')
+    op.drop_index(op.f('ix_payments_amount'), table_name='payments')
+    op.drop_index(op.f('ix_payments_user_id'), table_name='payments')
+    op.drop_index(op.f('ix_payments_stripe_payment_intent_id'), table_name='payments')
+    op.drop_index(op.f('ix_payments_id'), table_name='payments')
+    op.drop_table('payments')
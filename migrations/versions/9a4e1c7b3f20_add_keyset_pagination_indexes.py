@@ -0,0 +1,34 @@
+"""add keyset pagination indexes
+
+Revision ID: 9a4e1c7b3f20
+Revises: 5d3a8f2c61e7
+Create Date: 2025-02-20 11:18:45.662903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4e1c7b3f20'
+down_revision: Union[str, None] = '5d3a8f2c61e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_notes_created_at_id', 'notes', ['created_at', 'id'], unique=False)
+    op.create_index('ix_notes_user_id_created_at_id', 'notes', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_notes_folder_id_created_at_id', 'notes', ['folder_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_folders_created_at_id', 'folders', ['created_at', 'id'], unique=False)
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_created_at_id', table_name='users')
+    op.drop_index('ix_folders_created_at_id', table_name='folders')
+    op.drop_index('ix_notes_folder_id_created_at_id', table_name='notes')
+    op.drop_index('ix_notes_user_id_created_at_id', table_name='notes')
+    op.drop_index('ix_notes_created_at_id', table_name='notes')
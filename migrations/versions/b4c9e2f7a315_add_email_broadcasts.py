@@ -0,0 +1,49 @@
+"""add email broadcasts
+
+Revision ID: b4c9e2f7a315
+Revises: 8f1e5a3c7d20
+Create Date: 2025-03-03 14:05:51.772930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4c9e2f7a315'
+down_revision: Union[str, None] = '8f1e5a3c7d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('email_broadcasts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('subject', sa.String(), nullable=False),
+    sa.Column('template_name', sa.String(), nullable=False),
+    sa.Column('template_context', sa.JSON(), nullable=False),
+    sa.Column('verified_only', sa.Boolean(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('total_recipients', sa.Integer(), nullable=True),
+    sa.Column('sent_count', sa.Integer(), nullable=False),
+    sa.Column('batches_sent', sa.Integer(), nullable=False),
+    sa.Column('last_user_id', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_email_broadcasts_id'), 'email_broadcasts', ['id'], unique=False)
+    op.create_index(op.f('ix_email_broadcasts_status'), 'email_broadcasts', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_email_broadcasts_status'), table_name='email_broadcasts')
+    op.drop_index(op.f('ix_email_broadcasts_id'), table_name='email_broadcasts')
+    op.drop_table('email_broadcasts')
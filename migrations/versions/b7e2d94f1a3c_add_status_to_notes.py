@@ -0,0 +1,30 @@
+"""add status to notes
+
+Revision ID: b7e2d94f1a3c
+Revises: 882c36ea22b4
+Create Date: 2025-02-14 10:22:31.408215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d94f1a3c'
+down_revision: Union[str, None] = '882c36ea22b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('notes', sa.Column('status', sa.String(), server_default='done', nullable=False))
+    op.add_column('notes', sa.Column('error', sa.Text(), nullable=True))
+    op.create_index(op.f('ix_notes_status'), 'notes', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_notes_status'), table_name='notes')
+    op.drop_column('notes', 'error')
+    op.drop_column('notes', 'status')
@@ -0,0 +1,28 @@
+"""add event_created to payments and subscriptions
+
+Revision ID: d5e8a2c4f917
+Revises: b4c9e2f7a315
+Create Date: 2025-03-05 11:22:37.504116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e8a2c4f917'
+down_revision: Union[str, None] = 'b4c9e2f7a315'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('payments', sa.Column('event_created', sa.BigInteger(), nullable=True))
+    op.add_column('subscriptions', sa.Column('event_created', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('subscriptions', 'event_created')
+    op.drop_column('payments', 'event_created')
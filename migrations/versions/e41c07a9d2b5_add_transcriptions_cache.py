@@ -0,0 +1,37 @@
+"""add transcriptions cache
+
+Revision ID: e41c07a9d2b5
+Revises: b7e2d94f1a3c
+Create Date: 2025-02-17 15:03:12.774519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41c07a9d2b5'
+down_revision: Union[str, None] = 'b7e2d94f1a3c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('transcriptions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('audio_sha256', sa.String(length=64), nullable=False),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('summary', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_transcriptions_audio_sha256'), 'transcriptions', ['audio_sha256'], unique=True)
+    op.create_index(op.f('ix_transcriptions_id'), 'transcriptions', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_transcriptions_id'), table_name='transcriptions')
+    op.drop_index(op.f('ix_transcriptions_audio_sha256'), table_name='transcriptions')
+    op.drop_table('transcriptions')
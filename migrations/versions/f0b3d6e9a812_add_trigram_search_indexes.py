@@ -0,0 +1,33 @@
+"""add trigram search indexes
+
+Revision ID: f0b3d6e9a812
+Revises: c2f85e0d4a91
+Create Date: 2025-02-24 10:52:03.907145
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f0b3d6e9a812'
+down_revision: Union[str, None] = 'c2f85e0d4a91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_users_email_trgm', 'users', ['email'], unique=False, postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'})
+    op.create_index('ix_users_full_name_trgm', 'users', ['full_name'], unique=False, postgresql_using='gin', postgresql_ops={'full_name': 'gin_trgm_ops'})
+    op.create_index('ix_folders_name_trgm', 'folders', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_notes_title_trgm', 'notes', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notes_title_trgm', table_name='notes', postgresql_using='gin')
+    op.drop_index('ix_folders_name_trgm', table_name='folders', postgresql_using='gin')
+    op.drop_index('ix_users_full_name_trgm', table_name='users', postgresql_using='gin')
+    op.drop_index('ix_users_email_trgm', table_name='users', postgresql_using='gin')
@@ -0,0 +1,36 @@
+"""Copy payments and subscriptions from Stripe into the local tables.
+
+Run once after deploying the payments table, and again whenever webhooks may
+have been missed; rows are upserted by their Stripe id, so re-runs are safe.
+
+    python scripts/backfill_stripe.py
+    python scripts/backfill_stripe.py --only payments --since 1735689600
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.services import payment as payment_service  # noqa: E402
+from app.services import subscription as subscription_service  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", choices=["payments", "subscriptions"])
+    parser.add_argument("--since", type=int, help="only objects created at or after this unix timestamp")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        if args.only in (None, "payments"):
+            synced = payment_service.backfill_payments(db, created_gte=args.since)
+            print(f"Payments synced: {synced:,}")
+        if args.only in (None, "subscriptions"):
+            synced = subscription_service.backfill_subscriptions(db, created_gte=args.since)
+            print(f"Subscriptions synced: {synced:,}")
+
+
+if __name__ == "__main__":
+    main()
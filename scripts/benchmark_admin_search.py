@@ -0,0 +1,183 @@
+"""Benchmark the admin substring search with and without pg_trgm indexes.
+
+Builds throwaway copies of the searched columns in a separate schema, fills
+them with generated rows (1M by default), and times the queries the admin
+listings issue (one page ordered by created_at, id plus the exact count)
+before and after adding the trigram GIN indexes.
+
+    python scripts/benchmark_admin_search.py --rows 1000000
+
+Nothing outside the benchmark schema is touched; it is dropped at the end
+unless --keep is given.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import column, create_engine, func, or_, select, table, text  # noqa: E402
+from app.crud.base import LIKE_ESCAPE, search_pattern  # noqa: E402
+
+SCHEMA = "search_benchmark"
+
+WORDS = (
+    "weekly", "standup", "patient", "review", "budget", "planning", "lecture",
+    "interview", "design", "followup", "retro", "kickoff", "sprint", "client",
+    "therapy", "session", "roadmap", "onboarding", "finance", "research"
+)
+
+TABLES = {
+    "users": "email text, full_name text",
+    "folders": "name text",
+    "notes": "title text",
+}
+
+INDEXES = {
+    "users": ["email", "full_name"],
+    "folders": ["name"],
+    "notes": ["title"],
+}
+
+# (table, column(s) searched, term); a common term, a rare one and a two-letter
+# term, which has no trigrams and stays a sequential scan
+CASES = [
+    ("users", ["email", "full_name"], "example"),
+    ("users", ["email", "full_name"], "user4242"),
+    ("users", ["email", "full_name"], "ma"),
+    ("folders", ["name"], "planning"),
+    ("folders", ["name"], "9f3a"),
+    ("notes", ["title"], "standup"),
+    ("notes", ["title"], "b7e2d"),
+]
+
+
+def random_words(count: int) -> str:
+    words = ", ".join(f"'{word}'" for word in WORDS)
+    picks = [f"(ARRAY[{words}])[1 + floor(random() * {len(WORDS)})::int]" for _ in range(count)]
+    return " || ' ' || ".join(picks)
+
+
+def seed(conn, rows: int):
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    for table, columns in TABLES.items():
+        conn.execute(text(
+            f"CREATE TABLE {SCHEMA}.{table} (id serial PRIMARY KEY, {columns}, created_at timestamptz NOT NULL)"
+        ))
+        conn.execute(text(f"CREATE INDEX ON {SCHEMA}.{table} (created_at, id)"))
+
+    created_at = "now() - (random() * interval '730 days')"
+    conn.execute(text(
+        f"INSERT INTO {SCHEMA}.users (email, full_name, created_at) "
+        f"SELECT 'user' || i || '.' || substr(md5(i::text), 1, 6) || '@' || "
+        f"(ARRAY['example.com', 'mail.com', 'clinic.org', 'school.edu'])[1 + i % 4], "
+        f"initcap({random_words(2)}), {created_at} "
+        f"FROM generate_series(1, :rows) AS i"
+    ), {"rows": rows})
+    conn.execute(text(
+        f"INSERT INTO {SCHEMA}.folders (name, created_at) "
+        f"SELECT initcap({random_words(1)}) || ' ' || substr(md5(i::text), 1, 4), {created_at} "
+        f"FROM generate_series(1, :rows) AS i"
+    ), {"rows": rows})
+    conn.execute(text(
+        f"INSERT INTO {SCHEMA}.notes (title, created_at) "
+        f"SELECT initcap({random_words(3)}) || ' ' || substr(md5(i::text), 1, 8), {created_at} "
+        f"FROM generate_series(1, :rows) AS i"
+    ), {"rows": rows})
+    for table in TABLES:
+        conn.execute(text(f"ANALYZE {SCHEMA}.{table}"))
+
+
+def add_trigram_indexes(conn):
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    for table, columns in INDEXES.items():
+        for column in columns:
+            conn.execute(text(f"CREATE INDEX ON {SCHEMA}.{table} USING gin ({column} gin_trgm_ops)"))
+        conn.execute(text(f"ANALYZE {SCHEMA}.{table}"))
+
+
+def time_case(conn, table_name, columns, term, repeats):
+    searched = table(table_name, column("id"), column("created_at"), *map(column, columns), schema=SCHEMA)
+    # the same filter the admin listings build
+    pattern = search_pattern(term)
+    condition = or_(*(searched.c[name].ilike(pattern, escape=LIKE_ESCAPE) for name in columns))
+    page_query = (
+        select(searched.c.id)
+        .where(condition)
+        .order_by(searched.c.created_at.desc(), searched.c.id.desc())
+        .limit(100)
+    )
+    count_query = select(func.count()).select_from(searched).where(condition)
+
+    page_times, count_times = [], []
+    matches = 0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        conn.execute(page_query).fetchall()
+        page_times.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        matches = conn.execute(count_query).scalar()
+        count_times.append((time.perf_counter() - started) * 1000)
+
+    return statistics.median(page_times), statistics.median(count_times), matches
+
+
+def run_cases(conn, repeats):
+    return {
+        (table, term): time_case(conn, table, columns, term, repeats)
+        for table, columns, term in CASES
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.environ.get("BENCHMARK_DATABASE_URL"))
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark schema afterwards")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if not database_url:
+        from app.core.config import settings
+        database_url = settings.DATABASE_URL
+
+    engine = create_engine(database_url)
+    try:
+        with engine.begin() as conn:
+            print(f"Seeding {args.rows:,} rows per table into schema {SCHEMA}...")
+            seed(conn, args.rows)
+
+        with engine.connect() as conn:
+            before = run_cases(conn, args.repeats)
+
+        with engine.begin() as conn:
+            print("Creating pg_trgm GIN indexes...")
+            add_trigram_indexes(conn)
+
+        with engine.connect() as conn:
+            after = run_cases(conn, args.repeats)
+
+        print()
+        print(f"{'table':<8} {'term':<10} {'matches':>9} {'page ms':>17} {'count ms':>19}")
+        for table, _, term in CASES:
+            page_before, count_before, matches = before[(table, term)]
+            page_after, count_after, _ = after[(table, term)]
+            print(
+                f"{table:<8} {term:<10} {matches:>9,} "
+                f"{page_before:>7.1f} -> {page_after:>6.1f} "
+                f"{count_before:>8.1f} -> {count_after:>7.1f}"
+            )
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
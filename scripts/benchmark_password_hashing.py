@@ -0,0 +1,83 @@
+"""Benchmark logins per second for one worker process, with bcrypt on and off the event loop.
+
+Simulates a burst of concurrent email logins: each one verifies a password
+against a bcrypt hash, either inline on the event loop (the old behaviour)
+or through app.core.security.PasswordHasher. Alongside throughput it
+reports the worst event loop stall, which is what every other request on
+the worker sees during the burst.
+
+    python scripts/benchmark_password_hashing.py --rounds 12 --logins 200 --workers 4
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from passlib.context import CryptContext  # noqa: E402
+
+
+async def measure(login, logins: int, concurrency: int):
+    """Runs `logins` calls of login() with bounded concurrency; returns (logins/s, max loop lag ms)."""
+    max_lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal max_lag
+        interval = 0.005
+        while not done:
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            max_lag = max(max_lag, time.perf_counter() - started - interval)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            assert await login()
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.02)
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    done = True
+    await ticker_task
+    return logins / elapsed, max_lag * 1000
+
+
+async def run(args):
+    from app.core.security import PasswordHasher
+
+    context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=args.rounds)
+    hashed = context.hash("correct horse battery staple")
+
+    async def inline_login():
+        return context.verify("correct horse battery staple", hashed)
+
+    hasher = PasswordHasher(context, workers=args.workers, max_pending=args.logins)
+
+    async def pooled_login():
+        return await hasher.verify("correct horse battery staple", hashed)
+
+    print(f"bcrypt rounds={args.rounds}, {args.logins} logins, {args.concurrency} concurrent, "
+          f"{args.workers} hash workers, {os.cpu_count()} CPUs")
+    print(f"{'mode':<22} {'logins/s':>10} {'max loop stall ms':>19}")
+    for name, login in (("on the event loop", inline_login), ("password_hasher pool", pooled_login)):
+        rate, lag = await measure(login, args.logins, args.concurrency)
+        print(f"{name:<22} {rate:>10.1f} {lag:>19.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
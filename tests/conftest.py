@@ -0,0 +1,112 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings are required at import time; none of these reach a real service
+for name, value in {
+    "SECRET_KEY": "test-secret",
+    "OPENAI_API_KEY": "test",
+    "STRIPE_SECRET_KEY": "sk_test",
+    "STRIPE_WEBHOOK_SECRET": "whsec_test",
+    "SENDGRID_API_KEY": "test",
+    "DATABASE_HOST": "localhost",
+    "DATABASE_PORT": "5432",
+    "DATABASE_USER": "test",
+    "DATABASE_PASSWORD": "test",
+    "DATABASE_NAME": "test",
+    "SMTP_SERVER": "localhost",
+    "SMTP_PORT": "25",
+    "SMTP_USERNAME": "test",
+    "SMTP_PASSWORD": "test",
+    "EMAILS_FROM_EMAIL": "noreply@example.com",
+    "EMAILS_FROM_NAME": "Test",
+    "EMAIL_TRANSPORT": "fake",
+    "CLOUDINARY_CLOUD_NAME": "test",
+    "CLOUDINARY_API_KEY": "test",
+    "CLOUDINARY_API_SECRET": "test",
+    "AWS_KEY": "testing",
+    "AWS_SECRET": "testing",
+    "AWS_REGION": "us-east-1",
+    "AWS_BUCKET": "test-bucket",
+}.items():
+    os.environ.setdefault(name, value)
+
+import pytest  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.dialects.postgresql import TSVECTOR  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlalchemy.schema import CreateColumn  # noqa: E402
+
+
+# The models are written for PostgreSQL; on SQLite the generated tsvector
+# column becomes plain text so the tables can still be created.
+@compiles(TSVECTOR, "sqlite")
+def _tsvector_on_sqlite(type_, compiler, **kw):
+    return "TEXT"
+
+@compiles(CreateColumn, "sqlite")
+def _computed_column_on_sqlite(element, compiler, **kw):
+    if element.element.name == "search_vector":
+        return "search_vector TEXT"
+    return compiler.visit_create_column(element, **kw)
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    """An in-memory SQLite database with every table, shared by all sessions of one test."""
+    from app.core import database
+    import app.models.email  # noqa: F401
+    import app.models.folder  # noqa: F401
+    import app.models.metric  # noqa: F401
+    import app.models.note  # noqa: F401
+    import app.models.payment  # noqa: F401
+    import app.models.subscription  # noqa: F401
+    import app.models.transcription  # noqa: F401
+    import app.models.user  # noqa: F401
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    database.Base.metadata.create_all(engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+class PostgresPlanner:
+    """Wraps a SQLite session so count_rows takes its PostgreSQL EXPLAIN path.
+
+    EXPLAIN statements are compiled for psycopg2 and recorded, then answered
+    with a canned plan; everything else runs on SQLite.
+    """
+
+    def __init__(self, db, plan_rows=42):
+        self.db = db
+        self.plan_rows = plan_rows
+        self.explained = []
+        self.query = db.query
+
+    def get_bind(self):
+        return type("Bind", (), {"dialect": postgresql.psycopg2.dialect()})()
+
+    def execute(self, statement, *args, **kwargs):
+        compiled = statement.compile(dialect=postgresql.psycopg2.dialect())
+        # raises "A value is required for bind parameter" like execution would
+        params = compiled.construct_params()
+        # psycopg2 interpolates pyformat placeholders; this fails on any unescaped %
+        self.explained.append(compiled.string % {name: repr(value) for name, value in params.items()})
+        return type("Result", (), {"scalar": lambda _: [{"Plan": {"Plan Rows": self.plan_rows}}]})()
+
+
+@pytest.fixture
+def planner(db):
+    return PostgresPlanner(db)
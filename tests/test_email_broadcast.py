@@ -0,0 +1,100 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.crud import email as email_crud
+from app.models.email import BROADCAST_STATUS_COMPLETED, BROADCAST_STATUS_FAILED
+from app.models.user import User
+from app.schemas.email import BroadcastCreate
+from app.services import email_broadcast as broadcast_service
+from app.services.email_outbox import EmailDeliveryError, FakeEmailTransport
+
+
+@pytest.fixture
+def transport(session_factory, monkeypatch):
+    fake = FakeEmailTransport()
+    monkeypatch.setattr(broadcast_service, "SessionLocal", session_factory)
+    monkeypatch.setattr(broadcast_service.email_outbox, "transport", fake)
+    monkeypatch.setattr(broadcast_service.settings, "EMAIL_BROADCAST_BATCH_SIZE", 2)
+    monkeypatch.setattr(broadcast_service.settings, "EMAIL_MAX_ATTEMPTS", 1)
+    return fake
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    calls = []
+    monkeypatch.setattr(broadcast_service, "submit_broadcast", lambda broadcast_id: calls.append((broadcast_id, threading.current_thread())))
+    return calls
+
+
+def add_users(db, count):
+    db.add_all([User(email=f"user{index}@example.com", full_name=f"User {index}", is_active=True) for index in range(count)])
+    db.commit()
+
+
+def broadcast_data():
+    return BroadcastCreate(subject="News", template_name="welcome.html", template_context={"name": "-name-"})
+
+
+def test_create_counts_recipients_off_the_event_loop(db, transport, submitted, monkeypatch):
+    add_users(db, 3)
+    count_threads = []
+    count_recipients = email_crud.count_recipients
+
+    def recording_count(*args, **kwargs):
+        count_threads.append(threading.current_thread())
+        return count_recipients(*args, **kwargs)
+
+    monkeypatch.setattr(email_crud, "count_recipients", recording_count)
+
+    progress = asyncio.run(broadcast_service.create_broadcast(db, broadcast_data(), created_by=None))
+
+    assert progress.total_recipients == 3
+    assert count_threads and count_threads[0] is not threading.main_thread()
+    # only the submit happens on the event loop
+    assert submitted == [(progress.id, threading.main_thread())]
+
+
+def test_broadcast_sends_every_recipient_once_in_batches(db, transport, submitted):
+    add_users(db, 5)
+    progress = asyncio.run(broadcast_service.create_broadcast(db, broadcast_data(), created_by=None))
+
+    asyncio.run(broadcast_service.run_broadcast(progress.id))
+
+    recipients = [
+        personalization["to"][0]["email"]
+        for payload in transport.sent
+        for personalization in payload["personalizations"]
+    ]
+    assert len(transport.sent) == 3
+    assert sorted(recipients) == sorted(f"user{index}@example.com" for index in range(5))
+    db.expire_all()
+    assert email_crud.get_broadcast(db, progress.id).status == BROADCAST_STATUS_COMPLETED
+
+
+def test_failed_broadcast_resumes_from_its_checkpoint(db, transport, submitted):
+    add_users(db, 4)
+    progress = asyncio.run(broadcast_service.create_broadcast(db, broadcast_data(), created_by=None))
+
+    sent_before_failure = []
+
+    async def send(payload):
+        if sent_before_failure:
+            raise EmailDeliveryError("SendGrid API error 503")
+        sent_before_failure.append(payload)
+
+    transport.send = send
+    asyncio.run(broadcast_service.run_broadcast(progress.id))
+    db.expire_all()
+    assert email_crud.get_broadcast(db, progress.id).status == BROADCAST_STATUS_FAILED
+
+    del transport.send
+    asyncio.run(broadcast_service.resume_broadcast(db, progress.id))
+    asyncio.run(broadcast_service.run_broadcast(progress.id))
+
+    resumed = [personalization["to"][0]["email"] for personalization in transport.sent[0]["personalizations"]]
+    first = [personalization["to"][0]["email"] for personalization in sent_before_failure[0]["personalizations"]]
+    assert sorted(first + resumed) == sorted(f"user{index}@example.com" for index in range(4))
+    db.expire_all()
+    assert email_crud.get_broadcast(db, progress.id).status == BROADCAST_STATUS_COMPLETED
@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.email import EMAIL_STATUS_FAILED, EMAIL_STATUS_PENDING, EMAIL_STATUS_SENT, OutboundEmail
+from app.services import email_outbox as outbox_module
+from app.services.email_outbox import EmailDeliveryError, EmailOutbox, FakeEmailTransport
+
+
+@pytest.fixture
+def outbox(session_factory, monkeypatch):
+    monkeypatch.setattr(outbox_module, "SessionLocal", session_factory)
+    return EmailOutbox(
+        FakeEmailTransport(),
+        batch_size=10,
+        concurrency=3,
+        max_attempts=2,
+        retry_base_seconds=30,
+        poll_interval_seconds=1,
+        lease_seconds=300
+    )
+
+
+def statuses(db):
+    db.expire_all()
+    return {email.to_email: email.status for email in db.query(OutboundEmail)}
+
+
+def test_enqueued_messages_are_delivered(outbox, db):
+    outbox.enqueue("a@example.com", "Hello", "<p>a</p>")
+    outbox.enqueue("b@example.com", "Hello", "<p>b</p>")
+
+    assert asyncio.run(outbox.deliver_batch()) == 2
+
+    assert sorted(payload["personalizations"][0]["to"][0]["email"] for payload in outbox.transport.sent) == ["a@example.com", "b@example.com"]
+    assert statuses(db) == {"a@example.com": EMAIL_STATUS_SENT, "b@example.com": EMAIL_STATUS_SENT}
+    # nothing is due any more
+    assert asyncio.run(outbox.deliver_batch()) == 0
+
+
+def test_temporary_failures_are_retried_with_backoff(outbox, db):
+    outbox.enqueue("a@example.com", "Hello", "<p>a</p>")
+    outbox.transport.fail_with = EmailDeliveryError("SendGrid API error 503")
+
+    before = datetime.now(timezone.utc)
+    asyncio.run(outbox.deliver_batch())
+
+    email = db.query(OutboundEmail).one()
+    assert email.status == EMAIL_STATUS_PENDING
+    assert email.attempts == 1
+    assert email.last_error == "SendGrid API error 503"
+    next_attempt_at = email.next_attempt_at.replace(tzinfo=timezone.utc)
+    assert before + timedelta(seconds=30) <= next_attempt_at <= before + timedelta(seconds=40)
+    # not due yet
+    assert asyncio.run(outbox.deliver_batch()) == 0
+
+
+def test_gives_up_after_max_attempts(outbox, db):
+    outbox.enqueue("a@example.com", "Hello", "<p>a</p>")
+    outbox.transport.fail_with = EmailDeliveryError("SendGrid API error 503")
+
+    for _ in range(2):
+        asyncio.run(outbox.deliver_batch())
+        db.query(OutboundEmail).update({"next_attempt_at": datetime.now(timezone.utc) - timedelta(seconds=1)})
+        db.commit()
+
+    assert statuses(db) == {"a@example.com": EMAIL_STATUS_FAILED}
+
+
+def test_permanent_failures_are_not_retried(outbox, db):
+    outbox.enqueue("a@example.com", "Hello", "<p>a</p>")
+    outbox.transport.fail_with = EmailDeliveryError("SendGrid API error 400", permanent=True)
+
+    asyncio.run(outbox.deliver_batch())
+
+    assert statuses(db) == {"a@example.com": EMAIL_STATUS_FAILED}
+
+
+def test_lapsed_claims_are_picked_up_again(outbox, db):
+    outbox.enqueue("a@example.com", "Hello", "<p>a</p>")
+    outbox.lease_seconds = -1
+    # a worker claims the message and dies before recording the result
+    assert len(outbox._claim()) == 1
+
+    assert asyncio.run(outbox.deliver_batch()) == 1
+    assert statuses(db) == {"a@example.com": EMAIL_STATUS_SENT}
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import live_transcription
+from app.services import openai as openai_service
+
+SEGMENT_BYTES = 1000
+
+
+@pytest.fixture
+def transcribed(monkeypatch, tmp_path):
+    """Fakes Whisper: every segment yields one word at its offset; records the calls."""
+    monkeypatch.setattr(settings, "NOTE_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "LIVE_FALLBACK_BITRATE", 8000)  # 1000 bytes per second
+    calls = []
+
+    async def transcribe(segment_path, offset, retries=None):
+        calls.append(offset)
+        return [{"word": f"w{len(calls)}", "start": offset, "end": offset + 1}]
+
+    monkeypatch.setattr(openai_service, "transcribe_audio_chunk_with_retry", transcribe)
+    return calls
+
+
+def record(session, segments):
+    async def run():
+        for _ in range(segments):
+            await session.write(b"\xff" * SEGMENT_BYTES)
+        return await session.finish()
+    return asyncio.run(run())
+
+
+def test_unreadable_segment_is_still_transcribed(monkeypatch, transcribed):
+    lengths = iter([20.0, None, 20.0])
+    monkeypatch.setattr(live_transcription, "get_audio_length", lambda path: next(lengths))
+
+    session = live_transcription.LiveTranscription(1, segment_bytes=SEGMENT_BYTES)
+    try:
+        record(session, 3)
+    finally:
+        session.cleanup()
+
+    # the second segment's length is estimated from the first segment's bytes per second
+    assert transcribed == [0.0, 20.0, 40.0]
+    assert session.duration == 60.0
+
+
+def test_failed_segment_falls_back_to_the_recording(monkeypatch, transcribed):
+    monkeypatch.setattr(live_transcription, "get_audio_length", lambda path: 30.0)
+
+    async def transcribe(segment_path, offset, retries=None):
+        if offset == 30.0:
+            raise RuntimeError("whisper unavailable")
+        return [{"word": "live", "start": offset, "end": offset + 1}]
+
+    ranges = []
+
+    async def transcribe_range(path, offset=0.0, chunk_length=600):
+        return [{"word": "fallback", "start": offset, "end": offset + 1}]
+
+    monkeypatch.setattr(openai_service, "transcribe_audio_chunk_with_retry", transcribe)
+    monkeypatch.setattr(openai_service, "extract_audio_range", lambda source, target, start, duration: ranges.append((start, duration)))
+    monkeypatch.setattr(openai_service, "transcribe_long_audio_words", transcribe_range)
+
+    session = live_transcription.LiveTranscription(2, segment_bytes=SEGMENT_BYTES)
+    try:
+        transcript = record(session, 3)
+    finally:
+        session.cleanup()
+
+    assert ranges == [(30.0, 30.0)]
+    assert transcript.split() == ["[00:00]", "live", "[00:30]", "fallback", "[01:00]", "live"]
@@ -0,0 +1,140 @@
+from datetime import datetime, timezone
+
+import stripe
+from sqlalchemy.dialects import postgresql
+
+from app.crud import folder as folder_crud
+from app.crud import metric as metric_crud
+from app.models.folder import Folder
+from app.models.metric import Metric
+from app.models.note import Note
+from app.models.payment import Payment
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services import metrics as metrics_service
+
+
+def stripe_event(event_id, event_type, obj, previous_attributes=None):
+    data = {"object": obj}
+    if previous_attributes is not None:
+        data["previous_attributes"] = previous_attributes
+    return stripe.Event.construct_from({"id": event_id, "type": event_type, "data": data}, "sk_test")
+
+
+def active_subscriptions(db):
+    return metrics_service.get_dashboard_metrics(db)[metrics_service.ACTIVE_SUBSCRIPTIONS]
+
+
+def test_increment_creates_then_adds(db):
+    metric_crud.increment(db, "widgets", 2)
+    metric_crud.increment(db, "widgets", 3)
+    metric_crud.increment(db, "widgets", 0)
+    db.commit()
+
+    assert metric_crud.get_all(db) == {"widgets": 5}
+
+
+def test_increment_is_a_single_upsert():
+    statements = []
+
+    class Recorder:
+        dialect = postgresql.psycopg2.dialect()
+
+        def execute(self, statement):
+            statements.append(str(statement.compile(dialect=self.dialect)))
+
+    metric_crud.increment(Recorder(), "total_users", 1)
+
+    [statement] = statements
+    assert statement.startswith("INSERT INTO metrics")
+    assert "ON CONFLICT (key) DO UPDATE SET value = (metrics.value + %(value_1)s)" in statement
+
+
+def test_user_inserts_are_counted(db):
+    db.add_all([User(email="a@example.com"), User(email="b@example.com")])
+    db.commit()
+
+    assert db.get(Metric, metrics_service.TOTAL_USERS).value == 2
+
+
+def test_deleting_a_folder_subtracts_its_notes(db):
+    user = User(email="a@example.com")
+    db.add(user)
+    db.flush()
+    kept, deleted = Folder(user_id=user.id, name="kept"), Folder(user_id=user.id, name="deleted")
+    db.add_all([kept, deleted])
+    db.flush()
+    db.add_all([Note(user_id=user.id, folder_id=kept.id, title="kept")] + [
+        Note(user_id=user.id, folder_id=deleted.id, title=f"note {index}") for index in range(3)
+    ])
+    db.commit()
+    assert db.get(Metric, metrics_service.TOTAL_NOTES).value == 4
+
+    # the notes themselves go through ON DELETE CASCADE, not the ORM
+    folder_crud.delete_folder_obj(db, deleted)
+
+    db.expire_all()
+    assert db.get(Metric, metrics_service.TOTAL_NOTES).value == 1
+
+
+def test_reconcile_reads_the_local_stripe_mirrors(session_factory, monkeypatch):
+    monkeypatch.setattr(metrics_service, "SessionLocal", session_factory)
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    with session_factory() as db:
+        db.add_all([
+            Payment(stripe_payment_intent_id="pi_1", amount=1000, status="succeeded", created_at=created_at),
+            Payment(stripe_payment_intent_id="pi_2", amount=2500, status="succeeded", created_at=created_at),
+            Payment(stripe_payment_intent_id="pi_3", amount=9999, status="canceled", created_at=created_at),
+            Subscription(stripe_subscription_id="sub_1", status="active"),
+            Subscription(stripe_subscription_id="sub_2", status="canceled"),
+        ])
+        db.commit()
+
+    # no Stripe API call is made
+    monkeypatch.setattr(stripe.PaymentIntent, "list", None)
+    monkeypatch.setattr(stripe.Subscription, "list", None)
+    values = metrics_service.reconcile_metrics()
+
+    assert values[metrics_service.REVENUE_GENERATED] == 3500
+    assert values[metrics_service.ACTIVE_SUBSCRIPTIONS] == 1
+    with session_factory() as db:
+        assert metrics_service.get_dashboard_metrics(db)[metrics_service.REVENUE_GENERATED] == 3500
+
+
+def test_deleting_an_active_subscription_decrements(db):
+    db.add(Subscription(stripe_subscription_id="sub_active", status="active"))
+    metric_crud.set_values(db, {metrics_service.ACTIVE_SUBSCRIPTIONS: 3})
+
+    metrics_service.apply_stripe_event(db, stripe_event(
+        "evt_1", "customer.subscription.deleted", {"id": "sub_active", "status": "canceled"}
+    ))
+
+    assert active_subscriptions(db) == 2
+
+
+def test_deleting_an_inactive_subscription_leaves_the_count(db):
+    db.add_all([
+        Subscription(stripe_subscription_id="sub_incomplete", status="incomplete"),
+        Subscription(stripe_subscription_id="sub_past_due", status="past_due"),
+        Subscription(stripe_subscription_id="sub_trialing", status="trialing"),
+    ])
+    metric_crud.set_values(db, {metrics_service.ACTIVE_SUBSCRIPTIONS: 3})
+
+    for index, subscription_id in enumerate(["sub_incomplete", "sub_past_due", "sub_trialing", "sub_unknown"]):
+        metrics_service.apply_stripe_event(db, stripe_event(
+            f"evt_{index}", "customer.subscription.deleted", {"id": subscription_id, "status": "incomplete_expired"}
+        ))
+
+    assert active_subscriptions(db) == 3
+
+
+def test_events_are_applied_once(db):
+    metric_crud.set_values(db, {metrics_service.ACTIVE_SUBSCRIPTIONS: 0})
+    event = stripe_event(
+        "evt_dup", "customer.subscription.updated", {"id": "sub_1", "status": "active"}, {"status": "incomplete"}
+    )
+
+    metrics_service.apply_stripe_event(db, event)
+    metrics_service.apply_stripe_event(db, event)
+
+    assert active_subscriptions(db) == 1
@@ -0,0 +1,52 @@
+from sqlalchemy import literal, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query
+
+from app.crud import note as note_crud
+
+
+class RecordingQuery:
+    """Proxies a Query, compiling it for PostgreSQL instead of running it when results are asked for."""
+
+    def __init__(self, query: Query, compiled: list):
+        self._query = query
+        self._compiled = compiled
+
+    def __getattr__(self, name):
+        attribute = getattr(self._query, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            result = attribute(*args, **kwargs)
+            return RecordingQuery(result, self._compiled) if isinstance(result, Query) else result
+        return call
+
+    def all(self):
+        compiled = self._query.statement.compile(dialect=postgresql.psycopg2.dialect())
+        self._compiled.append((compiled.string, compiled.construct_params()))
+        return []
+
+
+def test_html_escaped(db):
+    text = """<script>alert('x')</script> & "quotes" """
+
+    escaped = db.execute(select(note_crud.html_escaped(literal(text)))).scalar()
+
+    assert escaped == "&lt;script&gt;alert(&#39;x&#39;)&lt;/script&gt; &amp; &quot;quotes&quot; "
+
+
+def test_search_with_colon_and_estimated_count(db, planner):
+    compiled = []
+    planner.query = lambda *entities: RecordingQuery(db.query(*entities), compiled)
+
+    result = note_crud.search_notes(planner, "a:b :tomorrow", user_id=1, count="estimated")
+
+    assert result["total"] == 42
+    assert "websearch_to_tsquery('english', 'a:b :tomorrow')" in planner.explained[0]
+
+    [(page_sql, params)] = compiled
+    assert "ts_headline" in page_sql
+    # both document columns are escaped before ts_headline adds <mark>
+    assert page_sql.count("replace(replace(replace(replace(replace(notes.") == 2
+    assert "&lt;" in params.values()
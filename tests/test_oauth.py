@@ -0,0 +1,131 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jose import jwk, jwt
+
+from app.services import oauth
+from app.services import user as user_service_module
+from app.services.oauth import GOOGLE_ISSUERS, IdTokenVerifier, JWKSKeySet, OAuthService, StaticKeySet
+
+CLIENT_ID = "web-client-id"
+
+_private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+PRIVATE_PEM = _private_key.private_bytes(
+    serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+).decode()
+PUBLIC_JWK = jwk.construct(
+    _private_key.public_key().public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo),
+    "RS256"
+).to_dict()
+
+
+def signing_key(kid):
+    return dict(PUBLIC_JWK, kid=kid, use="sig", alg="RS256")
+
+
+def id_token(kid="key-1", **claims):
+    now = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com",
+        "aud": CLIENT_ID,
+        "sub": "1234",
+        "email": "someone@example.com",
+        "email_verified": True,
+        "name": "Someone",
+        "iat": now,
+        "exp": now + 300,
+    }
+    payload.update(claims)
+    return jwt.encode(payload, PRIVATE_PEM, algorithm="RS256", headers={"kid": kid})
+
+
+def google_service(audiences=(CLIENT_ID,)):
+    verifier = IdTokenVerifier("Google", StaticKeySet({"keys": [signing_key("key-1")]}), GOOGLE_ISSUERS, list(audiences))
+    return OAuthService(google_verifier=verifier)
+
+
+def verify(token, **kwargs):
+    return asyncio.run(google_service(**kwargs).verify_google_token(token))
+
+
+def test_valid_token_is_accepted():
+    assert verify(id_token())["email"] == "someone@example.com"
+
+
+@pytest.mark.parametrize("token", [
+    pytest.param(lambda: id_token(kid="unknown-key"), id="bad kid"),
+    pytest.param(lambda: id_token(iss="https://evil.example.com"), id="wrong issuer"),
+    pytest.param(lambda: id_token(aud="someone-elses-client-id"), id="wrong audience"),
+    pytest.param(lambda: id_token(exp=int(time.time()) - 60), id="expired"),
+    pytest.param(lambda: id_token(email_verified=False), id="unverified email"),
+    pytest.param(lambda: id_token(email_verified=None), id="no email_verified claim"),
+])
+def test_invalid_tokens_are_rejected(token):
+    assert verify(token()) is None
+
+
+def test_every_token_is_rejected_without_a_configured_client_id():
+    assert verify(id_token(), audiences=()) is None
+
+
+def test_apple_sends_email_verified_as_a_string():
+    assert verify(id_token(email_verified="true")) is not None
+    assert verify(id_token(email_verified="false")) is None
+
+
+def test_jwks_keys_are_cached_and_refreshed_on_rotation(monkeypatch):
+    jwks = {"keys": [signing_key("old")]}
+    fetches = []
+
+    def handler(request):
+        fetches.append(request.url)
+        return httpx.Response(200, json=jwks, headers={"cache-control": "public, max-age=600", "age": "100"})
+
+    async_client = httpx.AsyncClient
+    monkeypatch.setattr(oauth.httpx, "AsyncClient", lambda **kwargs: async_client(transport=httpx.MockTransport(handler), **kwargs))
+    key_set = JWKSKeySet("https://example.com/certs", default_ttl_seconds=3600, min_refresh_seconds=0)
+    verifier = IdTokenVerifier("Google", key_set, GOOGLE_ISSUERS, [CLIENT_ID])
+
+    async def scenario():
+        for _ in range(3):
+            assert await verifier.verify(id_token(kid="old"))
+        assert len(fetches) == 1
+        assert round(key_set._expires_at - key_set._fetched_at) == 500
+
+        # the provider rotates in a new key before our cache expires
+        jwks["keys"].append(signing_key("new"))
+        assert await verifier.verify(id_token(kid="new"))
+        assert len(fetches) == 2
+
+        # unknown key ids refresh at most once per min_refresh_seconds
+        key_set.min_refresh_seconds = 60
+        assert await verifier.verify(id_token(kid="forged-1")) is None
+        assert await verifier.verify(id_token(kid="forged-2")) is None
+        assert len(fetches) == 2
+
+    asyncio.run(scenario())
+
+
+def test_google_user_without_a_name_claim_is_created(db, monkeypatch):
+    monkeypatch.setattr(user_service_module, "oauth_service", google_service())
+    monkeypatch.setattr(user_service_module.EmailService, "send_email", lambda **kwargs: None)
+
+    user = asyncio.run(user_service_module.UserService().get_or_create_google_user(db, id_token(name=None)))
+
+    assert user.email == "someone@example.com"
+    assert user.full_name == "someone"
+    assert user.is_verified
+
+
+def test_google_login_with_unverified_email_does_not_reach_the_account(db, monkeypatch):
+    monkeypatch.setattr(user_service_module, "oauth_service", google_service())
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(user_service_module.UserService().get_or_create_google_user(db, id_token(email_verified=False)))
+
+    assert error.value.status_code == 401
@@ -0,0 +1,154 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import openai as openai_service
+
+
+def test_failed_chunk_cancels_the_others_before_cleanup(monkeypatch, tmp_path):
+    chunk_dir = tmp_path / "chunks"
+    chunk_dir.mkdir()
+    chunks = []
+    for index in range(3):
+        chunk = chunk_dir / f"audio_{index:03d}.mp3"
+        chunk.write_bytes(b"audio")
+        chunks.append(str(chunk))
+
+    cancelled = []
+
+    async def transcribe(chunk_path, offset, retries=None):
+        if chunk_path == chunks[0]:
+            raise RuntimeError("chunk failed")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            # the chunk must still be on disk while its task is winding down
+            cancelled.append(os.path.exists(chunk_path))
+            raise
+        return []
+
+    monkeypatch.setattr(openai_service.shutil, "which", lambda name: "/usr/bin/ffmpeg")
+    monkeypatch.setattr(openai_service.tempfile, "mkdtemp", lambda prefix: str(chunk_dir))
+    monkeypatch.setattr(openai_service, "split_audio", lambda *args, **kwargs: chunks)
+    monkeypatch.setattr(openai_service, "get_chunk_offsets", lambda chunks, chunk_length: [0.0] * len(chunks))
+    monkeypatch.setattr(openai_service, "transcribe_audio_chunk_with_retry", transcribe)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(openai_service.transcribe_long_audio("audio.mp3"))
+
+    assert "chunk failed" in error.value.detail
+    assert cancelled == [True, True]
+    assert not chunk_dir.exists()
+
+
+def test_gather_or_cancel_keeps_order():
+    async def value(number, delay):
+        await asyncio.sleep(delay)
+        return number
+
+    async def run():
+        return await openai_service.gather_or_cancel(value(1, 0.02), value(2, 0), value(3, 0.01))
+
+    assert asyncio.run(run()) == [1, 2, 3]
+
+
+def transcript_line(second, words=4):
+    return f"[{second // 60:02d}:{second % 60:02d}] " + " ".join(["tooth"] * words)
+
+
+def test_split_transcript_cuts_between_timestamped_lines():
+    text = "\n".join([
+        transcript_line(0),
+        transcript_line(5),
+        "  continued from the line above",
+        transcript_line(10),
+        transcript_line(15),
+    ])
+
+    chunks = openai_service.split_transcript(text, max_chars=70)
+
+    assert "\n".join(chunks) == text
+    assert all(len(chunk) <= 70 for chunk in chunks)
+    assert all(openai_service.TIMESTAMP_LINE.match(chunk) for chunk in chunks)
+    # a continuation line stays with its timestamp
+    assert any(chunk.endswith(transcript_line(5) + "\n  continued from the line above") for chunk in chunks)
+
+
+def test_split_transcript_hard_splits_an_oversized_line():
+    long_line = transcript_line(0, words=40)
+    text = "\n".join([transcript_line(1), long_line, transcript_line(2)])
+
+    chunks = openai_service.split_transcript(text, max_chars=50)
+
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert chunks[0] == transcript_line(1)
+    assert chunks[-1] == transcript_line(2)
+    assert "".join(chunks[1:-1]) == long_line
+
+
+class FakeCompletions:
+    """Answers every chat completion with fixed-size notes and fixed token usage."""
+
+    def __init__(self, notes_chars):
+        self.notes_chars = notes_chars
+        self.requests = []
+
+    async def create(self, model, messages, max_tokens, temperature):
+        self.requests.append(messages)
+        index = len(self.requests)
+        content = f"notes {index:03d} ".ljust(self.notes_chars, "x")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        )
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    fake = FakeCompletions(notes_chars=45)
+    monkeypatch.setattr(openai_service, "client", SimpleNamespace(chat=SimpleNamespace(completions=fake)))
+    monkeypatch.setattr(openai_service.settings, "SUMMARY_CHUNK_CHARS", 100)
+    monkeypatch.setattr(openai_service.settings, "SUMMARY_CONCURRENCY", 2)
+    return fake
+
+
+def test_summarize_combines_partials_until_they_fit_one_reduce(completions):
+    text = "\n".join(transcript_line(second, words=6) for second in range(0, 100, 10))
+
+    result = asyncio.run(openai_service.summarize_transcript(text))
+
+    usage = result["usage"]
+    chunks = openai_service.split_transcript(text, 100)
+    assert usage["map"]["calls"] == len(chunks) == 5
+    # 5 partials of 45 chars -> 3 batches -> 2 batches, which fit
+    assert usage["combine"]["calls"] == 5
+    assert usage["reduce"]["calls"] == 1
+    assert len(completions.requests) == 11
+
+    prompts = [messages[1]["content"] for messages in completions.requests]
+    assert all(len(prompt) <= 100 for prompt in prompts[:-1])
+    # the report is built from the last combine pass only
+    last_combine = [f"notes {index:03d} ".ljust(45, "x") for index in (9, 10)]
+    assert prompts[-1].endswith("\n\n".join(last_combine))
+    assert result["summary"] == "notes 011 ".ljust(45, "x")
+
+
+def test_summarize_sums_usage_per_stage(completions):
+    text = "\n".join(transcript_line(second, words=6) for second in range(0, 100, 10))
+
+    usage = asyncio.run(openai_service.summarize_transcript(text))["usage"]
+
+    for stage in ("map", "combine", "reduce"):
+        calls = usage[stage]["calls"]
+        assert usage[stage] == {"calls": calls, "prompt_tokens": 10 * calls, "completion_tokens": 5 * calls, "total_tokens": 15 * calls}
+    assert sum(stage["total_tokens"] for stage in usage.values()) == 15 * len(completions.requests)
+
+
+def test_short_transcript_is_summarized_in_one_call(completions):
+    result = asyncio.run(openai_service.summarize_transcript(transcript_line(0)))
+
+    assert list(result["usage"]) == ["reduce"]
+    assert len(completions.requests) == 1
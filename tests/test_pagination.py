@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.crud import folder as folder_crud
+from app.crud.base import LIKE_ESCAPE, count_rows, decode_cursor, encode_cursor, paginate, search_pattern
+from app.models.folder import Folder
+from app.models.user import User
+
+
+def add_folders(db, count):
+    user = User(email="owner@example.com")
+    db.add(user)
+    db.flush()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    db.add_all([
+        Folder(name=f"folder {index}", user_id=user.id, created_at=start + timedelta(minutes=index))
+        for index in range(count)
+    ])
+    db.commit()
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(created_at, 7)) == (created_at, 7)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_keyset_pages_cover_every_row_once(db):
+    add_folders(db, 7)
+
+    seen, cursor = [], None
+    while True:
+        page = paginate(db, db.query(Folder), Folder, size=3, cursor=cursor)
+        seen.extend(folder.name for folder in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == [f"folder {index}" for index in reversed(range(7))]
+
+
+def test_estimated_count_binds_search_terms_with_colons(db, planner):
+    add_folders(db, 1)
+    term = "follow up :tomorrow 100%"
+    query = db.query(Folder).filter(Folder.name.ilike(search_pattern(term), escape=LIKE_ESCAPE))
+    assert count_rows(planner, query, "estimated") == 42
+    [explained] = planner.explained
+    assert explained.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "follow up :tomorrow 100\\\\%" in explained
+
+
+def test_estimated_count_falls_back_to_count_off_postgres(db):
+    add_folders(db, 3)
+    assert count_rows(db, db.query(Folder), "estimated") == 3
+    assert count_rows(db, db.query(Folder), "none") is None
+
+
+def test_admin_folder_search_with_colon(db, planner):
+    add_folders(db, 2)
+
+    result = folder_crud.get_many(planner, search="folder :draft", count="estimated")
+
+    assert result["total"] == 42
+    assert "folder :draft" in planner.explained[0]
+
+
+def test_search_pattern_matches_substrings_and_escapes_wildcards(db):
+    add_folders(db, 3)
+
+    def names(term):
+        query = db.query(Folder).filter(Folder.name.ilike(search_pattern(term), escape=LIKE_ESCAPE))
+        return sorted(folder.name for folder in query)
+
+    # short terms still match anywhere in the name, not only as a prefix
+    assert names("r 1") == ["folder 1"]
+    assert names("ld") == ["folder 0", "folder 1", "folder 2"]
+    assert names("%") == []
+    assert names("_") == []
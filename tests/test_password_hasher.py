@@ -0,0 +1,77 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from passlib.hash import bcrypt
+
+from app.core.security import PasswordHasher
+from app.models.user import User
+from app.services import auth as auth_service_module
+from app.services.auth import AuthService
+
+
+@pytest.fixture
+def hasher(monkeypatch):
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__default_rounds=5, bcrypt__min_rounds=5)
+    hasher = PasswordHasher(context, workers=2, max_pending=4)
+    monkeypatch.setattr(auth_service_module, "password_hasher", hasher)
+    return hasher
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="a@example.com", full_name="A", hashed_password=bcrypt.using(rounds=4).hash("secret"))
+    db.add(user)
+    db.commit()
+    return user
+
+
+def stored_hash(session_factory):
+    with session_factory() as db:
+        return db.query(User.hashed_password).filter(User.email == "a@example.com").scalar()
+
+
+def test_login_upgrades_a_hash_below_the_configured_cost(hasher, db, user, session_factory):
+    assert asyncio.run(AuthService().verify_password(db, user, "secret"))
+
+    upgraded = stored_hash(session_factory)
+    assert bcrypt.from_string(upgraded).rounds == 5
+    assert asyncio.run(hasher.verify("secret", upgraded))
+
+
+def test_wrong_password_does_not_rehash(hasher, db, user, session_factory):
+    original = stored_hash(session_factory)
+
+    assert not asyncio.run(AuthService().verify_password(db, user, "wrong"))
+
+    assert stored_hash(session_factory) == original
+
+
+def test_current_hash_is_left_alone(hasher, db, user, session_factory):
+    asyncio.run(AuthService().verify_password(db, user, "secret"))
+    upgraded = stored_hash(session_factory)
+
+    assert asyncio.run(AuthService().verify_password(db, user, "secret"))
+
+    assert stored_hash(session_factory) == upgraded
+
+
+def test_saturated_executor_turns_requests_away():
+    release = threading.Event()
+    hasher = PasswordHasher(CryptContext(schemes=["bcrypt"]), workers=1, max_pending=2)
+
+    async def scenario():
+        blocked = [asyncio.ensure_future(hasher._run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as error:
+            await hasher.hash("secret")
+        release.set()
+        await asyncio.gather(*blocked)
+        return error.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 503
+    # slots are released once the queued calls finish
+    assert asyncio.run(hasher.verify("secret", bcrypt.using(rounds=4).hash("secret")))
@@ -0,0 +1,101 @@
+import pytest
+import stripe
+
+from app.services import plan as plan_service
+from app.services import subscription as subscription_service
+from app.services.plan import PlanCatalog
+
+
+def price(price_id, name, amount=1000, interval="month"):
+    return stripe.Price.construct_from({
+        "id": price_id,
+        "object": "price",
+        "active": True,
+        "currency": "usd",
+        "unit_amount": amount,
+        "recurring": {"interval": interval},
+        "product": {"id": f"prod_{price_id}", "object": "product", "name": name},
+    }, "sk_test")
+
+
+class FakeStripePrices:
+    def __init__(self, prices):
+        self.prices = prices
+        self.list_calls = []
+
+    def list(self, **params):
+        self.list_calls.append(params)
+        return stripe.ListObject.construct_from(
+            {"object": "list", "url": "/v1/prices", "has_more": False, "data": list(self.prices)},
+            "sk_test"
+        )
+
+    def modify(self, price_id, **params):
+        return price(price_id, "Modified")
+
+    def create(self, **params):
+        return price("price_new", "New")
+
+
+@pytest.fixture
+def prices(monkeypatch):
+    fake = FakeStripePrices([price("price_monthly", "Monthly"), price("price_yearly", "Yearly", 10000, "year")])
+    monkeypatch.setattr(stripe.Price, "list", fake.list)
+    monkeypatch.setattr(stripe.Price, "modify", fake.modify)
+    monkeypatch.setattr(stripe.Price, "create", fake.create)
+    monkeypatch.setattr(stripe.Product, "create", lambda **params: stripe.Product.construct_from({"id": "prod_new"}, "sk_test"))
+    monkeypatch.setattr(plan_service, "plan_catalog", PlanCatalog(ttl_seconds=300))
+    return fake
+
+
+def test_catalog_is_built_from_one_expanded_price_list(prices):
+    plans = plan_service.list_plans()
+
+    assert [plan["name"] for plan in plans] == ["Monthly", "Yearly"]
+    assert plan_service.get_plan("price_yearly")["interval"] == "year"
+    assert prices.list_calls == [{"active": True, "type": "recurring", "expand": ["data.product"], "limit": 100}]
+
+
+def test_catalog_is_reloaded_after_the_ttl(prices):
+    plan_service.plan_catalog.ttl_seconds = 0
+
+    plan_service.list_plans()
+    plan_service.list_plans()
+
+    assert len(prices.list_calls) == 2
+
+
+@pytest.mark.parametrize("admin_change", [
+    pytest.param(lambda: plan_service.create_plan("New", 500, "month"), id="create"),
+    pytest.param(lambda: plan_service.update_plan("price_monthly", active=True), id="update"),
+    pytest.param(lambda: plan_service.delete_plan("price_monthly"), id="delete"),
+])
+def test_admin_changes_invalidate_the_catalog(prices, admin_change):
+    plan_service.list_plans()
+
+    admin_change()
+    prices.prices.append(price("price_weekly", "Weekly", 300, "week"))
+
+    assert "Weekly" in [plan["name"] for plan in plan_service.list_plans()]
+    assert len(prices.list_calls) == 2
+
+
+@pytest.mark.parametrize("event_type", ["price.created", "price.updated", "price.deleted", "product.updated", "product.deleted"])
+def test_price_and_product_webhooks_invalidate_the_catalog(prices, db, event_type):
+    plan_service.list_plans()
+    prices.prices.pop()
+
+    event = stripe.Event.construct_from({"id": "evt_1", "type": event_type, "created": 1700000000, "data": {"object": {}}}, "sk_test")
+    subscription_service.handle_webhook_event(db, event)
+
+    assert [plan["name"] for plan in plan_service.list_plans()] == ["Monthly"]
+
+
+def test_unrelated_webhooks_keep_the_catalog(prices, db):
+    plan_service.list_plans()
+
+    event = stripe.Event.construct_from({"id": "evt_1", "type": "customer.updated", "created": 1700000000, "data": {"object": {}}}, "sk_test")
+    subscription_service.handle_webhook_event(db, event)
+    plan_service.list_plans()
+
+    assert len(prices.list_calls) == 1
@@ -0,0 +1,60 @@
+import stripe
+
+from app.crud import payment as payment_crud
+from app.crud import subscription as subscription_crud
+from app.models.user import User
+from app.services import subscription as subscription_service
+
+
+def subscription_event(event_type, created, status, subscription_id="sub_1"):
+    return stripe.Event.construct_from({
+        "id": f"evt_{event_type}_{created}",
+        "type": event_type,
+        "created": created,
+        "data": {"object": {
+            "id": subscription_id,
+            "object": "subscription",
+            "customer": "cus_1",
+            "status": status,
+            "created": 1700000000,
+            "items": {"data": []},
+        }},
+    }, "sk_test")
+
+
+def intent(status, amount=1000):
+    return {"id": "pi_1", "customer": None, "amount": amount, "status": status, "created": 1700000000}
+
+
+def test_late_update_does_not_revive_a_deleted_subscription(db):
+    db.add(User(email="customer@example.com", stripe_customer_id="cus_1"))
+    db.commit()
+
+    subscription_service.handle_webhook_event(db, subscription_event("customer.subscription.deleted", 1700000200, "canceled"))
+    subscription_service.handle_webhook_event(db, subscription_event("customer.subscription.updated", 1700000100, "active"))
+
+    subscription = subscription_crud.get_by_stripe_id(db, "sub_1")
+    assert subscription.status == "canceled"
+    assert subscription.event_created == 1700000200
+
+
+def test_canceled_is_final_even_within_the_same_second(db):
+    subscription_crud.upsert_from_stripe(db, {"id": "sub_1", "status": "canceled", "created": 1700000000}, event_created=1700000300)
+    subscription_crud.upsert_from_stripe(db, {"id": "sub_1", "status": "active", "created": 1700000000}, event_created=1700000300)
+
+    assert subscription_crud.get_by_stripe_id(db, "sub_1").status == "canceled"
+
+
+def test_newer_events_are_applied_in_order(db):
+    subscription_crud.upsert_from_stripe(db, {"id": "sub_1", "status": "incomplete", "created": 1700000000}, event_created=1700000100)
+    subscription_crud.upsert_from_stripe(db, {"id": "sub_1", "status": "active", "created": 1700000000}, event_created=1700000200)
+
+    assert subscription_crud.get_by_stripe_id(db, "sub_1").status == "active"
+
+
+def test_late_payment_intent_event_is_ignored(db):
+    payment_crud.upsert_from_stripe(db, intent("succeeded"), event_created=1700000200)
+    payment_crud.upsert_from_stripe(db, intent("processing"), event_created=1700000100)
+    payment_crud.upsert_from_stripe(db, intent("requires_payment_method"), event_created=1700000300)
+
+    assert payment_crud.get_by_stripe_id(db, "pi_1").status == "succeeded"
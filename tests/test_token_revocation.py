@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from app.core.config import settings
+from app.core.security import TOKEN_FORMAT_VERSION, create_access_token, create_user_access_token, password_hasher
+from app.endpoints.admin.user import toggle_suspend_user
+from app.models.user import User
+from app.services.user import UserService
+from app.services.user_cache import MemoryUserCache, user_cache
+from app.utils.deps import get_claims_from_token, is_admin
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(user_cache, "backend", MemoryUserCache(ttl_seconds=60, max_entries=10))
+
+
+@pytest.fixture
+def user(db):
+    user = User(
+        email="a@example.com",
+        full_name="A",
+        role="user",
+        hashed_password=asyncio.run(password_hasher.hash("old-password")),
+        token_version=0
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def assert_rejected(db, token):
+    with pytest.raises(HTTPException) as error:
+        get_claims_from_token(db, token)
+    assert error.value.status_code == 401
+
+
+def test_change_password_revokes_issued_tokens(db, user):
+    token = create_user_access_token(user)
+    # cached with the current token_version
+    get_claims_from_token(db, token)
+
+    asyncio.run(UserService().change_password(db, user, "old-password", "new-password"))
+
+    assert_rejected(db, token)
+    assert get_claims_from_token(db, create_user_access_token(user)).ver == 1
+
+
+def test_admin_suspend_revokes_issued_tokens(db, user):
+    token = create_user_access_token(user)
+    get_claims_from_token(db, token)
+    admin = get_claims_from_token(db, create_user_access_token(user)).model_copy(update={"role": "admin"})
+
+    toggle_suspend_user(user.id, db=db, current_user=admin)
+
+    assert_rejected(db, token)
+
+
+def test_tokens_without_the_current_format_are_rejected(db, user):
+    legacy = jwt.encode({"sub": user.email, "uid": user.id, "ver": 0}, settings.SECRET_KEY, algorithm="HS256")
+    assert_rejected(db, legacy)
+
+    old_format = create_access_token({"sub": user.email, "uid": user.id, "ver": 0, "fmt": 1})
+    assert_rejected(db, old_format)
+
+
+def test_role_comes_from_the_claims(db, user):
+    claims = get_claims_from_token(db, create_user_access_token(user))
+    with pytest.raises(HTTPException) as error:
+        is_admin(claims)
+    assert error.value.status_code == 403
+
+    # promoting the row does not change what an issued token authorizes
+    user.role = "admin"
+    db.commit()
+    with pytest.raises(HTTPException):
+        is_admin(get_claims_from_token(db, create_access_token({
+            "sub": user.email, "uid": user.id, "role": "user", "ver": 0, "fmt": TOKEN_FORMAT_VERSION
+        })))
+    assert is_admin(get_claims_from_token(db, create_user_access_token(user))).role == "admin"
+
+
+def test_updating_the_user_invalidates_the_cached_token_version(db, user):
+    token = create_user_access_token(user)
+    get_claims_from_token(db, token)
+    assert user_cache.get_token_version(user.email) == 0
+
+    UserService().revoke_tokens(db, user)
+
+    assert user_cache.backend.get(user.email) is None
+    assert_rejected(db, token)
+    assert user_cache.get_token_version(user.email) == 1
@@ -0,0 +1,75 @@
+import io
+import os
+from datetime import timedelta
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from app.core.config import settings
+from app.services.upload import UploadService
+
+PART_SIZE = 5 * 1024 * 1024
+
+
+@pytest.fixture
+def s3():
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=settings.AWS_BUCKET)
+        yield client
+
+
+def pending_uploads(client):
+    return client.list_multipart_uploads(Bucket=settings.AWS_BUCKET).get("Uploads", [])
+
+
+def test_multipart_round_trip(s3):
+    data = os.urandom(2 * PART_SIZE + 1024)
+
+    UploadService(s3).upload_multipart(io.BytesIO(data), settings.AWS_BUCKET, "audio/a.mp3", part_size=PART_SIZE, concurrency=3)
+
+    assert s3.get_object(Bucket=settings.AWS_BUCKET, Key="audio/a.mp3")["Body"].read() == data
+    assert pending_uploads(s3) == []
+
+
+def test_large_files_go_through_multipart(s3, monkeypatch):
+    monkeypatch.setattr(settings, "S3_MULTIPART_THRESHOLD", PART_SIZE)
+    monkeypatch.setattr(settings, "S3_MULTIPART_PART_SIZE", PART_SIZE)
+    service = UploadService(s3)
+    calls = []
+    upload_multipart = service.upload_multipart
+    monkeypatch.setattr(service, "upload_multipart", lambda *args, **kwargs: calls.append(1) or upload_multipart(*args, **kwargs))
+
+    service.upload_audio(io.BytesIO(os.urandom(PART_SIZE + 1)))
+
+    assert calls == [1]
+
+
+def test_failed_part_aborts_the_upload(s3, monkeypatch):
+    upload_part = s3.upload_part
+
+    def failing_upload_part(**kwargs):
+        if kwargs["PartNumber"] == 2:
+            raise ConnectionError("connection reset")
+        return upload_part(**kwargs)
+
+    monkeypatch.setattr(s3, "upload_part", failing_upload_part)
+
+    with pytest.raises(ConnectionError):
+        UploadService(s3).upload_multipart(io.BytesIO(os.urandom(3 * PART_SIZE)), settings.AWS_BUCKET, "audio/b.mp3", part_size=PART_SIZE)
+
+    assert pending_uploads(s3) == []
+    assert "Contents" not in s3.list_objects_v2(Bucket=settings.AWS_BUCKET)
+
+
+def test_abort_stale_multipart_uploads(s3):
+    s3.create_multipart_upload(Bucket=settings.AWS_BUCKET, Key="audio/orphan.mp3")
+    service = UploadService(s3)
+
+    # moto reports every upload as initiated in 2010
+    assert service.abort_stale_multipart_uploads(older_than=timedelta(days=365 * 100)) == 0
+    assert len(pending_uploads(s3)) == 1
+
+    assert service.abort_stale_multipart_uploads(older_than=timedelta(days=1)) == 1
+    assert pending_uploads(s3) == []
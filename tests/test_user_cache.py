@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from app.core.security import password_hasher
+from app.models.user import User
+from app.services.user import UserService
+from app.services.user_cache import SECRET_COLUMNS, MemoryUserCache, UserCache
+
+
+@pytest.fixture
+def cache():
+    return UserCache(MemoryUserCache(ttl_seconds=60, max_entries=10))
+
+
+@pytest.fixture
+def user(db):
+    user = User(
+        email="a@example.com",
+        full_name="A",
+        hashed_password=asyncio.run(password_hasher.hash("old-password")),
+        reset_code="123456",
+        verification_code="654321",
+        token_version=0
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_snapshot_leaves_out_secret_columns(cache, user):
+    cache.set(user)
+
+    snapshot = cache.backend.get("a@example.com")
+    assert snapshot["email"] == "a@example.com"
+    assert snapshot["token_version"] == 0
+    assert not SECRET_COLUMNS & set(snapshot)
+
+
+def test_cached_user_reads_secrets_from_the_row(cache, user, session_factory):
+    cache.set(user)
+
+    with session_factory() as db:
+        cached = cache.get(db, "a@example.com")
+        assert cached.full_name == "A"
+        assert cached.reset_code == "123456"
+
+
+def test_change_password_works_for_a_cached_user(cache, user, session_factory):
+    cache.set(user)
+
+    with session_factory() as db:
+        cached = cache.get(db, "a@example.com")
+        asyncio.run(UserService().change_password(db, cached, "old-password", "new-password"))
+
+    with session_factory() as db:
+        stored = db.query(User).filter(User.email == "a@example.com").one()
+        assert asyncio.run(password_hasher.verify("new-password", stored.hashed_password))
+        assert stored.token_version == 1
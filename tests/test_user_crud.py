@@ -0,0 +1,39 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.crud import async_user
+from app.crud.user import user as user_crud
+from app.models.user import User
+
+
+def add_users(db, count):
+    db.add_all([User(email=f"user{index}@example.com") for index in range(count)])
+    db.commit()
+
+
+def test_get_users_pages_do_not_overlap(db):
+    add_users(db, 5)
+
+    pages = [[user.id for user in user_crud.get_users(db, page=page, size=2)] for page in (1, 2, 3)]
+
+    assert pages == [[1, 2], [3, 4], [5]]
+
+
+def test_async_get_users_pages_do_not_overlap():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            db.add_all([User(email=f"user{index}@example.com") for index in range(5)])
+            await db.commit()
+            pages = [
+                [user.id for user in await async_user.user.get_users(db, page=page, size=2)]
+                for page in (1, 2, 3)
+            ]
+        await engine.dispose()
+        return pages
+
+    assert asyncio.run(run()) == [[1, 2], [3, 4], [5]]